@@ -0,0 +1,186 @@
+"""
+Module: Python With Bin - Streaming Column Aggregation
+
+Computes count, mean, min, max and variance for named CSV columns in a
+single pass with constant memory. Variance uses Welford's method. The
+mean is taken from an exact running sum, so it matches statistics.mean
+to the last bit. Approximate quantiles use the P-squared algorithm,
+which keeps five markers per quantile instead of the values themselves.
+"""
+
+# Standard library imports
+import csv
+import math
+import pathlib
+from typing import Iterable
+
+# Local module imports
+import utils_binware
+
+#####################################
+# Global Variables
+#####################################
+
+# Rows parsed before their values are folded into the statistics in one tight loop
+BATCH_ROWS: int = 10_000
+
+#####################################
+# Quantile Estimation
+#####################################
+
+class P2Quantile:
+    """
+    P-squared streaming estimate of one quantile (Jain and Chlamtac, 1985).
+
+    Uses five markers regardless of how many values are added; the
+    first five values are kept exactly. NaN has no place in the order,
+    so it is skipped; infinities are ordered like any other value.
+    """
+
+    def __init__(self, p: float) -> None:
+        if not 0 < p < 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {p}")
+        self.p = p
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def update(self, x: float) -> None:
+        if x != x:  # NaN
+            return
+        heights = self._heights
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return
+        # Find the cell containing x, stretching the end markers if needed
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+        # Nudge the three middle markers toward their desired positions
+        for i in (1, 2, 3):
+            d = self._desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self) -> float:
+        """Return the current estimate, or nan if no values were added."""
+        heights = self._heights
+        if not heights:
+            return math.nan
+        if len(heights) < 5:
+            # Exact quantile of the few values seen so far
+            return heights[min(len(heights) - 1, int(round(self.p * (len(heights) - 1))))]
+        return heights[2]
+
+#####################################
+# Column Statistics
+#####################################
+
+class ColumnStats(utils_binware.RunningStats):
+    """
+    Single-pass count, mean, min, max, variance and optional quantiles for one column.
+
+    An exact utils_binware.RunningStats plus P-squared quantile estimators.
+    """
+
+    __slots__ = ('quantiles',)
+
+    def __init__(self, quantiles: Iterable[float] = ()) -> None:
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+        super().__init__(exact=True)
+
+    def update(self, x: float) -> None:
+        super().update(x)
+        for estimator in self.quantiles.values():
+            estimator.update(x)
+
+    def update_many(self, values: list) -> None:
+        """Fold a list of values in; the same result as calling update() on each."""
+        super().update_many(values)
+        for estimator in self.quantiles.values():
+            for x in values:
+                estimator.update(x)
+
+    def merge(self, other: 'ColumnStats') -> 'ColumnStats':
+        """
+        Fold another column's statistics into this one, e.g. from another file.
+
+        Count, min, max and the exact mean combine losslessly; variance uses
+        Chan et al.'s pairwise update. Quantile estimates cannot be combined,
+        so this object's estimators are left as they are.
+        """
+        return super().merge(other)
+
+    def as_dict(self) -> dict:
+        summary = super().as_dict()
+        for p, estimator in self.quantiles.items():
+            summary[f"p{p * 100:g}"] = estimator.value()
+        return summary
+
+#####################################
+# CSV Aggregation
+#####################################
+
+def aggregate_csv(file_path: pathlib.Path, columns: Iterable[str],
+                  quantiles: Iterable[float] = ()) -> dict:
+    """
+    Stream a CSV file once and aggregate the named numeric columns.
+
+    Blank cells are skipped; a non-numeric value raises ValueError. Cells
+    such as 'nan' or 'inf' parse as floats and make the mean nan or
+    infinite, as statistics.mean would (see utils_binware.RunningStats).
+    A column missing from the header simply ends up with count 0.
+
+    Parameters:
+    - file_path (pathlib.Path): The CSV file to read.
+    - columns (iterable): Header names of the columns to aggregate.
+    - quantiles (iterable): Quantiles in (0, 1) to estimate for every column.
+
+    Returns:
+    - dict: Column name -> ColumnStats.
+    """
+    columns = list(columns)
+    quantiles = list(quantiles)
+    stats = {column: ColumnStats(quantiles) for column in columns}
+    with pathlib.Path(file_path).open('r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        selected = [(header.index(column), stats[column], []) for column in columns if column in header]
+        for row_number, row in enumerate(reader, 1):
+            for index, _, batch in selected:
+                if index < len(row) and row[index]:
+                    batch.append(float(row[index]))
+            if row_number % BATCH_ROWS == 0:
+                _flush_batches(selected)
+        _flush_batches(selected)
+    return stats
+
+def _flush_batches(selected: list) -> None:
+    for _, column_stats, batch in selected:
+        column_stats.update_many(batch)
+        batch.clear()
@@ -10,26 +10,59 @@ It showcases how to interact with web data, manipulate it in memory, and export
 -- Bin Ware
 """
 
+from __future__ import annotations
+
 # Standard library imports
-import csv
+import argparse
+import functools
 import json
+import os
 import pathlib
-import statistics
-
-# External library imports (requires virtual environment)
-import requests
-import openpyxl  # For Excel file processing
-import xlrd     # For reading .xls files directly
-
+import time
+from typing import Callable
 
 # Local module imports
+import binware_lazy
 import utils_binware
 import binware_project_setup
+import binware_fetch
+import binware_http
+import binware_cache
+import binware_manifest
+import binware_aggregate
+import binware_columnar
+import binware_parsed
+import binware_text
+import binware_sketch
+import binware_json
+import binware_excel
+import binware_pipeline
+import binware_results
+import binware_instrument
+import binware_schedule
+import binware_write
+
+# External library imports (requires virtual environment), loaded on first use
+requests = binware_lazy.lazy_import('requests')
+
+#####################################
+# Global Variables
+#####################################
+
+# Bump a processor's version whenever its output format or logic changes,
+# so results built by the old version are recomputed.
+PROCESSOR_VERSIONS = {
+    'process_txt_file': 1,
+    'process_csv_file': 1,
+    'process_json_file': 1,
+    'process_excel_file': 1,
+}
 
 #####################################
 # Fetch and Write Functions
 #####################################
 
+@binware_instrument.instrument('fetch')
 def fetch_and_write_txt_data(folder_name: str, filename: str, url: str) -> None:
     """
     Fetch text data from a URL and write it to a text file.
@@ -41,12 +74,16 @@ def fetch_and_write_txt_data(folder_name: str, filename: str, url: str) -> None:
 
     """
     try:
-        response = requests.get(url)
+        response = binware_http.get(url)
         response.raise_for_status()
-        write_txt_file(folder_name, filename, response.text)
+        binware_instrument.note(bytes_in=len(response.content))
+        if not write_txt_file(folder_name, filename, response.text):
+            binware_instrument.note(error=f"Could not write {filename}")
     except requests.RequestException as e:
         print(f"Failed to fetch text data: {e}")
+        binware_instrument.note(error=str(e))
 
+@binware_instrument.instrument('fetch')
 def fetch_and_write_csv_data(folder_name: str, filename: str, url: str) -> None:
     """
     Fetch CSV data from a URL and write it to a CSV file.
@@ -58,12 +95,16 @@ def fetch_and_write_csv_data(folder_name: str, filename: str, url: str) -> None:
 
     """
     try:
-        response = requests.get(url)
+        response = binware_http.get(url)
         response.raise_for_status()
-        write_csv_file(folder_name, filename, response.text)
+        binware_instrument.note(bytes_in=len(response.content))
+        if not write_csv_file(folder_name, filename, response.text):
+            binware_instrument.note(error=f"Could not write {filename}")
     except requests.RequestException as e:
         print(f"Failed to fetch CSV data: {e}")
+        binware_instrument.note(error=str(e))
 
+@binware_instrument.instrument('fetch')
 def fetch_and_write_json_data(folder_name: str, filename: str, url: str) -> None:
     """
     Fetch JSON data from a URL and write it to a JSON file.
@@ -75,12 +116,16 @@ def fetch_and_write_json_data(folder_name: str, filename: str, url: str) -> None
 
     """
     try:
-        response = requests.get(url)
+        response = binware_http.get(url)
         response.raise_for_status()
-        write_json_file(folder_name, filename, response.json())
+        binware_instrument.note(bytes_in=len(response.content))
+        if not write_json_file(folder_name, filename, response.json()):
+            binware_instrument.note(error=f"Could not write {filename}")
     except requests.RequestException as e:
         print(f"Failed to fetch JSON data: {e}")
+        binware_instrument.note(error=str(e))
 
+@binware_instrument.instrument('fetch')
 def fetch_and_write_excel_data(folder_name: str, filename: str, url: str) -> None:
     """
     Fetch Excel data from a URL and write it to an Excel file.
@@ -92,17 +137,107 @@ def fetch_and_write_excel_data(folder_name: str, filename: str, url: str) -> Non
 
     """
     try:
-        response = requests.get(url)
+        response = binware_http.get(url)
         response.raise_for_status()
-        write_excel_file(folder_name, filename, response.content)
+        binware_instrument.note(bytes_in=len(response.content))
+        if not write_excel_file(folder_name, filename, response.content):
+            binware_instrument.note(error=f"Could not write {filename}")
     except requests.RequestException as e:
         print(f"Failed to fetch Excel data: {e}")
+        binware_instrument.note(error=str(e))
+
+@binware_instrument.instrument('fetch')
+def fetch_and_stream_data(folder_name: str, filename: str, url: str) -> None:
+    """
+    Fetch data from a URL and stream it to a file in chunks.
+
+    Use this for large CSV or Excel sources; the file is written to a
+    temp name and renamed into place only once the download completes.
+
+    Parameters:
+    - folder_name (str): The name of the folder where the file will be saved.
+    - filename (str): The name of the file to save the data.
+    - url (str): The URL from which to fetch the data.
+
+    """
+    file_path = pathlib.Path(folder_name) / filename
+    try:
+        start = time.perf_counter()
+        bytes_written = binware_fetch.stream_download(url, file_path)
+        binware_instrument.note(bytes_in=bytes_written)
+        elapsed = time.perf_counter() - start
+        rate = bytes_written / elapsed / 1e6 if elapsed > 0 else 0.0
+        print(f"Streamed {bytes_written} bytes to {file_path} ({rate:.2f} MB/s)")
+    except (requests.RequestException, OSError) as e:
+        print(f"Failed to stream data: {e}")
+        binware_instrument.note(error=str(e))
+
+#####################################
+# Concurrent Fetch Functions
+#####################################
+
+def write_fetched_response(job: binware_fetch.FetchJob, response: requests.Response,
+                           compact_json: bool = False) -> bool:
+    """
+    Write a downloaded response with the write function that matches its kind.
+
+    Parameters:
+    - job (FetchJob): The job that produced the response.
+    - response (requests.Response): The successful response.
+    - compact_json (bool): Write JSON without indentation.
+
+    Returns:
+    - bool: True if the file was written.
+    """
+    if job.kind == 'txt':
+        return write_txt_file(job.folder_name, job.filename, response.text)
+    if job.kind == 'csv':
+        return write_csv_file(job.folder_name, job.filename, response.text)
+    if job.kind == 'json':
+        return write_json_file(job.folder_name, job.filename, response.json(), compact=compact_json)
+    if job.kind == 'excel':
+        return write_excel_file(job.folder_name, job.filename, response.content)
+    return False
+
+def fetch_and_write_manifest(jobs: list, max_workers: int = binware_fetch.DEFAULT_MAX_WORKERS,
+                             per_host_limit: int = binware_fetch.DEFAULT_PER_HOST_LIMIT,
+                             stream: bool = False,
+                             cache: binware_cache.HttpCache = None,
+                             session=None, compact_json: bool = False) -> list:
+    """
+    Fetch every job in a manifest concurrently and write each file.
+
+    With stream=True each body is written to disk in chunks and renamed
+    into place, so large CSV and XLS sources never sit in memory. JSON is
+    then saved exactly as served rather than re-indented.
+
+    Parameters:
+    - jobs (list): FetchJob entries or (url, folder_name, filename, kind) tuples.
+    - max_workers (int): Size of the thread pool.
+    - per_host_limit (int): Maximum requests in flight to a single host.
+    - stream (bool): Stream bodies straight to disk instead of buffering them.
+    - cache (HttpCache): Optional conditional-GET cache; unchanged jobs report changed=False.
+    - session (FetchClient): Optional client to fetch with; one is created if omitted.
+    - compact_json (bool): Write JSON without indentation (buffered mode only).
+
+    Returns:
+    - list: One FetchResult per job, in manifest order.
+    """
+    jobs = [job if isinstance(job, binware_fetch.FetchJob) else binware_fetch.make_job(*job) for job in jobs]
+    handler = functools.partial(write_fetched_response, compact_json=compact_json)
+    with binware_write.sync_batch():
+        results = binware_fetch.fetch_all(jobs, handler, max_workers=max_workers,
+                                          per_host_limit=per_host_limit, session=session, stream=stream,
+                                          cache=cache)
+    print(binware_fetch.format_report(results))
+    return results
 
 #####################################
 # Write Functions
 #####################################
 
-def write_txt_file(folder_name: str, filename: str, data: str) -> None:
+@binware_instrument.instrument('write')
+def write_txt_file(folder_name: str, filename: str, data: str) -> bool:
     """
     Write text data to a file.
 
@@ -111,17 +246,20 @@ def write_txt_file(folder_name: str, filename: str, data: str) -> None:
     - filename (str): The name of the text file.
     - data (str): The text data to write to the file.
 
+    Returns:
+    - bool: True if the file was written.
     """
     file_path = pathlib.Path(folder_name) / filename
-    file_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        with file_path.open('w', encoding='utf-8') as file:
-            file.write(data)
+        binware_write.write_atomic(file_path, data)
         print(f"Text data saved to {file_path}")
+        return True
     except IOError as e:
         print(f"Error writing text file {file_path}: {e}")
+        return False
 
-def write_csv_file(folder_name: str, filename: str, data: str) -> None:
+@binware_instrument.instrument('write')
+def write_csv_file(folder_name: str, filename: str, data: str) -> bool:
     """
     Write CSV data to a file.
 
@@ -130,17 +268,20 @@ def write_csv_file(folder_name: str, filename: str, data: str) -> None:
     - filename (str): The name of the CSV file.
     - data (str): The CSV data to write to the file.
 
+    Returns:
+    - bool: True if the file was written.
     """
     file_path = pathlib.Path(folder_name) / filename
-    file_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        with file_path.open('w', encoding='utf-8') as file:
-            file.write(data)
+        binware_write.write_atomic(file_path, data)
         print(f"CSV data saved to {file_path}")
+        return True
     except IOError as e:
         print(f"Error writing CSV file {file_path}: {e}")
+        return False
 
-def write_json_file(folder_name: str, filename: str, data: dict) -> None:
+@binware_instrument.instrument('write')
+def write_json_file(folder_name: str, filename: str, data: dict, compact: bool = False) -> bool:
     """
     Write JSON data to a file.
 
@@ -148,18 +289,26 @@ def write_json_file(folder_name: str, filename: str, data: dict) -> None:
     - folder_name (str): The name of the folder where the file will be saved.
     - filename (str): The name of the JSON file.
     - data (dict): The JSON data to write to the file.
+    - compact (bool): Write without indentation or spaces after separators (smaller files).
 
+    Returns:
+    - bool: True if the file was written.
     """
     file_path = pathlib.Path(folder_name) / filename
-    file_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        with file_path.open('w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4)
+        if compact:
+            text = json.dumps(data, separators=(',', ':'))
+        else:
+            text = json.dumps(data, indent=4)
+        binware_write.write_atomic(file_path, text)
         print(f"JSON data saved to {file_path}")
+        return True
     except IOError as e:
         print(f"Error writing JSON file {file_path}: {e}")
+        return False
 
-def write_excel_file(folder_name: str, filename: str, data: bytes) -> None:
+@binware_instrument.instrument('write')
+def write_excel_file(folder_name: str, filename: str, data: bytes) -> bool:
     """
     Write binary Excel data to a file.
 
@@ -168,183 +317,664 @@ def write_excel_file(folder_name: str, filename: str, data: bytes) -> None:
     - filename (str): The name of the Excel file.
     - data (bytes): The binary Excel data to write to the file.
 
+    Returns:
+    - bool: True if the file was written.
     """
     file_path = pathlib.Path(folder_name) / filename
-    file_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        with file_path.open('wb') as file:
-            file.write(data)
+        binware_write.write_atomic(file_path, data)
         print(f"Excel data saved to {file_path}")
+        return True
     except IOError as e:
         print(f"Error writing Excel file {file_path}: {e}")
+        return False
 
 #####################################
 # Process Functions
 #####################################
 
-def process_txt_file(folder_name: str, input_filename: str, output_filename: str) -> None:
+def results_path(folder_name: str, output_filename: str):
+    """Return folder_name/output_filename, or None when no text results are wanted."""
+    return pathlib.Path(folder_name) / output_filename if output_filename else None
+
+def open_results_file(output_path: pathlib.Path):
+    """Open a results file for writing (renamed into place when closed); without a path the text is discarded."""
+    if output_path is None:
+        return open(os.devnull, 'w', encoding='utf-8')
+    return binware_write.atomic_open(output_path, 'w')
+
+def processed_message(label: str, output_path: pathlib.Path) -> str:
+    if output_path is None:
+        return f"{label} data processed"
+    return f"{label} data processed and results saved to {output_path}"
+
+@binware_instrument.instrument('process')
+def process_txt_file(folder_name: str, input_filename: str, output_filename: str,
+                     top_n: int = 0, workers: int = 1, approximate: bool = False,
+                     precision: int = binware_sketch.DEFAULT_PRECISION,
+                     sketch_filename: str = None) -> dict:
     """
     Process text data to count total and unique words.
 
+    The file is read in fixed-size chunks and only a count per distinct
+    word is kept, so memory does not grow with the size of the file.
+    With workers > 1 the file is split into whitespace-aligned byte
+    ranges that are counted in parallel processes.
+
+    With approximate=True the unique words are estimated with a
+    HyperLogLog sketch of a few KB instead of being kept in memory, and
+    the standard error is written next to the estimate. top_n and
+    workers are ignored in this mode.
+
     Parameters:
     - folder_name (str): The name of the folder containing the input file.
     - input_filename (str): The name of the input text file.
-    - output_filename (str): The name of the output file to save results.
-
+    - output_filename (str): The name of the output file to save results (None to skip the text file).
+    - top_n (int): Also list the N most frequent words if greater than zero.
+    - workers (int): Number of processes to count with.
+    - approximate (bool): Estimate unique words with HyperLogLog.
+    - precision (int): HyperLogLog precision (2**precision one-byte registers).
+    - sketch_filename (str): Save the sketch here so it can be merged with others later.
+
+    Returns:
+    - dict: words, unique_words and the word counts (or the sketch when approximate), or None on error.
     """
     file_path = pathlib.Path(folder_name) / input_filename
+    if approximate:
+        return _process_txt_file_approximate(file_path, results_path(folder_name, output_filename), precision,
+                                             sketch_filename and pathlib.Path(folder_name) / sketch_filename)
     try:
-        with file_path.open('r', encoding='utf-8') as file:
-            text = file.read()
-        # Basic text processing
-        words = text.lower().split()
-        word_count = len(words)
-        unique_words = set(words)
-        unique_word_count = len(unique_words)
+        if workers > 1:
+            counts = binware_text.count_words_parallel(file_path, workers=workers)
+        else:
+            counts = binware_text.count_words(file_path)
+        word_count, unique_word_count = binware_text.summarize_counts(counts)
+        binware_instrument.note(words=word_count)
         # Save results
-        output_path = pathlib.Path(folder_name) / output_filename
-        with output_path.open('w', encoding='utf-8') as file:
+        output_path = results_path(folder_name, output_filename)
+        with open_results_file(output_path) as file:
             file.write(f"Total Words: {word_count}\n")
             file.write(f"Unique Words: {unique_word_count}\n")
-        print(f"Text data processed and results saved to {output_path}")
+            if top_n > 0:
+                file.write(f"Top {top_n} Words:\n")
+                for word, count in binware_text.top_words(counts, top_n):
+                    file.write(f"- {word}: {count}\n")
+        print(processed_message("Text", output_path))
+        return {'words': word_count, 'unique_words': unique_word_count, 'counts': counts}
     except IOError as e:
         print(f"Error processing text file {file_path}: {e}")
 
-def process_csv_file(folder_name: str, input_filename: str, output_filename: str) -> None:
+def _process_txt_file_approximate(file_path: pathlib.Path, output_path: pathlib.Path,
+                                  precision: int, sketch_path: pathlib.Path = None) -> dict:
+    """Write Total Words exactly and Unique Words as a HyperLogLog estimate."""
+    try:
+        word_count, sketch = binware_text.sketch_words(file_path, precision)
+        binware_instrument.note(words=word_count)
+        if sketch_path:
+            sketch.save(sketch_path)
+        with open_results_file(output_path) as file:
+            file.write(f"Total Words: {word_count}\n")
+            file.write(f"Unique Words (approx): {sketch.estimate()} (+/- {sketch.relative_error:.2%})\n")
+        print(processed_message("Text", output_path))
+        return {'words': word_count, 'unique_words': sketch.estimate(), 'sketch': sketch}
+    except (IOError, ValueError) as e:
+        print(f"Error processing text file {file_path}: {e}")
+
+@binware_instrument.instrument('process')
+def process_csv_file(folder_name: str, input_filename: str, output_filename: str,
+                     columns: tuple = ('Ladder score',), quantiles: tuple = (),
+                     summary: bool = False, columnar: bool = False,
+                     group_by: str = None, parsed_cache: bool = False) -> dict:
     """
     Process CSV data to calculate the average 'Ladder score'.
 
+    The file is streamed once and only running statistics are kept, so
+    memory does not grow with the number of rows. With columnar=True the
+    columns are loaded in chunks into NumPy arrays and summarized with
+    vectorized operations instead (quantiles are not available there).
+    With parsed_cache=True the columns are memory-mapped from a parsed
+    .npy cache of the file, which is built on first use and rebuilt
+    whenever the file changes; the mean is still exact.
+
     Parameters:
     - folder_name (str): The name of the folder containing the input file.
     - input_filename (str): The name of the input CSV file.
-    - output_filename (str): The name of the output file to save results.
-
+    - output_filename (str): The name of the output file to save results (None to skip the text file).
+    - columns (tuple): Numeric columns to aggregate.
+    - quantiles (tuple): Approximate quantiles in (0, 1) to report for each column.
+    - summary (bool): Also report count, min, max, variance and standard deviation.
+    - columnar (bool): Use the NumPy columnar engine (requires numpy).
+    - group_by (str): Also report each column's mean per value of this column (columnar or parsed_cache only).
+    - parsed_cache (bool): Read the columns from the parsed cache (requires numpy; no quantiles).
+
+    Returns:
+    - dict: Column name -> ColumnStats (or ColumnSummary when columnar), or None on error.
     """
     file_path = pathlib.Path(folder_name) / input_filename
-    data = []
     try:
-        with file_path.open('r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                data.append(row)
-        # Extract 'Ladder score' values
-        scores = [float(row['Ladder score']) for row in data if 'Ladder score' in row and row['Ladder score']]
-        if scores:
-            average_score = statistics.mean(scores)
+        groups = {}
+        if parsed_cache:
+            stats = binware_parsed.summarize_csv(file_path, columns)
+            if group_by:
+                groups = binware_parsed.group_means_csv(file_path, columns, group_by)
+        elif columnar:
+            stats = binware_columnar.summarize_csv(file_path, columns)
+            if group_by:
+                groups = binware_columnar.group_means_csv(file_path, columns, group_by)
         else:
-            average_score = 0.0
+            stats = binware_aggregate.aggregate_csv(file_path, columns, quantiles)
+        binware_instrument.note(rows=max((column_stats.count for column_stats in stats.values()), default=0))
         # Save results
-        output_path = pathlib.Path(folder_name) / output_filename
-        with output_path.open('w', encoding='utf-8') as file:
-            file.write(f"Average Ladder Score: {average_score}\n")
-        print(f"CSV data processed and results saved to {output_path}")
-    except (IOError, KeyError, ValueError) as e:
+        output_path = results_path(folder_name, output_filename)
+        with open_results_file(output_path) as file:
+            for column, column_stats in stats.items():
+                label = column.title()
+                file.write(f"Average {label}: {column_stats.mean}\n")
+                if summary and column_stats.count:
+                    file.write(f"{label} Count: {column_stats.count}\n")
+                    file.write(f"{label} Min: {column_stats.minimum}\n")
+                    file.write(f"{label} Max: {column_stats.maximum}\n")
+                    file.write(f"{label} Variance: {column_stats.variance}\n")
+                    file.write(f"{label} Std Dev: {column_stats.stdev}\n")
+                for p, estimator in column_stats.quantiles.items():
+                    file.write(f"{label} p{p * 100:g} (approx): {estimator.value()}\n")
+            for group, group_means in groups.items():
+                for column, (count, mean) in group_means.items():
+                    file.write(f"Average {column.title()} for {group}: {mean} ({count} rows)\n")
+        print(processed_message("CSV", output_path))
+        return stats
+    except (IOError, KeyError, ValueError, ImportError) as e:
         print(f"Error processing CSV file {file_path}: {e}")
 
-def process_json_file(folder_name: str, input_filename: str, output_filename: str) -> None:
+@binware_instrument.instrument('process')
+def process_json_file(folder_name: str, input_filename: str, output_filename: str,
+                      path: str = 'people.item.name', title: str = "Astronauts Currently in Space",
+                      json_lines: bool = None) -> int:
     """
     Process JSON data to list astronauts currently in space.
 
+    Values are streamed from the input straight into the results file,
+    so memory is bounded by one record rather than the whole document
+    (when ijson is installed, or for JSON Lines input).
+
     Parameters:
     - folder_name (str): The name of the folder containing the input file.
     - input_filename (str): The name of the input JSON file.
-    - output_filename (str): The name of the output file to save results.
+    - output_filename (str): The name of the output file to save results (None to skip the text file).
+    - path (str): Dotted path of the values to list; 'item' steps into arrays.
+    - title (str): Heading written above the list.
+    - json_lines (bool): Treat the input as JSON Lines; guessed from the extension if None.
 
+    Returns:
+    - int: The number of values listed, or None on error.
     """
     file_path = pathlib.Path(folder_name) / input_filename
     try:
-        with file_path.open('r', encoding='utf-8') as jsonfile:
-            data = json.load(jsonfile)
-        # Extract astronaut names
-        astronauts = [person['name'] for person in data.get('people', [])]
-        # Save results
-        output_path = pathlib.Path(folder_name) / output_filename
-        with output_path.open('w', encoding='utf-8') as file:
-            file.write("Astronauts Currently in Space:\n")
-            for astronaut in astronauts:
-                file.write(f"- {astronaut}\n")
-        print(f"JSON data processed and results saved to {output_path}")
-    except (IOError, json.JSONDecodeError) as e:
+        listed = 0
+        # Save results as they are extracted
+        output_path = results_path(folder_name, output_filename)
+        with open_results_file(output_path) as file:
+            file.write(f"{title}:\n")
+            for value in binware_json.iter_json_path(file_path, path, json_lines):
+                file.write(f"- {value}\n")
+                binware_instrument.note(rows=1)
+                listed += 1
+        print(processed_message("JSON", output_path))
+        return listed
+    except (IOError,) + binware_json.JSON_ERRORS as e:
         print(f"Error processing JSON file {file_path}: {e}")
 
-def process_excel_file(folder_name: str, input_filename: str, output_filename: str) -> None:
+@binware_instrument.instrument('process')
+def process_excel_file(folder_name: str, input_filename: str, output_filename: str,
+                       sheet=0, column=1, header_rows: int = 1, parsed_cache: bool = False) -> float:
     """
-    Process Excel data to sum values in a specific column using xlrd.
+    Process Excel data to sum values in a specific column.
+
+    .xls files are read with xlrd, loading only the requested sheet and
+    pulling the column in bulk; .xlsx files are streamed with openpyxl
+    in read-only mode. With parsed_cache=True the sheet is read from a
+    memory-mapped .npy cache that is rebuilt only when the file changes.
 
     Parameters:
     - folder_name (str): The name of the folder containing the input file.
     - input_filename (str): The name of the input Excel file.
-    - output_filename (str): The name of the output file to save results.
-
+    - output_filename (str): The name of the output file to save results (None to skip the text file).
+    - sheet (int or str): Sheet index or name (default: the first sheet).
+    - column (int or str): Zero-based column index or header name (default: the second column).
+    - header_rows (int): Rows to skip at the top of the sheet.
+    - parsed_cache (bool): Read the sheet from the parsed cache (requires numpy).
+
+    Returns:
+    - float: The column total, or None on error.
     """
     file_path = pathlib.Path(folder_name) / input_filename
     try:
-        # Open the workbook using xlrd
-        workbook = xlrd.open_workbook(file_path)
-        sheet = workbook.sheet_by_index(0)  # Assuming data is in the first sheet
-        total = 0
-        # Iterate over rows, starting from the second row (index 1) if the first row is header
-        for row_idx in range(1, sheet.nrows):
-            cell_value = sheet.cell_value(row_idx, 1)  # Assuming values are in the second column (index 1)
-            if isinstance(cell_value, (int, float)):
-                total += cell_value
+        if parsed_cache:
+            total = binware_parsed.sum_excel_column(file_path, sheet, column, header_rows)
+        else:
+            total = binware_excel.sum_excel_column(file_path, sheet, column, header_rows)
         # Save results
-        output_path = pathlib.Path(folder_name) / output_filename
-        with output_path.open('w', encoding='utf-8') as file:
+        output_path = results_path(folder_name, output_filename)
+        with open_results_file(output_path) as file:
             file.write(f"Total Value from Excel Data: {total}\n")
-        print(f"Excel data processed and results saved to {output_path}")
+        print(processed_message("Excel", output_path))
+        return total
     except Exception as e:
         print(f"Error processing Excel file {file_path}: {e}")
 
 
 #####################################
-# Main Function
+# Incremental Processing Functions
 #####################################
 
-def main() -> None:
+def process_if_changed(process, folder_name: str, input_filename: str, output_filename: str,
+                       manifest: binware_manifest.BuildManifest = None, options: dict = None,
+                       on_result: Callable = None, result_key: str = None,
+                       on_reuse: Callable = None) -> bool:
     """
-    Main function to demonstrate module capabilities.
+    Run a process_* function only if its input or version changed since the last run.
 
-    Fetches data from various sources, processes it, and writes the results.
+    Without a results file (output_filename None) the build is tracked
+    under result_key instead, e.g. a binware_manifest.store_key when the
+    metrics only go to the result store. Without either there is nothing
+    to reuse, so the processor always runs.
 
+    Parameters:
+    - process (callable): One of the process_*_file functions.
+    - folder_name (str): The name of the folder containing the input file.
+    - input_filename (str): The name of the input file.
+    - output_filename (str): The name of the output file to save results.
+    - manifest (BuildManifest): Shared manifest; if omitted one is loaded and saved here.
+    - options (dict): Extra keyword arguments for the processor; changing them forces a rerun.
+    - on_result (callable): Called with the processor's return value whenever it runs.
+    - result_key (str): Manifest key for the results when output_filename is None.
+    - on_reuse (callable): Called with no arguments before the cached result is reused, e.g. to
+      record the previous metrics for this run; returning False runs the processor instead.
+
+    Returns:
+    - bool: True if the processor ran, False if the cached result was reused.
     """
+    options = options or {}
+    if output_filename is None and result_key is None:
+        result = process(folder_name, input_filename, None, **options)
+        if on_result is not None:
+            on_result(result)
+        return True
+    own_manifest = manifest is None
+    if own_manifest:
+        manifest = binware_manifest.BuildManifest()
+    input_path = pathlib.Path(folder_name) / input_filename
+    output_path = results_path(folder_name, output_filename)
+    output_key = output_path if output_path is not None else result_key
+    name = process.__name__
+    version = PROCESSOR_VERSIONS.get(name, 0)
+    processor_key = f"{name} {json.dumps(options, sort_keys=True)}" if options else name
+    if manifest.is_up_to_date(input_path, output_key, processor_key, version) \
+            and (on_reuse is None or on_reuse() is not False):
+        print(f"{input_path} unchanged, reusing {output_path or 'its stored results'}")
+        if own_manifest:
+            manifest.save()
+        return False
+    try:
+        input_stat = input_path.stat()
+        input_sha256 = binware_manifest.file_sha256(input_path)
+        output_mtime = output_path.stat().st_mtime_ns if output_path is not None and output_path.exists() else None
+    except OSError as e:
+        print(f"Error reading input file {input_path}: {e}")
+        return False
+    result = process(folder_name, input_filename, output_filename, **options)
+    if on_result is not None:
+        on_result(result)
+    # The process_* functions report their own errors, so only record a build that produced results
+    if output_path is None:
+        built = result is not None
+    else:
+        built = output_path.exists() and output_path.stat().st_mtime_ns != output_mtime
+    if built:
+        manifest.record(input_path, output_key, processor_key, version, input_sha256, input_stat)
+        if own_manifest:
+            manifest.save()
+    return True
+
+# Processor and default results file for each kind of dataset
+PROCESSORS = {
+    'txt': (process_txt_file, 'results_txt.txt'),
+    'csv': (process_csv_file, 'results_csv.txt'),
+    'excel': (process_excel_file, 'results_excel.txt'),
+    'json': (process_json_file, 'results_json.txt'),
+}
+
+#####################################
+# Pipeline Functions
+#####################################
+
+def run_dataset_chain(dataset: binware_pipeline.Dataset, client: binware_http.FetchClient,
+                      limiter: binware_fetch.HostLimiter, cache: binware_cache.HttpCache,
+                      manifest: binware_manifest.BuildManifest, stream: bool = False,
+                      store: binware_results.ResultStore = None, run_id: str = None,
+                      text_results: bool = True, compact_json: bool = False) -> tuple:
+    """
+    Run the fetch, persist and process stages for one dataset.
+
+    In streaming mode the body is written while it downloads, so the
+    persist time is part of the fetch stage.
+
+    Parameters:
+    - dataset (Dataset): The dataset to run.
+    - client (FetchClient): Shared client with pooling, timeouts and retries.
+    - limiter (HostLimiter): Shared per-host limits.
+    - cache (HttpCache): Conditional-GET cache.
+    - manifest (BuildManifest): Incremental processing manifest.
+    - stream (bool): Stream bodies straight to disk.
+    - store (ResultStore): Where to record the processor's metrics, keyed by dataset name and run_id.
+    - run_id (str): The run the metrics belong to.
+    - text_results (bool): Also write the results_*.txt file.
+    - compact_json (bool): Write JSON datasets without indentation.
+
+    Returns:
+    - tuple: (ok, [StageTiming, ...]).
+    """
+    timings = []
+    job = binware_fetch.make_job(dataset.url, dataset.folder_name, dataset.filename, dataset.kind)
+    persist_seconds = 0.0
+
+    def persist(job: binware_fetch.FetchJob, response: requests.Response) -> bool:
+        nonlocal persist_seconds
+        start = time.perf_counter()
+        written = write_fetched_response(job, response, compact_json)
+        persist_seconds += time.perf_counter() - start
+        return written
+
+    result = binware_fetch.run_job(job, client, limiter, persist, stream=stream, cache=cache)
+    binware_instrument.add_record(function='run_job', stage='fetch', url=job.url, folder=job.folder_name,
+                                  file=job.filename, started_at=time.time() - result.elapsed_seconds,
+                                  seconds=result.elapsed_seconds - persist_seconds,
+                                  bytes_in=result.bytes_received, ok=result.ok, error=result.error,
+                                  not_modified=not result.changed)
+    fetch_detail = result.error or ('' if result.changed else 'not modified')
+    timings.append(binware_pipeline.StageTiming(dataset.name, 'fetch', result.elapsed_seconds - persist_seconds,
+                                                result.ok, fetch_detail))
+    if not result.ok:
+        return False, timings
+    timings.append(binware_pipeline.StageTiming(dataset.name, 'persist', persist_seconds, True))
+
+    if dataset.options.get('parsed_cache') and dataset.kind in ('csv', 'excel'):
+        # Convert the persisted file once; processing then memory-maps the columns
+        start = time.perf_counter()
+        file_path = pathlib.Path(dataset.folder_name) / dataset.filename
+        try:
+            if dataset.kind == 'csv':
+                binware_parsed.ensure_csv_cache(file_path)
+            else:
+                binware_parsed.ensure_excel_cache(file_path, dataset.options.get('sheet', 0))
+            timings.append(binware_pipeline.StageTiming(dataset.name, 'parse', time.perf_counter() - start, True))
+        except Exception as e:
+            timings.append(binware_pipeline.StageTiming(dataset.name, 'parse', time.perf_counter() - start,
+                                                        False, str(e)))
+            return False, timings
+
+    process, default_output = PROCESSORS[dataset.kind]
+    output_filename = (dataset.output_filename or default_output) if text_results else None
+
+    failed = False
+
+    def record_metrics(processed) -> None:
+        nonlocal failed
+        # The process_* functions print their own errors and return None
+        failed = processed is None
+        if store is not None and not failed:
+            store.add(run_id, dataset.name, binware_results.metrics_from_result(dataset.kind, processed))
+
+    def reuse_metrics() -> bool:
+        # A reused result still needs this run's metrics; without earlier ones, process again
+        return store is None or store.copy_latest(dataset.name, run_id) > 0
+
+    # Without a results file, the metrics in the store are what the manifest tracks
+    result_key = binware_manifest.store_key(str(store.db_path), dataset.name) if store is not None else None
+    start = time.perf_counter()
+    ran = process_if_changed(process, dataset.folder_name, dataset.filename, output_filename,
+                             manifest, dataset.options, record_metrics, result_key, reuse_metrics)
+    if failed:
+        detail = 'processor failed'
+    else:
+        detail = '' if ran else 'reused cached result'
+    timings.append(binware_pipeline.StageTiming(dataset.name, 'process', time.perf_counter() - start,
+                                                not failed, detail))
+    return not failed, timings
+
+def run_pipeline_config(config_path: str = binware_pipeline.DEFAULT_PIPELINE_CONFIG,
+                        stream: bool = False, run_id: str = None,
+                        client: binware_http.FetchClient = None) -> list:
+    """
+    Run every dataset declared in a pipeline config and print per-stage timings.
+
+    The config's optional "http" object sets the client's connect_timeout,
+    read_timeout, max_retries, backoff_factor and requests_per_second.
+    Metrics go to the SQLite store named by "results_db" (if set),
+    "text_results": false stops writing the results_*.txt files, and
+    "compact_json": true writes JSON datasets without indentation. Files
+    written during the run are fsynced together at the end (see binware_write).
+
+    Parameters:
+    - config_path (str): Path to the JSON pipeline config.
+    - stream (bool): Stream bodies straight to disk.
+    - run_id (str): Id to record metrics under; a new one if omitted.
+    - client (FetchClient): Client to reuse across runs; one is created (and closed) if omitted.
+
+    Returns:
+    - list: StageTiming entries for every stage.
+    """
+    config = binware_pipeline.load_pipeline(config_path)
+    max_workers = config.get('max_workers', binware_pipeline.DEFAULT_MAX_WORKERS)
+    owns_client = client is None
+    if owns_client:
+        client = binware_http.FetchClient(pool_size=max_workers, **config.get('http', {}))
+    limiter = binware_fetch.HostLimiter(config.get('per_host_limit', binware_fetch.DEFAULT_PER_HOST_LIMIT))
+    cache = binware_cache.HttpCache()
+    manifest = binware_manifest.BuildManifest()
+    store = binware_results.ResultStore(config['results_db']) if config.get('results_db') else None
+    run_id = store.start_run(run_id) if store is not None else run_id
+    text_results = config.get('text_results', True)
+    compact_json = config.get('compact_json', False)
+    try:
+        with binware_write.sync_batch():
+            timings = binware_pipeline.run_pipeline(
+                config['datasets'],
+                lambda dataset: run_dataset_chain(dataset, client, limiter, cache, manifest, stream,
+                                                  store, run_id, text_results, compact_json),
+                max_workers=max_workers)
+    finally:
+        if store is not None:
+            store.close()
+        if owns_client:
+            client.close()
+        cache.evict()
+        cache.save()
+        manifest.prune()
+        manifest.save()
+    print(binware_pipeline.format_timings(timings))
+    print(client.format_metrics())
+    return timings
+
+def fetch_pipeline_config(config_path: str = binware_pipeline.DEFAULT_PIPELINE_CONFIG,
+                          stream: bool = False) -> list:
+    """
+    Download every dataset declared in a pipeline config without processing it.
+
+    Parameters:
+    - config_path (str): Path to the JSON pipeline config.
+    - stream (bool): Stream bodies straight to disk.
+
+    Returns:
+    - list: One FetchResult per dataset, in config order.
+    """
+    config = binware_pipeline.load_pipeline(config_path)
+    max_workers = config.get('max_workers', binware_pipeline.DEFAULT_MAX_WORKERS)
+    jobs = [binware_fetch.make_job(dataset.url, dataset.folder_name, dataset.filename, dataset.kind)
+            for dataset in config['datasets']]
+    with binware_http.FetchClient(pool_size=max_workers, **config.get('http', {})) as client:
+        results = fetch_and_write_manifest(
+            jobs, max_workers, config.get('per_host_limit', binware_fetch.DEFAULT_PER_HOST_LIMIT),
+            stream=stream, cache=binware_cache.HttpCache(), session=client,
+            compact_json=config.get('compact_json', False))
+        print(client.format_metrics())
+    return results
+
+#####################################
+# Main Function
+#####################################
+
+def parse_option(text: str) -> tuple:
+    """Split a KEY=VALUE processor option; the value is read as JSON if it parses, else kept as text."""
+    key, separator, value = text.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got '{text}'")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+def run_command(args: argparse.Namespace) -> int:
+    """Fetch, write and process every dataset in the config, then save the run report; 1 if any stage failed."""
     print(utils_binware.get_byline())
+    run_id = binware_instrument.start_run()
 
     # Create necessary data folders
     data_folders = ['data-txt', 'data-csv', 'data-excel', 'data-json']
     binware_project_setup.create_folders_from_list(data_folders, to_lowercase=True)
 
-    # URLs and file names
-    txt_url = 'http://shakespeare.mit.edu/romeo_juliet/full.html'
-    csv_url = 'https://raw.githubusercontent.com/MainakRepositor/Datasets/master/World%20Happiness%20Data/2020.csv'
-    excel_url = 'https://github.com/bharathirajatut/sample-excel-dataset/raw/master/cattle.xls'
-    json_url = 'http://api.open-notify.org/astros.json'
-
-    txt_folder_name = 'data-txt'
-    csv_folder_name = 'data-csv'
-    excel_folder_name = 'data-excel'
-    json_folder_name = 'data-json'
-
-    txt_filename = 'data.txt'
-    csv_filename = 'data.csv'
-    excel_filename = 'data.xls'
-    json_filename = 'data.json'
-
-    # Fetch and write data
-    fetch_and_write_txt_data(txt_folder_name, txt_filename, txt_url)
-    fetch_and_write_csv_data(csv_folder_name, csv_filename, csv_url)
-    fetch_and_write_excel_data(excel_folder_name, excel_filename, excel_url)
-    fetch_and_write_json_data(json_folder_name, json_filename, json_url)
-
-    # Process data
-    process_txt_file(txt_folder_name, txt_filename, 'results_txt.txt')
-    process_csv_file(csv_folder_name, csv_filename, 'results_csv.txt')
-    process_excel_file(excel_folder_name, excel_filename, 'results_excel.txt')
-    process_json_file(json_folder_name, json_filename, 'results_json.txt')
+    # Fetch, write and process every dataset, each chain as soon as it is ready
+    timings = run_pipeline_config(args.config, args.stream, run_id=run_id)
+
+    # Machine-readable timing report (set BINWARE_PROFILE for tracemalloc/cProfile capture)
+    report = binware_instrument.write_run_report()
+    print(f"Run report saved to {binware_instrument.DEFAULT_REPORT_FILENAME} ({len(report['records'])} records)")
+    return 0 if all(timing.ok for timing in timings) else 1
+
+def fetch_command(args: argparse.Namespace) -> int:
+    """Download every dataset in the config."""
+    results = fetch_pipeline_config(args.config, args.stream)
+    return 0 if all(result.ok for result in results) else 1
+
+def snapshot_datasets(datasets: list, partition: pathlib.Path, text_results: bool = True) -> int:
+    """
+    Hard-link each dataset's input and results file into a partition folder.
+
+    The pipeline keeps writing to the stable dataset folders, so the HTTP
+    cache and build manifest keep hitting; every write replaces the file
+    (binware_write), so a linked snapshot keeps the content it had.
+    Files on another filesystem are copied instead.
+
+    Parameters:
+    - datasets (list): The Dataset entries of the run.
+    - partition (pathlib.Path): The folder to snapshot into, e.g. from create_time_partition.
+    - text_results (bool): Also snapshot the results_*.txt files.
+
+    Returns:
+    - int: The number of files linked or copied.
+    """
+    count = 0
+    for dataset in datasets:
+        folder = pathlib.Path(dataset.folder_name)
+        target = partition / (folder.name if folder.is_absolute() else folder)
+        names = [dataset.filename]
+        if text_results:
+            names.append(dataset.output_filename or PROCESSORS[dataset.kind][1])
+        for name in names:
+            if (folder / name).exists():
+                binware_write.link_or_copy(folder / name, target / name)
+                count += 1
+    return count
+
+def schedule_command(args: argparse.Namespace) -> int:
+    """Run the pipeline every --interval seconds and snapshot each run into a time-partitioned folder."""
+    config = binware_pipeline.load_pipeline(args.config)
+    max_workers = config.get('max_workers', binware_pipeline.DEFAULT_MAX_WORKERS)
+    partition_root = pathlib.Path(args.partition_root)
+
+    with binware_http.FetchClient(pool_size=max_workers, **config.get('http', {})) as client:
+        def refresh(tick: binware_schedule.Tick) -> None:
+            run_id = binware_instrument.start_run()
+            timings = run_pipeline_config(args.config, args.stream, run_id=run_id, client=client)
+            report_path = pathlib.Path(binware_instrument.DEFAULT_REPORT_FILENAME)
+            if not args.in_place:
+                partition = binware_project_setup.create_time_partition(tick.wall_time, partition_root)
+                snapshot_datasets(config['datasets'], partition, config.get('text_results', True))
+                report_path = partition / binware_instrument.DEFAULT_REPORT_FILENAME
+            binware_instrument.write_run_report(str(report_path))
+            if not all(timing.ok for timing in timings):
+                raise RuntimeError("one or more stages failed (see the timings above)")
+
+        scheduler = binware_schedule.Scheduler(refresh, args.interval, args.jitter)
+        report = scheduler.run(duration=args.duration, max_ticks=args.runs)
+    print(report.format())
+    return 0 if not report.failed else 1
+
+def process_command(args: argparse.Namespace) -> int:
+    """Run one processor on one local file."""
+    process, default_output = PROCESSORS[args.kind]
+    input_path = pathlib.Path(args.input)
+    output_filename = None if args.no_text_results else (args.output or default_output)
+    result = process(str(input_path.parent), input_path.name, output_filename, **dict(args.option))
+    return 0 if result is not None else 1
+
+def main(argv: list = None) -> int:
+    """
+    Command-line entry point.
+
+    Subcommands:
+    - run: fetch and process everything in pipeline.json (the default).
+    - fetch: only download the datasets.
+    - process: run one processor on one file, e.g.
+      `python binware_analytics.py process csv data-csv/data.csv --option summary=true`.
+    - schedule: rerun the pipeline on a fixed schedule, e.g.
+      `python binware_analytics.py schedule --interval 5 --duration 3600 --jitter 0.5`.
+
+    Heavy packages (requests, openpyxl, xlrd, NumPy) are imported only
+    when a command actually uses them.
+
+    Returns:
+    - int: Exit status (0 on success).
+    """
+    parser = argparse.ArgumentParser(description="Fetch and process the Python With Bin datasets.")
+    subparsers = parser.add_subparsers(dest='command')
+    run_parser = subparsers.add_parser('run', help="Fetch and process every dataset in the pipeline config")
+    fetch_parser = subparsers.add_parser('fetch', help="Only download the datasets in the pipeline config")
+    schedule_parser = subparsers.add_parser('schedule', help="Rerun the pipeline every --interval seconds")
+    schedule_parser.add_argument('--interval', type=float, default=5.0,
+                                 help="Seconds between runs (default: %(default)s)")
+    schedule_parser.add_argument('--duration', type=float, help="Seconds to keep scheduling (default: until Ctrl+C)")
+    schedule_parser.add_argument('--runs', type=int, help="Number of ticks to schedule (default: no limit)")
+    schedule_parser.add_argument('--jitter', type=float, default=0.0,
+                                 help="Random delay of up to this many seconds per run (default: %(default)s)")
+    schedule_parser.add_argument('--partition-root', default=str(binware_project_setup.data_path / 'runs'),
+                                 help="Each run is snapshotted into <root>/YYYY/MM/DD/HHMMSS (default: %(default)s)")
+    schedule_parser.add_argument('--in-place', action='store_true',
+                                 help="Only refresh the dataset folders; take no snapshots")
+    for subparser in (run_parser, fetch_parser, schedule_parser):
+        subparser.add_argument('--config', default=binware_pipeline.DEFAULT_PIPELINE_CONFIG,
+                               help="Pipeline config (default: %(default)s)")
+        subparser.add_argument('--stream', action='store_true', help="Stream bodies straight to disk")
+    process_parser = subparsers.add_parser('process', help="Process one local file")
+    process_parser.add_argument('kind', choices=sorted(PROCESSORS), help="Processor to run")
+    process_parser.add_argument('input', help="Input file, e.g. data-csv/data.csv")
+    process_parser.add_argument('--output', help="Results file name, next to the input (default: results_<kind>.txt)")
+    process_parser.add_argument('--no-text-results', action='store_true', help="Do not write a results file")
+    process_parser.add_argument('--option', type=parse_option, action='append', default=[], metavar='KEY=VALUE',
+                                help="Processor keyword option, e.g. top_n=10 or columns='[\"Ladder score\"]'")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        # Plain `python binware_analytics.py` keeps running the whole pipeline
+        args = run_parser.parse_args([])
+        args.command = 'run'
+    commands = {'run': run_command, 'fetch': fetch_command, 'process': process_command,
+                'schedule': schedule_command}
+    return commands[args.command](args)
 
 #####################################
 # Conditional Execution
 #####################################
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,337 @@
+"""
+Module: Python With Bin - Asyncio API
+
+Async variants of the fetch and process functions in binware_analytics,
+for services that run this code inside an event loop.
+
+Downloads go through one shared aiohttp session with the same timeouts,
+retryable statuses and backoff as binware_http. The downloaded body is
+wrapped in a requests.Response and handed to the same write_*_file
+functions the sync code uses, and the process_*_file functions run
+unchanged in an executor. Output files are therefore byte-for-byte what
+the sync versions write, while the loop only awaits network I/O.
+
+Example:
+
+    import asyncio, binware_async, binware_pipeline
+    config = binware_pipeline.load_pipeline('pipeline.json')
+    results = asyncio.run(binware_async.arefresh_datasets(config['datasets'], concurrency=100))
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import asyncio
+import functools
+import pathlib
+import random
+from concurrent.futures import Executor
+from typing import Awaitable, Iterable, Optional
+
+# Local module imports
+import binware_lazy
+import binware_analytics
+import binware_fetch
+import binware_http
+import binware_pipeline
+
+# External library imports (requires virtual environment)
+try:
+    import aiohttp
+except ImportError:  # Only needed for the async API
+    aiohttp = None
+
+# Loaded on first use
+requests = binware_lazy.lazy_import('requests')
+
+#####################################
+# Global Variables
+#####################################
+
+DEFAULT_CONCURRENCY: int = 16
+DEFAULT_PER_HOST_LIMIT: int = binware_fetch.DEFAULT_PER_HOST_LIMIT
+
+#####################################
+# Session Functions
+#####################################
+
+def require_aiohttp() -> None:
+    """Raise a helpful ImportError when the async API is used without aiohttp."""
+    if aiohttp is None:
+        raise ImportError("The async API requires aiohttp (pip install aiohttp)")
+
+def create_session(concurrency: int = DEFAULT_CONCURRENCY,
+                   per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                   connect_timeout: float = binware_http.DEFAULT_CONNECT_TIMEOUT,
+                   read_timeout: float = binware_http.DEFAULT_READ_TIMEOUT):
+    """
+    Create an aiohttp session with a bounded connection pool and timeouts.
+
+    Must be called from inside a running event loop.
+
+    Parameters:
+    - concurrency (int): Total connections to keep open.
+    - per_host_limit (int): Connections to any single host.
+    - connect_timeout (float): Seconds to wait for a connection.
+    - read_timeout (float): Seconds to wait between reads.
+
+    Returns:
+    - aiohttp.ClientSession: A session to share across all tasks.
+    """
+    require_aiohttp()
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host_limit)
+    timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+def to_requests_response(url: str, status: int, headers, body: bytes, reason: str = None) -> requests.Response:
+    """
+    Wrap a downloaded body in a requests.Response.
+
+    The write functions then decode text and JSON exactly as they would
+    for a sync download (same charset rules and fallbacks).
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.reason = reason
+    response.headers = requests.structures.CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+#####################################
+# Fetch Functions
+#####################################
+
+async def aget(session, url: str, max_retries: int = binware_http.DEFAULT_MAX_RETRIES,
+               backoff_factor: float = binware_http.DEFAULT_BACKOFF_FACTOR,
+               max_backoff: float = binware_http.DEFAULT_MAX_BACKOFF) -> requests.Response:
+    """
+    GET a URL, retrying connection errors, timeouts and retryable statuses.
+
+    Uses the same retryable statuses and backoff (full jitter, numeric
+    Retry-After honored) as binware_http.FetchClient.
+
+    Parameters:
+    - session (aiohttp.ClientSession): The shared session.
+    - url (str): The URL to fetch.
+    - max_retries (int): Retries after the first attempt.
+    - backoff_factor (float): Base delay for exponential backoff.
+    - max_backoff (float): Longest delay between attempts.
+
+    Returns:
+    - requests.Response: The final response with its body loaded; may be an error status.
+    """
+    attempt = 0
+    while True:
+        retry_after = None
+        try:
+            async with session.get(url) as response:
+                body = await response.read()
+                if response.status not in binware_http.RETRY_STATUSES or attempt >= max_retries:
+                    return to_requests_response(str(response.url), response.status, response.headers, body,
+                                                response.reason)
+                retry_after = response.headers.get('Retry-After')
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt >= max_retries:
+                raise
+        try:
+            delay = min(float(retry_after), max_backoff)
+        except (TypeError, ValueError):
+            delay = random.uniform(0, min(max_backoff, backoff_factor * 2 ** attempt))
+        await asyncio.sleep(delay)
+        attempt += 1
+
+async def afetch_and_write(kind: str, folder_name: str, filename: str, url: str,
+                           session=None, executor: Optional[Executor] = None) -> bool:
+    """
+    Fetch a URL and write it with the write_*_file function for its kind.
+
+    Parameters:
+    - kind (str): One of binware_fetch.FETCH_KINDS.
+    - folder_name (str): The folder where the file will be saved.
+    - filename (str): The name of the file to save the data.
+    - url (str): The URL to fetch.
+    - session (aiohttp.ClientSession): Shared session; a temporary one is used if omitted.
+    - executor (Executor): Where the file write runs; the loop's default if omitted.
+
+    Returns:
+    - bool: True if the file was written; the write_*_file function prints why it was not.
+
+    Raises:
+    - aiohttp.ClientError, asyncio.TimeoutError, requests.HTTPError: If the download fails.
+    """
+    job = binware_fetch.make_job(url, folder_name, filename, kind)
+    if session is None:
+        async with create_session() as session:
+            return await afetch_and_write(kind, folder_name, filename, url, session, executor)
+    response = await aget(session, url)
+    response.raise_for_status()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, binware_analytics.write_fetched_response, job, response)
+
+async def _afetch_and_report(kind: str, label: str, folder_name: str, filename: str, url: str,
+                             session=None, executor: Optional[Executor] = None) -> None:
+    """Run afetch_and_write and print failures the way the sync fetch functions do."""
+    require_aiohttp()
+    try:
+        await afetch_and_write(kind, folder_name, filename, url, session, executor)
+    except (requests.RequestException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Failed to fetch {label} data: {e}")
+
+async def afetch_and_write_txt_data(folder_name: str, filename: str, url: str,
+                                    session=None, executor: Optional[Executor] = None) -> None:
+    """Async fetch_and_write_txt_data; see afetch_and_write for the extra parameters."""
+    await _afetch_and_report('txt', 'text', folder_name, filename, url, session, executor)
+
+async def afetch_and_write_csv_data(folder_name: str, filename: str, url: str,
+                                    session=None, executor: Optional[Executor] = None) -> None:
+    """Async fetch_and_write_csv_data; see afetch_and_write for the extra parameters."""
+    await _afetch_and_report('csv', 'CSV', folder_name, filename, url, session, executor)
+
+async def afetch_and_write_json_data(folder_name: str, filename: str, url: str,
+                                     session=None, executor: Optional[Executor] = None) -> None:
+    """Async fetch_and_write_json_data; see afetch_and_write for the extra parameters."""
+    await _afetch_and_report('json', 'JSON', folder_name, filename, url, session, executor)
+
+async def afetch_and_write_excel_data(folder_name: str, filename: str, url: str,
+                                      session=None, executor: Optional[Executor] = None) -> None:
+    """Async fetch_and_write_excel_data; see afetch_and_write for the extra parameters."""
+    await _afetch_and_report('excel', 'Excel', folder_name, filename, url, session, executor)
+
+#####################################
+# Process Functions
+#####################################
+
+async def _run_in_executor(function, executor: Optional[Executor], *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(function, *args, **kwargs))
+
+async def aprocess_txt_file(folder_name: str, input_filename: str, output_filename: str,
+                            executor: Optional[Executor] = None, **options) -> dict:
+    """
+    Run process_txt_file in an executor so counting never blocks the loop.
+
+    Pass a ProcessPoolExecutor to parse several large files in parallel;
+    the default thread pool is enough to keep the loop responsive.
+    Keyword options are passed through to process_txt_file, and its
+    result is returned (None on error).
+    """
+    return await _run_in_executor(binware_analytics.process_txt_file, executor,
+                                  folder_name, input_filename, output_filename, **options)
+
+async def aprocess_csv_file(folder_name: str, input_filename: str, output_filename: str,
+                            executor: Optional[Executor] = None, **options) -> dict:
+    """Run process_csv_file in an executor; see aprocess_txt_file."""
+    return await _run_in_executor(binware_analytics.process_csv_file, executor,
+                                  folder_name, input_filename, output_filename, **options)
+
+async def aprocess_json_file(folder_name: str, input_filename: str, output_filename: str,
+                             executor: Optional[Executor] = None, **options) -> int:
+    """Run process_json_file in an executor; see aprocess_txt_file."""
+    return await _run_in_executor(binware_analytics.process_json_file, executor,
+                                  folder_name, input_filename, output_filename, **options)
+
+async def aprocess_excel_file(folder_name: str, input_filename: str, output_filename: str,
+                              executor: Optional[Executor] = None, **options) -> float:
+    """Run process_excel_file in an executor; see aprocess_txt_file."""
+    return await _run_in_executor(binware_analytics.process_excel_file, executor,
+                                  folder_name, input_filename, output_filename, **options)
+
+#####################################
+# Batch Functions
+#####################################
+
+async def gather_limited(awaitables: Iterable[Awaitable], limit: int = DEFAULT_CONCURRENCY) -> list:
+    """
+    Await many awaitables with at most `limit` running at once.
+
+    Parameters:
+    - awaitables (iterable): Coroutines or futures to run.
+    - limit (int): Largest number in flight.
+
+    Returns:
+    - list: Results in input order; exceptions are returned in place of results.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(bounded(awaitable) for awaitable in awaitables), return_exceptions=True)
+
+async def arefresh_datasets(datasets: list, concurrency: int = DEFAULT_CONCURRENCY,
+                            per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                            executor: Optional[Executor] = None) -> list:
+    """
+    Fetch, write and process many datasets concurrently.
+
+    At most `concurrency` datasets are in flight at once. A dataset with
+    depends_on waits (without holding a slot) until its dependencies
+    succeed, and is skipped if any of them fails. A dataset fails when
+    the download fails, the file cannot be written, or the processor
+    returns None.
+
+    Parameters:
+    - datasets (list): binware_pipeline.Dataset entries.
+    - concurrency (int): Datasets to refresh at the same time.
+    - per_host_limit (int): Connections to any single host.
+    - executor (Executor): Where writes and processing run; the loop's default if omitted.
+
+    Returns:
+    - list: StageTiming entries, one per dataset, with stage 'refresh' or 'skipped'.
+    """
+    require_aiohttp()
+    binware_pipeline.validate_pipeline(datasets)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    tasks = {}
+
+    async def refresh(dataset: binware_pipeline.Dataset, session) -> binware_pipeline.StageTiming:
+        for dependency in dataset.depends_on:
+            if not (await tasks[dependency]).ok:
+                return binware_pipeline.StageTiming(dataset.name, 'skipped', 0.0, False, 'a dependency failed')
+        async with semaphore:
+            start = loop.time()
+            try:
+                # The write_* and process_* functions print their own errors and return False or None
+                if not await afetch_and_write(dataset.kind, dataset.folder_name, dataset.filename, dataset.url,
+                                              session, executor):
+                    return binware_pipeline.StageTiming(dataset.name, 'refresh', loop.time() - start, False,
+                                                        f"could not write {dataset.filename}")
+                process, default_output = binware_analytics.PROCESSORS[dataset.kind]
+                processed = await _run_in_executor(process, executor, dataset.folder_name, dataset.filename,
+                                                   dataset.output_filename or default_output, **dataset.options)
+                if processed is None:
+                    return binware_pipeline.StageTiming(dataset.name, 'refresh', loop.time() - start, False,
+                                                        'processor failed')
+            except (requests.RequestException, aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                return binware_pipeline.StageTiming(dataset.name, 'refresh', loop.time() - start, False,
+                                                    str(e) or type(e).__name__)
+            return binware_pipeline.StageTiming(dataset.name, 'refresh', loop.time() - start, True)
+
+    async with create_session(concurrency, per_host_limit) as session:
+        for dataset in datasets:
+            tasks[dataset.name] = asyncio.ensure_future(refresh(dataset, session))
+        return list(await asyncio.gather(*tasks.values()))
+
+async def arun_pipeline_config(config_path: str = binware_pipeline.DEFAULT_PIPELINE_CONFIG,
+                               executor: Optional[Executor] = None) -> list:
+    """
+    Refresh every dataset in a pipeline config and print the timings.
+
+    Parameters:
+    - config_path (str): Path to the JSON pipeline config.
+    - executor (Executor): Where writes and processing run.
+
+    Returns:
+    - list: StageTiming entries from arefresh_datasets.
+    """
+    config = binware_pipeline.load_pipeline(pathlib.Path(config_path))
+    timings = await arefresh_datasets(config['datasets'],
+                                      concurrency=config.get('max_workers', DEFAULT_CONCURRENCY),
+                                      per_host_limit=config.get('per_host_limit', DEFAULT_PER_HOST_LIMIT),
+                                      executor=executor)
+    print(binware_pipeline.format_timings(timings))
+    return timings
@@ -0,0 +1,345 @@
+"""
+Module: Python With Bin - Batch Directory Processing
+
+Processes every recognized file in a folder with a process pool. Each
+file goes to the process_*_file function for its extension and gets its
+own results file. The workers also return small mergeable partials, and
+these are combined into one roll-up for the whole folder:
+
+- text: total words and an approximate count of unique words across all
+  files (HyperLogLog sketches merged)
+- CSV: count, exact global mean, min, max and variance of each column,
+  merged from per-file partial sums
+- JSON: total values listed
+- Excel: grand total of the summed column
+
+A bad file is recorded as a failure and the batch carries on; all
+failures are listed at the end. Per-file metrics can also go to a
+binware_results store (keyed by input path), with the per-file text
+files switched off.
+
+Usage:
+    python binware_batch.py data-txt --workers 4
+    python binware_batch.py data-csv --recursive --output-folder data-csv-results
+"""
+
+# Standard library imports
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import os
+import pathlib
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Local module imports
+import binware_analytics
+import binware_results
+import binware_sketch
+import binware_write
+
+#####################################
+# Global Variables
+#####################################
+
+# File extension -> processor kind (see binware_analytics.PROCESSORS)
+EXTENSION_KINDS = {
+    '.txt': 'txt',
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'json',
+    '.ndjson': 'json',
+    '.xls': 'excel',
+    '.xlsx': 'excel',
+}
+
+DEFAULT_ROLLUP_FILENAME: str = 'results_rollup.txt'
+
+#####################################
+# Result Types
+#####################################
+
+@dataclass
+class FileResult:
+    """Outcome of processing one file, plus the partial it adds to the roll-up."""
+    input_path: str
+    kind: str
+    ok: bool
+    seconds: float = 0.0
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    partial: dict = field(default_factory=dict)
+    metrics: dict = field(default_factory=dict)
+
+#####################################
+# Discovery Functions
+#####################################
+
+def find_batch_files(folder_name: str, pattern: str = '*', recursive: bool = False,
+                     exclude: Optional[pathlib.Path] = None) -> list:
+    """
+    List the files in a folder that have a processor for their extension.
+
+    Parameters:
+    - folder_name (str): The folder to scan.
+    - pattern (str): Glob pattern to match, e.g. '*.csv'.
+    - recursive (bool): Also scan subfolders.
+    - exclude (pathlib.Path): A folder to skip, such as the results folder.
+
+    Returns:
+    - list: Matching paths, sorted.
+    """
+    folder = pathlib.Path(folder_name)
+    paths = folder.rglob(pattern) if recursive else folder.glob(pattern)
+    exclude = exclude.resolve() if exclude is not None else None
+    files = []
+    for path in paths:
+        if not path.is_file() or path.suffix.lower() not in EXTENSION_KINDS:
+            continue
+        if path.name.startswith('results_'):
+            continue  # Output of an earlier run
+        if any(part.startswith('.') for part in path.relative_to(folder).parts):
+            continue  # Hidden folders such as the .parsed cache
+        if exclude is not None and exclude in path.resolve().parents:
+            continue
+        files.append(path)
+    return sorted(files)
+
+#####################################
+# Worker Functions
+#####################################
+
+def make_partial(kind: str, result) -> dict:
+    """
+    Reduce a process_*_file return value to what the roll-up needs.
+
+    Word counts are turned into a HyperLogLog sketch so the worker sends
+    back a few KB instead of every distinct word.
+    """
+    if kind == 'txt':
+        sketch = result.get('sketch')
+        if sketch is None:
+            sketch = binware_sketch.HyperLogLog()
+            sketch.update(result['counts'])
+        return {'words': result['words'], 'sketch': sketch.to_bytes()}
+    if kind == 'csv':
+        return {'stats': result}
+    if kind == 'json':
+        return {'values': result}
+    return {'total': result}
+
+def process_batch_file(folder_name: str, input_filename: str, output_filename: str,
+                       kind: str, options: dict) -> FileResult:
+    """
+    Process one file in a worker and return its result and partial.
+
+    The process functions report errors by printing them and returning
+    None, so their output is captured and used as the error message.
+
+    Parameters:
+    - folder_name (str): The folder the batch is running over.
+    - input_filename (str): Path of the input, relative to folder_name.
+    - output_filename (str): Path of the results file, relative to folder_name; None for no file.
+    - kind (str): Processor kind from EXTENSION_KINDS.
+    - options (dict): Keyword options for the processor.
+
+    Returns:
+    - FileResult: The outcome; never raises for a bad file.
+    """
+    input_path = str(pathlib.Path(folder_name) / input_filename)
+    process, _ = binware_analytics.PROCESSORS[kind]
+    messages = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(messages):
+            result = process(folder_name, input_filename, output_filename, **options)
+    except Exception as e:
+        return FileResult(input_path, kind, False, time.perf_counter() - start, error=repr(e))
+    seconds = time.perf_counter() - start
+    if result is None:
+        error = " ".join(line.strip() for line in messages.getvalue().splitlines() if line.strip())
+        return FileResult(input_path, kind, False, seconds, error=error or 'processing failed')
+    output_path = str(pathlib.Path(folder_name) / output_filename) if output_filename else None
+    return FileResult(input_path, kind, True, seconds, output_path, partial=make_partial(kind, result),
+                      metrics=binware_results.metrics_from_result(kind, result))
+
+#####################################
+# Roll-up Functions
+#####################################
+
+def rollup(results: list) -> dict:
+    """
+    Merge the partials of every successful file, per kind.
+
+    Parameters:
+    - results (list): FileResult entries from run_batch.
+
+    Returns:
+    - dict: Kind -> merged figures, including file and failure counts.
+    """
+    totals = {}
+    for result in results:
+        entry = totals.setdefault(result.kind, {'files': 0, 'failed': 0})
+        if not result.ok:
+            entry['failed'] += 1
+            continue
+        entry['files'] += 1
+        partial = result.partial
+        if result.kind == 'txt':
+            entry['words'] = entry.get('words', 0) + partial['words']
+            sketch = binware_sketch.HyperLogLog.from_bytes(partial['sketch'])
+            if 'sketch' in entry:
+                entry['sketch'].merge(sketch)
+            else:
+                entry['sketch'] = sketch
+        elif result.kind == 'csv':
+            columns = entry.setdefault('columns', {})
+            for column, stats in partial['stats'].items():
+                if column in columns:
+                    columns[column].merge(stats)
+                else:
+                    columns[column] = stats
+        elif result.kind == 'json':
+            entry['values'] = entry.get('values', 0) + partial['values']
+        else:
+            entry['total'] = entry.get('total', 0) + partial['total']
+    return totals
+
+def format_rollup(totals: dict) -> str:
+    """
+    Build the roll-up as plain text in the style of the results files.
+
+    Parameters:
+    - totals (dict): The output of rollup.
+
+    Returns:
+    - str: The roll-up text.
+    """
+    lines = []
+    for kind, entry in totals.items():
+        lines.append(f"{kind.upper()} files processed: {entry['files']} ({entry['failed']} failed)")
+        if 'words' in entry:
+            sketch = entry['sketch']
+            lines.append(f"Total Words: {entry['words']}")
+            lines.append(f"Unique Words (approx): {sketch.estimate()} (+/- {sketch.relative_error:.2%})")
+        for column, stats in entry.get('columns', {}).items():
+            label = column.title()
+            lines.append(f"Average {label}: {stats.mean}")
+            if stats.count:
+                lines.append(f"{label} Count: {stats.count}")
+                lines.append(f"{label} Min: {stats.minimum}")
+                lines.append(f"{label} Max: {stats.maximum}")
+                lines.append(f"{label} Variance: {stats.variance}")
+        if 'values' in entry:
+            lines.append(f"Total JSON Values: {entry['values']}")
+        if 'total' in entry:
+            lines.append(f"Total Value from Excel Data: {entry['total']}")
+    return "\n".join(lines) + "\n"
+
+#####################################
+# Batch Functions
+#####################################
+
+def run_batch(folder_name: str, output_folder: Optional[str] = None, pattern: str = '*',
+              recursive: bool = False, workers: Optional[int] = None,
+              options: Optional[dict] = None, store: Optional[binware_results.ResultStore] = None,
+              run_id: Optional[str] = None, text_results: bool = True) -> tuple:
+    """
+    Process every recognized file in a folder with a process pool.
+
+    Per-file results go to output_folder as results_<input name>.txt
+    (mirroring subfolders), and the roll-up to results_rollup.txt.
+
+    Parameters:
+    - folder_name (str): The folder of inputs.
+    - output_folder (str): Where results go (default: '<folder_name>-results').
+    - pattern (str): Glob pattern of inputs to include.
+    - recursive (bool): Also process files in subfolders.
+    - workers (int): Worker processes (default: one per CPU).
+    - options (dict): Kind -> keyword options for that processor, e.g. {'txt': {'top_n': 10}}.
+    - store (ResultStore): Also record each file's metrics here, keyed by its input path.
+    - run_id (str): The run to record metrics under; a new one if omitted.
+    - text_results (bool): Write a results file per input (the roll-up is always written).
+
+    Returns:
+    - tuple: ([FileResult, ...] in file order, roll-up dict).
+    """
+    folder = pathlib.Path(folder_name)
+    output = pathlib.Path(output_folder) if output_folder else folder.resolve().with_name(folder.resolve().name + '-results')
+    options = options or {}
+    files = find_batch_files(folder, pattern, recursive, exclude=output)
+    tasks = []
+    for path in files:
+        relative = path.relative_to(folder)
+        output_filename = None
+        if text_results:
+            output_path = output / relative.parent / f"results_{relative.name}.txt"
+            binware_write.ensure_folder(output_path.parent)
+            output_filename = os.path.relpath(output_path, folder)
+        kind = EXTENSION_KINDS[path.suffix.lower()]
+        tasks.append((str(folder), str(relative), output_filename, kind, options.get(kind, {})))
+
+    # Workers write results without syncing; they are fsynced together below
+    sync = binware_write.sync_mode()
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=binware_write.configure,
+                                                initargs=('none' if sync == 'batch' else sync,)) as pool:
+        futures = [pool.submit(process_batch_file, *task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:  # e.g. a worker was killed
+                results.append(FileResult(str(folder / task[1]), task[3], False, error=repr(e)))
+    if sync == 'batch':
+        binware_write.sync_files(result.output_path for result in results if result.ok and result.output_path)
+
+    if store is not None:
+        run_id = store.start_run(run_id)
+        for result in results:
+            if result.ok:
+                store.add(run_id, result.input_path, result.metrics)
+        store.flush()
+
+    totals = rollup(results)
+    rollup_path = output / DEFAULT_ROLLUP_FILENAME
+    binware_write.write_atomic(rollup_path, format_rollup(totals))
+    failures = [result for result in results if not result.ok]
+    print(f"Processed {len(results) - len(failures)}/{len(results)} files from {folder}; "
+          f"roll-up saved to {rollup_path}")
+    if failures:
+        print(f"{len(failures)} files failed:")
+        for result in failures:
+            print(f"- {result.input_path}: {result.error}")
+    return results, totals
+
+#####################################
+# Main Function
+#####################################
+
+def main() -> None:
+    """Parse command-line arguments and process a folder."""
+    parser = argparse.ArgumentParser(description="Process every data file in a folder with a process pool.")
+    parser.add_argument('folder', help="Folder of .txt, .csv, .json/.jsonl and .xls/.xlsx inputs")
+    parser.add_argument('--output-folder', help="Where results go (default: <folder>-results)")
+    parser.add_argument('--pattern', default='*', help="Glob pattern of inputs to include")
+    parser.add_argument('--recursive', action='store_true', help="Also process subfolders")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--results-db', help="Also record per-file metrics in this SQLite result store")
+    parser.add_argument('--no-text-results', action='store_true', help="Skip the per-file results files")
+    args = parser.parse_args()
+    store = binware_results.ResultStore(args.results_db) if args.results_db else None
+    try:
+        run_batch(args.folder, args.output_folder, args.pattern, args.recursive, args.workers,
+                  store=store, text_results=not args.no_text_results)
+    finally:
+        if store is not None:
+            store.close()
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == '__main__':
+    main()
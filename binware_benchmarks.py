@@ -0,0 +1,1014 @@
+"""
+Module: Python With Bin - Benchmarks
+
+Times the processing paths in binware_analytics against synthetic data.
+
+Generating the .xls inputs needs xlwt (pip install xlwt), which the
+project itself does not use. Without it the .xls cases are skipped, and
+a suite run compared with a baseline that has them fails.
+
+Usage:
+    python binware_benchmarks.py csv --rows 100000 1000000 10000000
+    python binware_benchmarks.py words --megabytes 256 --max-workers 8
+    python binware_benchmarks.py excel --rows 100000
+    python binware_benchmarks.py parsed --csv-rows 1000000 --xls-rows 65535
+    python binware_benchmarks.py suite --save bench_results.json
+    python binware_benchmarks.py startup --budget-ms 150
+    python binware_benchmarks.py running --values 10000000
+    python binware_benchmarks.py folders --partitions 100000
+    python binware_benchmarks.py schedule --ticks 100 --interval 0.1 --work-ms 20
+    python binware_benchmarks.py writes --small-files 2000 --large-files 4 --large-megabytes 64
+    python binware_benchmarks.py suite --baseline bench_results.json --threshold 0.2
+"""
+
+# Standard library imports
+import argparse
+import array
+import contextlib
+import csv
+import functools
+import json
+import os
+import pathlib
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# External library imports (requires virtual environment)
+import openpyxl
+import xlrd
+
+# Local module imports
+import binware_aggregate
+import binware_analytics
+import binware_columnar
+import binware_excel
+import binware_parsed
+import binware_project_setup
+import binware_schedule
+import binware_text
+import binware_write
+import utils_binware
+
+#####################################
+# Global Variables
+#####################################
+
+REGIONS = [
+    "Western Europe",
+    "North America and ANZ",
+    "Latin America and Caribbean",
+    "Central and Eastern Europe",
+    "East Asia",
+    "Southeast Asia",
+    "South Asia",
+    "Middle East and North Africa",
+    "Sub-Saharan Africa",
+]
+
+# Extra numeric columns so the synthetic CSV is as wide as the happiness data
+EXTRA_COLUMNS = [
+    "Standard error of ladder score",
+    "Logged GDP per capita",
+    "Social support",
+    "Healthy life expectancy",
+    "Freedom to make life choices",
+    "Generosity",
+    "Perceptions of corruption",
+]
+
+# The .xls format stops at 65536 rows, header included
+XLS_MAX_ROWS: int = 65536
+
+CRAFTS = ["ISS", "Tiangong", "Crew Dragon", "Soyuz"]
+
+# A suite result counts as a regression when it is this much slower (or bigger) than the baseline
+DEFAULT_REGRESSION_THRESHOLD: float = 0.20
+
+# Modules whose startup is measured, and the heavy packages they must not import eagerly
+STARTUP_MODULES = ['binware_analytics', 'binware_batch', 'utils_binware']
+LAZY_PACKAGES = ['requests', 'openpyxl', 'xlrd', 'numpy', 'ijson']
+
+#####################################
+# Synthetic Data Generators
+#####################################
+
+def generate_csv(file_path: pathlib.Path, rows: int, seed: int = 42) -> pathlib.Path:
+    """
+    Write a happiness-style CSV with a 'Ladder score' and 'Regional indicator' column.
+
+    Parameters:
+    - file_path (pathlib.Path): Where to write the CSV.
+    - rows (int): Number of data rows.
+    - seed (int): Random seed, so runs are reproducible.
+
+    Returns:
+    - pathlib.Path: The path written.
+    """
+    rng = random.Random(seed)
+    file_path = pathlib.Path(file_path)
+    with file_path.open('w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Country name", "Regional indicator", "Ladder score"] + EXTRA_COLUMNS)
+        for i in range(rows):
+            writer.writerow([f"Country {i}", rng.choice(REGIONS), f"{rng.uniform(2.5, 7.9):.9f}"]
+                            + [f"{rng.uniform(-1, 80):.9f}" for _ in EXTRA_COLUMNS])
+    return file_path
+
+def generate_text(file_path: pathlib.Path, megabytes: float, vocabulary: int = 50_000,
+                  seed: int = 42) -> pathlib.Path:
+    """
+    Write a text file of roughly the given size drawn from a synthetic vocabulary.
+
+    Parameters:
+    - file_path (pathlib.Path): Where to write the text.
+    - megabytes (float): Approximate size of the file.
+    - vocabulary (int): Number of distinct words to draw from.
+    - seed (int): Random seed, so runs are reproducible.
+
+    Returns:
+    - pathlib.Path: The path written.
+    """
+    rng = random.Random(seed)
+    words = [f"word{i}" if i % 3 else f"Word{i}" for i in range(vocabulary)]
+    target = int(megabytes * 1024 * 1024)
+    written = 0
+    file_path = pathlib.Path(file_path)
+    with file_path.open('w', encoding='utf-8') as file:
+        while written < target:
+            line = " ".join(rng.choices(words, k=12)) + "\n"
+            file.write(line)
+            written += len(line)
+    return file_path
+
+def generate_json(file_path: pathlib.Path, records: int, seed: int = 42) -> pathlib.Path:
+    """
+    Write an open-notify style document with a 'people' array of name/craft records.
+
+    Parameters:
+    - file_path (pathlib.Path): Where to write the JSON.
+    - records (int): Number of entries in the 'people' array.
+    - seed (int): Random seed, so runs are reproducible.
+
+    Returns:
+    - pathlib.Path: The path written.
+    """
+    rng = random.Random(seed)
+    file_path = pathlib.Path(file_path)
+    with file_path.open('w', encoding='utf-8') as file:
+        file.write('{"message": "success", "number": %d, "people": [' % records)
+        for i in range(records):
+            person = {'name': f"Astronaut {i}", 'craft': rng.choice(CRAFTS)}
+            file.write((', ' if i else '') + json.dumps(person))
+        file.write(']}')
+    return file_path
+
+def generate_xlsx(file_path: pathlib.Path, rows: int, seed: int = 42) -> pathlib.Path:
+    """
+    Write an .xlsx workbook with a header row and numeric values in the second column.
+
+    Parameters:
+    - file_path (pathlib.Path): Where to write the workbook.
+    - rows (int): Number of data rows.
+    - seed (int): Random seed, so runs are reproducible.
+
+    Returns:
+    - pathlib.Path: The path written.
+    """
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Sheet1")
+    worksheet.append(["id", "value", "label"])
+    for i in range(rows):
+        worksheet.append([i, round(rng.uniform(0, 100), 3), f"row {i}"])
+    file_path = pathlib.Path(file_path)
+    workbook.save(file_path)
+    return file_path
+
+def generate_xls(file_path: pathlib.Path, rows: int, seed: int = 42) -> pathlib.Path:
+    """
+    Write a legacy .xls workbook like generate_xlsx (needs xlwt; at most 65535 rows).
+
+    Parameters:
+    - file_path (pathlib.Path): Where to write the workbook.
+    - rows (int): Number of data rows.
+    - seed (int): Random seed, so runs are reproducible.
+
+    Returns:
+    - pathlib.Path: The path written.
+    """
+    import xlwt  # Only needed to generate .xls benchmark inputs
+    rng = random.Random(seed)
+    workbook = xlwt.Workbook()
+    worksheet = workbook.add_sheet("Sheet1")
+    for col, title in enumerate(["id", "value", "label"]):
+        worksheet.write(0, col, title)
+    for i in range(min(rows, XLS_MAX_ROWS - 1)):
+        worksheet.write(i + 1, 0, i)
+        worksheet.write(i + 1, 1, round(rng.uniform(0, 100), 3))
+        worksheet.write(i + 1, 2, f"row {i}")
+    file_path = pathlib.Path(file_path)
+    workbook.save(str(file_path))
+    return file_path
+
+#####################################
+# Reference Implementations
+#####################################
+
+def dictreader_mean(file_path: pathlib.Path, column: str = 'Ladder score') -> float:
+    """The original process_csv_file approach: DictReader rows in a list, then statistics.mean."""
+    data = []
+    with pathlib.Path(file_path).open('r', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            data.append(row)
+    scores = [float(row[column]) for row in data if column in row and row[column]]
+    return statistics.mean(scores) if scores else 0.0
+
+def cell_value_sum(file_path: pathlib.Path) -> float:
+    """The original process_excel_file approach: parse every sheet, then read cells one at a time."""
+    workbook = xlrd.open_workbook(str(file_path))
+    sheet = workbook.sheet_by_index(0)
+    total = 0
+    for row_idx in range(1, sheet.nrows):
+        cell_value = sheet.cell_value(row_idx, 1)
+        if isinstance(cell_value, (int, float)):
+            total += cell_value
+    return total
+
+#####################################
+# Timing Helpers
+#####################################
+
+def time_call(function, *args, **kwargs) -> tuple:
+    """Run a function once and return (seconds, result)."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def peak_memory_call(function, *args, **kwargs) -> int:
+    """Run a function once under tracemalloc and return its peak Python allocation in bytes."""
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+#####################################
+# CSV Benchmarks
+#####################################
+
+def benchmark_csv(row_counts: list, work_dir: pathlib.Path) -> list:
+    """
+    Compare the DictReader, streaming and columnar CSV paths.
+
+    Parameters:
+    - row_counts (list): Synthetic file sizes to test.
+    - work_dir (pathlib.Path): Folder for the generated files.
+
+    Returns:
+    - list: One dict per (rows, method) with seconds, rows_per_second and mean.
+    """
+    columns = ['Ladder score']
+    results = []
+    for rows in row_counts:
+        file_path = generate_csv(pathlib.Path(work_dir) / f"bench_{rows}.csv", rows)
+        methods = {
+            'dictreader': lambda: dictreader_mean(file_path),
+            'streaming': lambda: binware_aggregate.aggregate_csv(file_path, columns)['Ladder score'].mean,
+            'columnar': lambda: binware_columnar.summarize_csv(file_path, columns)['Ladder score'].mean,
+            'columnar-groupby': lambda: len(binware_columnar.group_means_csv(file_path, columns, 'Regional indicator')),
+        }
+        for name, method in methods.items():
+            seconds, value = time_call(method)
+            results.append({'rows': rows, 'method': name, 'seconds': seconds,
+                            'rows_per_second': rows / seconds if seconds else 0.0, 'value': value})
+            print(f"{rows:>10} rows  {name:<17} {seconds:8.3f}s  {rows / seconds:>12,.0f} rows/s  -> {value}")
+        file_path.unlink()
+    return results
+
+#####################################
+# Word Count Benchmarks
+#####################################
+
+def benchmark_words(megabytes: float, max_workers: int, work_dir: pathlib.Path) -> list:
+    """
+    Measure how parallel word counting scales from 1 to max_workers processes.
+
+    Parameters:
+    - megabytes (float): Size of the synthetic text file.
+    - max_workers (int): Largest worker count to try.
+    - work_dir (pathlib.Path): Folder for the generated file.
+
+    Returns:
+    - list: One dict per worker count with seconds, MB/s and speedup.
+    """
+    file_path = generate_text(pathlib.Path(work_dir) / "bench_words.txt", megabytes)
+    size_mb = file_path.stat().st_size / 1e6
+    seconds, counts = time_call(binware_text.count_words, file_path)
+    print(f"{'streaming':<12} {seconds:8.3f}s  {size_mb / seconds:8.1f} MB/s  "
+          f"total={sum(counts.values())} unique={len(counts)}")
+    results = []
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        seconds, counts = time_call(binware_text.count_words_parallel, file_path, workers=workers)
+        baseline = baseline or seconds
+        results.append({'workers': workers, 'seconds': seconds,
+                        'mb_per_second': size_mb / seconds, 'speedup': baseline / seconds})
+        print(f"{workers:>2} workers   {seconds:8.3f}s  {size_mb / seconds:8.1f} MB/s  "
+              f"speedup={baseline / seconds:4.2f}x  total={sum(counts.values())} unique={len(counts)}")
+    file_path.unlink()
+    return results
+
+#####################################
+# Excel Benchmarks
+#####################################
+
+def benchmark_excel(rows: int, work_dir: pathlib.Path) -> list:
+    """
+    Compare full-workbook cell-by-cell reads with the on-demand and read-only paths.
+
+    The .xlsx workbook has the requested number of rows; the .xls one is
+    capped at the format's 65535 data rows and skipped if xlwt is missing.
+
+    Parameters:
+    - rows (int): Data rows in the generated workbooks.
+    - work_dir (pathlib.Path): Folder for the generated files.
+
+    Returns:
+    - list: One dict per (format, method) with seconds, rows_per_second and peak_bytes.
+    """
+    results = []
+    workbooks = [('xlsx', generate_xlsx(pathlib.Path(work_dir) / "bench.xlsx", rows), rows)]
+    try:
+        workbooks.append(('xls', generate_xls(pathlib.Path(work_dir) / "bench.xls", rows),
+                          min(rows, XLS_MAX_ROWS - 1)))
+    except ImportError:
+        print("xlwt is not installed; skipping the .xls benchmark")
+    for file_format, file_path, data_rows in workbooks:
+        methods = {
+            'xlrd cell_value': lambda: cell_value_sum(file_path),
+            'sum_excel_column': lambda: binware_excel.sum_excel_column(file_path),
+        }
+        for name, method in methods.items():
+            seconds, value = time_call(method)
+            peak_bytes = peak_memory_call(method)
+            results.append({'format': file_format, 'rows': data_rows, 'method': name, 'seconds': seconds,
+                            'rows_per_second': data_rows / seconds if seconds else 0.0,
+                            'peak_bytes': peak_bytes, 'value': value})
+            print(f"{file_format:<5} {data_rows:>9} rows  {name:<17} {seconds:8.3f}s  "
+                  f"{data_rows / seconds:>12,.0f} rows/s  peak {peak_bytes / 1e6:8.1f} MB  -> {value}")
+        file_path.unlink()
+    return results
+
+#####################################
+# Parsed Cache Benchmarks
+#####################################
+
+def benchmark_parsed(csv_rows: int, xls_rows: int, work_dir: pathlib.Path, repeat: int = 3) -> list:
+    """
+    Compare re-parsing a file on every run with building and reloading its parsed cache.
+
+    'reparse' is what process_*_file does without parsed_cache, 'build' is
+    the one-off conversion and 'cached' a later run that memory-maps the
+    columns. The .xls case is skipped if xlwt is missing.
+
+    Parameters:
+    - csv_rows (int): Rows in the generated CSV file.
+    - xls_rows (int): Data rows in the generated .xls workbook (at most 65535).
+    - work_dir (pathlib.Path): Folder for the generated files.
+    - repeat (int): Timed runs of the reparse and cached methods; the fastest is kept.
+
+    Returns:
+    - list: One dict per (format, method) with seconds, rows_per_second and value.
+    """
+    columns = ['Ladder score']
+    cases = []
+    csv_path = generate_csv(pathlib.Path(work_dir) / "bench_parsed.csv", csv_rows)
+    cases.append(('csv', csv_path, csv_rows, {
+        'reparse streaming': lambda: binware_aggregate.aggregate_csv(csv_path, columns)['Ladder score'].mean,
+        'reparse columnar': lambda: binware_columnar.summarize_csv(csv_path, columns)['Ladder score'].mean,
+        'build': lambda: len(binware_parsed.build_csv_cache(csv_path).columns),
+        'cached': lambda: binware_parsed.summarize_csv(csv_path, columns)['Ladder score'].mean,
+    }))
+    try:
+        xls_path = generate_xls(pathlib.Path(work_dir) / "bench_parsed.xls", xls_rows)
+        cases.append(('xls', xls_path, min(xls_rows, XLS_MAX_ROWS - 1), {
+            'reparse': lambda: binware_excel.sum_excel_column(xls_path),
+            'build': lambda: len(binware_parsed.build_excel_cache(xls_path).columns),
+            'cached': lambda: binware_parsed.sum_excel_column(xls_path),
+        }))
+    except ImportError:
+        print("xlwt is not installed; skipping the .xls benchmark")
+    results = []
+    for file_format, file_path, rows, methods in cases:
+        for name, method in methods.items():
+            runs = [time_call(method) for _ in range(1 if name == 'build' else repeat)]
+            seconds, value = min(runs, key=lambda run: run[0])
+            results.append({'format': file_format, 'rows': rows, 'method': name, 'seconds': seconds,
+                            'rows_per_second': rows / seconds if seconds else 0.0, 'value': value})
+            print(f"{file_format:<4} {rows:>9} rows  {name:<18} {seconds:8.3f}s  "
+                  f"{rows / seconds:>12,.0f} rows/s  -> {value}")
+        file_path.unlink()
+    return results
+
+#####################################
+# Running Statistics Benchmarks
+#####################################
+
+def benchmark_running(values: int = 10_000_000, shards: int = 8, window: int = 1000, seed: int = 42) -> list:
+    """
+    Compare the utils_binware running statistics with statistics.mean and statistics.stdev.
+
+    The readings are generated once into a compact float array. The
+    statistics module needs all of them at hand and makes separate
+    passes; the accumulators take one pass and could equally consume a
+    live feed. 'sharded' fills one accumulator per shard and merges them.
+
+    Parameters:
+    - values (int): Number of readings.
+    - shards (int): Shards for the merge case.
+    - window (int): Window of the sliding-window case.
+    - seed (int): Random seed, so runs are reproducible.
+
+    Returns:
+    - list: One dict per method with seconds, values_per_second, mean and stdev.
+    """
+    rng = random.Random(seed)
+    readings = array.array('d', (rng.gauss(20.0, 5.0) for _ in range(values)))
+    size = -(-values // shards)
+
+    def sharded() -> utils_binware.RunningStats:
+        parts = [utils_binware.RunningStats(readings[start:start + size]) for start in range(0, values, size)]
+        return functools.reduce(utils_binware.RunningStats.merge, parts)
+
+    methods = {
+        'statistics': lambda: (statistics.mean(readings), statistics.stdev(readings)),
+        'RunningStats': lambda: utils_binware.RunningStats(readings),
+        'RunningStats exact': lambda: utils_binware.RunningStats(readings, exact=True),
+        'RunningStats sharded': sharded,
+        'EwmaStats': lambda: utils_binware.EwmaStats(halflife=window),
+        'SlidingWindowStats': lambda: utils_binware.SlidingWindowStats(window),
+    }
+    results = []
+    for name, method in methods.items():
+        start = time.perf_counter()
+        accumulator = method()
+        if name in ('EwmaStats', 'SlidingWindowStats'):
+            accumulator.update_many(readings)
+        seconds = time.perf_counter() - start
+        mean, stdev = accumulator if name == 'statistics' else (accumulator.mean, accumulator.stdev)
+        results.append({'method': name, 'values': values, 'seconds': seconds,
+                        'values_per_second': values / seconds if seconds else 0.0, 'mean': mean, 'stdev': stdev})
+        print(f"{name:<21} {seconds:8.3f}s  {values / seconds:>12,.0f} values/s  mean={mean!r} stdev={stdev!r}")
+    return results
+
+#####################################
+# Folder Provisioning Benchmarks
+#####################################
+
+def default_tmpfs_dir() -> pathlib.Path:
+    """/dev/shm when it exists (a tmpfs on Linux), otherwise the system temp folder."""
+    shm = pathlib.Path('/dev/shm')
+    return shm if shm.is_dir() and os.access(shm, os.W_OK) else pathlib.Path(tempfile.gettempdir())
+
+def per_folder_mkdir(paths: list) -> None:
+    """The original approach: mkdir and print once per folder."""
+    for path in paths:
+        path.mkdir(parents=True, exist_ok=True)
+        print(f"Folder created: {path}")
+
+def benchmark_folders(partitions: int, work_dir: pathlib.Path, workers: list) -> list:
+    """
+    Time creating region x year partition folders one by one and in bulk.
+
+    Each method starts from an empty folder; the last case provisions the
+    same spec again, when every folder already exists. Printed output
+    goes to os.devnull.
+
+    Parameters:
+    - partitions (int): Folders to create (100 regions x partitions / 100 years).
+    - work_dir (pathlib.Path): Where to create them, ideally on a tmpfs.
+    - workers (list): Thread counts to try for the bulk path.
+
+    Returns:
+    - list: One dict per method with seconds and folders_per_second.
+    """
+    region_names = [f"region-{index:03d}" for index in range(100)]
+    years = range(1, -(-partitions // len(region_names)) + 1)
+    methods = {'per-folder mkdir+print': lambda base: per_folder_mkdir(
+        binware_project_setup.partition_paths(years, region_names, base_path=base))}
+    for count in workers:
+        methods[f"provision workers={count}"] = lambda base, count=count: binware_project_setup.provision_partitions(
+            years, region_names, base_path=base, workers=count)
+    results = []
+    base = None
+    for index, (name, method) in enumerate(methods.items()):
+        base = pathlib.Path(tempfile.mkdtemp(prefix=f"folders-{index}-", dir=work_dir))
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            seconds, _ = time_call(method, base)
+        results.append({'method': name, 'partitions': len(region_names) * len(years), 'seconds': seconds})
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        seconds, _ = time_call(binware_project_setup.provision_partitions, years, region_names, base_path=base)
+    results.append({'method': 'provision (all exist)', 'partitions': len(region_names) * len(years),
+                    'seconds': seconds})
+    for result in results:
+        result['folders_per_second'] = result['partitions'] / result['seconds'] if result['seconds'] else 0.0
+        print(f"{result['method']:<24} {result['partitions']:>8} folders  {result['seconds']:8.3f}s  "
+              f"{result['folders_per_second']:>12,.0f} folders/s")
+    return results
+
+def sleep_loop(task, interval: float, ticks: int) -> None:
+    """The old create_folders_periodically loop: run the task, then sleep a full interval."""
+    for number in range(ticks):
+        task(number)
+        time.sleep(interval)
+
+def benchmark_schedule(ticks: int = 100, interval: float = 0.1, work_ms: float = 20.0) -> list:
+    """
+    Compare the old run-then-sleep loop with binware_schedule.Scheduler.
+
+    The task records when it started and then sleeps for work_ms, like a
+    short fetch. Drift is how far the last start is behind its ideal time
+    (first start + (ticks - 1) * interval); CPU is the process time used.
+
+    Parameters:
+    - ticks (int): Runs per method.
+    - interval (float): Seconds between runs.
+    - work_ms (float): Time each run takes.
+
+    Returns:
+    - list: One dict per method with drift, mean and max lateness, and CPU seconds.
+    """
+    def run_sleep_loop(task) -> None:
+        sleep_loop(task, interval, ticks)
+
+    def run_scheduler(task) -> None:
+        binware_schedule.Scheduler(lambda tick: task(tick.number), interval).run(max_ticks=ticks)
+
+    results = []
+    for name, method in (('sleep loop', run_sleep_loop), ('scheduler', run_scheduler)):
+        starts = []
+
+        def task(number: int) -> None:
+            starts.append(time.monotonic())
+            time.sleep(work_ms / 1000)
+
+        cpu_start = time.process_time()
+        seconds, _ = time_call(method, task)
+        lateness = [start - (starts[0] + number * interval) for number, start in enumerate(starts)]
+        results.append({'method': name, 'ticks': len(starts), 'seconds': seconds,
+                        'drift': lateness[-1], 'mean_lateness': statistics.mean(lateness),
+                        'max_lateness': max(lateness), 'cpu_seconds': time.process_time() - cpu_start})
+    for result in results:
+        print(f"{result['method']:<12} {result['ticks']:>5} ticks  {result['seconds']:8.2f}s  "
+              f"drift {result['drift'] * 1000:9.1f} ms  lateness mean {result['mean_lateness'] * 1000:8.1f} ms  "
+              f"max {result['max_lateness'] * 1000:8.1f} ms  cpu {result['cpu_seconds']:.3f}s")
+    return results
+
+def direct_write(file_path: pathlib.Path, data: bytes) -> None:
+    """The old write_*_file path: mkdir on every call, then write the target in place."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with file_path.open('wb') as file:
+        file.write(data)
+
+def benchmark_writes(small_files: int, small_bytes: int, large_files: int, large_megabytes: float,
+                     work_dir: pathlib.Path, json_records: int = 20_000) -> list:
+    """
+    Time writing many small files and a few large ones through each write path.
+
+    Methods: writing in place (the old write_*_file), and binware_write's
+    atomic rename with no fsync, an fsync per file, and fsyncs batched
+    to the end of the run. Also compares the size and time of indented
+    and compact JSON output.
+
+    Parameters:
+    - small_files (int): Number of small files, spread over 10 folders.
+    - small_bytes (int): Size of each small file.
+    - large_files (int): Number of large files.
+    - large_megabytes (float): Size of each large file.
+    - work_dir (pathlib.Path): Where to write (use a real disk; fsync is a no-op on tmpfs).
+    - json_records (int): Records in the JSON document.
+
+    Returns:
+    - list: One dict per case with seconds, files_per_second and MB_per_second.
+    """
+    rng = random.Random(42)
+    small = rng.randbytes(small_bytes)
+    large = rng.randbytes(int(large_megabytes * 1024 * 1024))
+
+    def atomic(sync: str):
+        def write(file_path: pathlib.Path, data: bytes) -> None:
+            binware_write.write_atomic(file_path, data)
+        write.sync = sync
+        return write
+
+    methods = {'in place (old)': direct_write, 'atomic, no fsync': atomic('none'),
+               'atomic, fsync per file': atomic('file'), 'atomic, batched fsync': atomic('batch')}
+    cases = [('small', small_files, small), ('large', large_files, large)]
+    results = []
+    previous = binware_write.sync_mode()
+    try:
+        for case, count, data in cases:
+            for index, (name, method) in enumerate(methods.items()):
+                base = pathlib.Path(tempfile.mkdtemp(prefix=f"writes-{case}-{index}-", dir=work_dir))
+                binware_write.configure(getattr(method, 'sync', previous))
+                binware_write.forget_folders()
+                paths = [base / f"folder-{number % 10}" / f"file-{number}.bin" for number in range(count)]
+
+                def write_all() -> None:
+                    with binware_write.sync_batch():
+                        for path in paths:
+                            method(path, data)
+
+                seconds, _ = time_call(write_all)
+                results.append({'case': case, 'method': name, 'files': count, 'bytes': count * len(data),
+                                'seconds': seconds})
+    finally:
+        binware_write.configure(previous)
+
+    document = {'records': [{'id': number, 'name': f"record-{number}", 'score': rng.random(),
+                             'tags': ['a', 'b']} for number in range(json_records)]}
+    for name, compact in (('json indent=4', False), ('json compact', True)):
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            seconds, _ = time_call(binware_analytics.write_json_file, str(work_dir), f"{name}.json", document,
+                                   compact=compact)
+        size = (work_dir / f"{name}.json").stat().st_size
+        results.append({'case': 'json', 'method': name, 'files': 1, 'bytes': size, 'seconds': seconds})
+
+    for result in results:
+        result['files_per_second'] = result['files'] / result['seconds'] if result['seconds'] else 0.0
+        result['MB_per_second'] = result['bytes'] / 1e6 / result['seconds'] if result['seconds'] else 0.0
+        print(f"{result['case']:<6} {result['method']:<24} {result['files']:>6} files {result['bytes'] / 1e6:9.2f} MB "
+              f"{result['seconds']:8.3f}s {result['files_per_second']:>10,.0f} files/s "
+              f"{result['MB_per_second']:>9.1f} MB/s")
+    return results
+
+#####################################
+# Startup Benchmarks
+#####################################
+
+def parse_importtime(output: str) -> list:
+    """
+    Parse the report printed by `python -X importtime`.
+
+    Returns:
+    - list: (module, self_us, cumulative_us) tuples in report order.
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+def measure_import(module: str, repeat: int = 5) -> dict:
+    """
+    Import a module in fresh interpreters under -X importtime and keep the fastest run.
+
+    Parameters:
+    - module (str): Module to import, e.g. 'binware_analytics'.
+    - repeat (int): Interpreters to start.
+
+    Returns:
+    - dict: import_ms, the heavy packages it imported eagerly and the run's import entries.
+    """
+    best = None
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                                   capture_output=True, text=True, check=True,
+                                   cwd=pathlib.Path(__file__).resolve().parent)
+        entries = parse_importtime(completed.stderr)
+        # Drop what the interpreter imports before running any code (site and its imports)
+        startup = max((index + 1 for index, (name, _, _) in enumerate(entries) if name == 'site'), default=0)
+        entries = entries[startup:]
+        total = next(cumulative for name, _, cumulative in reversed(entries) if name == module)
+        if best is None or total < best['import_ms'] * 1000:
+            best = {'module': module, 'import_ms': total / 1000, 'entries': entries}
+    best['eager_packages'] = eager_packages(best['entries'])
+    return best
+
+def eager_packages(entries: list, packages: list = LAZY_PACKAGES) -> list:
+    """
+    Return the packages of which any module appears in a parsed importtime report.
+
+    A package counts when the package itself or any of its submodules was
+    imported; the report does not always list the top-level package.
+    """
+    imported = {name for name, _, _ in entries}
+    return [package for package in packages
+            if any(name == package or name.startswith(package + '.') for name in imported)]
+
+def time_cli_help(repeat: int = 5) -> tuple:
+    """
+    Time `python binware_analytics.py --help` against a bare interpreter start.
+
+    Returns:
+    - tuple: (cli_seconds, bare_interpreter_seconds), fastest of `repeat` runs each.
+    """
+    folder = pathlib.Path(__file__).resolve().parent
+    commands = ([sys.executable, str(folder / 'binware_analytics.py'), '--help'], [sys.executable, '-c', 'pass'])
+    timings = []
+    for command in commands:
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, capture_output=True, check=True, cwd=folder)
+            runs.append(time.perf_counter() - start)
+        timings.append(min(runs))
+    return tuple(timings)
+
+def benchmark_startup(modules: list = STARTUP_MODULES, repeat: int = 5, top: int = 8,
+                      budget_ms: float = None) -> tuple:
+    """
+    Measure import time of the entry-point modules and check the lazy imports.
+
+    A module counts as a regression if it imports any of LAZY_PACKAGES at
+    startup or, with a budget, takes longer than budget_ms to import.
+
+    Parameters:
+    - modules (list): Modules to import.
+    - repeat (int): Fresh interpreters per module; the fastest is kept.
+    - top (int): Slowest imports (by self time) to list per module.
+    - budget_ms (float): Optional import-time budget per module.
+
+    Returns:
+    - tuple: ([result dict per module], [regression messages]).
+    """
+    results = []
+    regressions = []
+    for module in modules:
+        result = measure_import(module, repeat)
+        results.append(result)
+        print(f"{module:<20} import {result['import_ms']:8.1f} ms")
+        slowest = sorted(result['entries'], key=lambda entry: entry[1], reverse=True)[:top]
+        for name, self_us, cumulative_us in slowest:
+            print(f"    {name:<40} self {self_us / 1000:6.1f} ms  cumulative {cumulative_us / 1000:6.1f} ms")
+        if result['eager_packages']:
+            regressions.append(f"{module}: imports {', '.join(result['eager_packages'])} at startup")
+        if budget_ms is not None and result['import_ms'] > budget_ms:
+            regressions.append(f"{module}: import took {result['import_ms']:.1f} ms (budget {budget_ms:g} ms)")
+    cli_seconds, bare_seconds = time_cli_help(repeat)
+    print(f"binware_analytics.py --help {cli_seconds * 1000:8.1f} ms "
+          f"(bare interpreter {bare_seconds * 1000:.1f} ms)")
+    return results, regressions
+
+#####################################
+# Process Function Suite
+#####################################
+
+def suite_cases(work_dir: pathlib.Path, txt_megabytes: float, csv_rows: int,
+                json_records: int, xls_rows: int) -> list:
+    """
+    Generate one synthetic input per process_* function.
+
+    Parameters:
+    - work_dir (pathlib.Path): Folder for the generated files.
+    - txt_megabytes (float): Size of the text input.
+    - csv_rows (int): Data rows in the CSV input.
+    - json_records (int): Entries in the JSON 'people' array.
+    - xls_rows (int): Data rows in the .xls input (capped at 65535).
+
+    Returns:
+    - list: (name, process function, input filename, rows) tuples; rows are words for text.
+    """
+    work_dir = pathlib.Path(work_dir)
+    text_path = generate_text(work_dir / "suite.txt", txt_megabytes)
+    with text_path.open('r', encoding='utf-8') as file:
+        words = sum(len(line.split()) for line in file)
+    cases = [
+        ('process_txt_file', binware_analytics.process_txt_file, text_path.name, words),
+        ('process_csv_file', binware_analytics.process_csv_file,
+         generate_csv(work_dir / "suite.csv", csv_rows).name, csv_rows),
+        ('process_json_file', binware_analytics.process_json_file,
+         generate_json(work_dir / "suite.json", json_records).name, json_records),
+    ]
+    try:
+        cases.append(('process_excel_file', binware_analytics.process_excel_file,
+                      generate_xls(work_dir / "suite.xls", xls_rows).name, min(xls_rows, XLS_MAX_ROWS - 1)))
+    except ImportError:
+        print("xlwt is not installed; skipping process_excel_file")
+    return cases
+
+def benchmark_suite(work_dir: pathlib.Path, txt_megabytes: float = 32, csv_rows: int = 500_000,
+                    json_records: int = 200_000, xls_rows: int = XLS_MAX_ROWS - 1,
+                    repeat: int = 3) -> list:
+    """
+    Time every process_* function on synthetic inputs with its default options.
+
+    Each function runs `repeat` times and the fastest run is kept, then
+    once more under tracemalloc for its peak memory. The functions' own
+    progress messages are silenced.
+
+    Parameters:
+    - work_dir (pathlib.Path): Folder for the generated inputs and results files.
+    - txt_megabytes (float): Size of the text input.
+    - csv_rows (int): Data rows in the CSV input.
+    - json_records (int): Entries in the JSON 'people' array.
+    - xls_rows (int): Data rows in the .xls input.
+    - repeat (int): Timed runs per function.
+
+    Returns:
+    - list: One dict per function with bytes, rows, seconds, mb_per_second, rows_per_second and peak_bytes.
+    """
+    results = []
+    for name, process, input_filename, rows in suite_cases(work_dir, txt_megabytes, csv_rows,
+                                                           json_records, xls_rows):
+        input_path = pathlib.Path(work_dir) / input_filename
+        size = input_path.stat().st_size
+        arguments = (str(work_dir), input_filename, f"results_{name}.txt")
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            seconds = min(time_call(process, *arguments)[0] for _ in range(max(repeat, 1)))
+            peak_bytes = peak_memory_call(process, *arguments)
+        results.append({'name': name, 'bytes': size, 'rows': rows, 'seconds': seconds,
+                        'mb_per_second': size / 1e6 / seconds if seconds else 0.0,
+                        'rows_per_second': rows / seconds if seconds else 0.0,
+                        'peak_bytes': peak_bytes})
+        print(f"{name:<19} {size / 1e6:8.1f} MB {rows:>10} rows  {seconds:8.3f}s  "
+              f"{size / 1e6 / seconds:8.1f} MB/s  {rows / seconds:>12,.0f} rows/s  "
+              f"peak {peak_bytes / 1e6:8.1f} MB")
+        input_path.unlink()
+    return results
+
+def git_revision() -> str:
+    """Return the current commit hash, or '' outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=pathlib.Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+def save_results(results: list, file_path: pathlib.Path) -> None:
+    """
+    Save suite results as JSON, tagged with the commit and Python version.
+
+    Parameters:
+    - results (list): Entries from benchmark_suite.
+    - file_path (pathlib.Path): Where to write them.
+    """
+    document = {'revision': git_revision(), 'python': platform.python_version(),
+                'created_at': time.time(), 'results': results}
+    with pathlib.Path(file_path).open('w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+    print(f"Benchmark results saved to {file_path}")
+
+def compare_results(results: list, baseline_path: pathlib.Path,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> list:
+    """
+    Compare suite results with a saved baseline.
+
+    A function regresses when its throughput drops, or its peak memory
+    grows, by more than the threshold fraction. A function in the
+    baseline that this run did not measure (e.g. process_excel_file
+    without xlwt) also counts, so a skipped case cannot pass silently.
+    Functions new since the baseline are ignored.
+
+    Parameters:
+    - results (list): Entries from benchmark_suite.
+    - baseline_path (pathlib.Path): Results saved by an earlier run.
+    - threshold (float): Allowed fractional change, e.g. 0.2 for 20%.
+
+    Returns:
+    - list: One message per regression; empty if there are none.
+    """
+    with pathlib.Path(baseline_path).open('r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    previous = {entry['name']: entry for entry in baseline.get('results', [])}
+    regressions = []
+    print(f"Compared with {baseline_path} (revision {baseline.get('revision') or 'unknown'}):")
+    measured = {entry['name'] for entry in results}
+    for name in previous:
+        if name not in measured:
+            regressions.append(f"{name}: in the baseline but not measured in this run")
+            print(f"  {name:<19} not measured  MISSING")
+    for entry in results:
+        before = previous.get(entry['name'])
+        if before is None:
+            continue
+        speed = entry['mb_per_second'] / before['mb_per_second'] if before['mb_per_second'] else 1.0
+        memory = entry['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else 1.0
+        status = 'OK'
+        if speed < 1 - threshold:
+            status = 'REGRESSION'
+            regressions.append(f"{entry['name']}: throughput {speed:.2f}x of baseline")
+        if memory > 1 + threshold:
+            status = 'REGRESSION'
+            regressions.append(f"{entry['name']}: peak memory {memory:.2f}x of baseline")
+        print(f"  {entry['name']:<19} throughput {speed:5.2f}x  peak memory {memory:5.2f}x  {status}")
+    return regressions
+
+#####################################
+# Main Function
+#####################################
+
+def main() -> None:
+    """Parse command-line arguments and run the requested benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark binware_analytics processing paths.")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    csv_parser = subparsers.add_parser('csv', help="DictReader vs streaming vs NumPy columnar CSV")
+    csv_parser.add_argument('--rows', type=int, nargs='+', default=[10**5, 10**6, 10**7])
+    csv_parser.add_argument('--work-dir', help="Folder for generated files (default: a temp folder)")
+    words_parser = subparsers.add_parser('words', help="Parallel word counting across 1-N processes")
+    words_parser.add_argument('--megabytes', type=float, default=256)
+    words_parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    words_parser.add_argument('--work-dir', help="Folder for generated files (default: a temp folder)")
+    excel_parser = subparsers.add_parser('excel', help="Cell-by-cell vs on-demand/read-only Excel reads")
+    excel_parser.add_argument('--rows', type=int, default=100_000)
+    excel_parser.add_argument('--work-dir', help="Folder for generated files (default: a temp folder)")
+    parsed_parser = subparsers.add_parser('parsed', help="Re-parsing vs building vs reloading the parsed cache")
+    parsed_parser.add_argument('--csv-rows', type=int, default=1_000_000)
+    parsed_parser.add_argument('--xls-rows', type=int, default=XLS_MAX_ROWS - 1)
+    parsed_parser.add_argument('--repeat', type=int, default=3, help="Timed runs per method; the fastest is kept")
+    parsed_parser.add_argument('--work-dir', help="Folder for generated files (default: a temp folder)")
+    folders_parser = subparsers.add_parser('folders', help="Per-folder mkdir vs bulk partition provisioning")
+    folders_parser.add_argument('--partitions', type=int, default=100_000)
+    folders_parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    folders_parser.add_argument('--work-dir', help="Where to create the folders (default: a temp folder on /dev/shm)")
+    schedule_parser = subparsers.add_parser('schedule', help="Run-then-sleep loop vs the drift-free scheduler")
+    schedule_parser.add_argument('--ticks', type=int, default=100)
+    schedule_parser.add_argument('--interval', type=float, default=0.1)
+    schedule_parser.add_argument('--work-ms', type=float, default=20.0, help="Time each run takes")
+    writes_parser = subparsers.add_parser('writes', help="In-place vs atomic writes with per-file or batched fsync")
+    writes_parser.add_argument('--small-files', type=int, default=2000)
+    writes_parser.add_argument('--small-bytes', type=int, default=4096)
+    writes_parser.add_argument('--large-files', type=int, default=4)
+    writes_parser.add_argument('--large-megabytes', type=float, default=64)
+    writes_parser.add_argument('--work-dir', help="Where to write (default: a temp folder; use a real disk)")
+    running_parser = subparsers.add_parser('running', help="utils_binware running statistics vs the statistics module")
+    running_parser.add_argument('--values', type=int, default=10_000_000)
+    running_parser.add_argument('--shards', type=int, default=8)
+    running_parser.add_argument('--window', type=int, default=1000, help="Window (and EWMA half-life) in readings")
+    startup_parser = subparsers.add_parser('startup', help="Import time of the entry points (-X importtime)")
+    startup_parser.add_argument('--modules', nargs='+', default=STARTUP_MODULES)
+    startup_parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per module; the fastest is kept")
+    startup_parser.add_argument('--top', type=int, default=8, help="Slowest imports to list per module")
+    startup_parser.add_argument('--budget-ms', type=float, help="Fail if a module takes longer than this to import")
+    suite_parser = subparsers.add_parser('suite', help="Every process_* function on synthetic inputs")
+    suite_parser.add_argument('--txt-megabytes', type=float, default=32)
+    suite_parser.add_argument('--csv-rows', type=int, default=500_000)
+    suite_parser.add_argument('--json-records', type=int, default=200_000)
+    suite_parser.add_argument('--xls-rows', type=int, default=XLS_MAX_ROWS - 1)
+    suite_parser.add_argument('--repeat', type=int, default=3, help="Timed runs per function; the fastest is kept")
+    suite_parser.add_argument('--save', help="Write the results to this JSON file")
+    suite_parser.add_argument('--baseline', help="Compare with results saved by an earlier run")
+    suite_parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                              help="Fractional slowdown or memory growth counted as a regression")
+    suite_parser.add_argument('--work-dir', help="Folder for generated files (default: a temp folder)")
+    args = parser.parse_args()
+
+    if args.benchmark == 'folders':
+        with tempfile.TemporaryDirectory(dir=args.work_dir or default_tmpfs_dir()) as temp_dir:
+            benchmark_folders(args.partitions, pathlib.Path(temp_dir), args.workers)
+        return
+    if args.benchmark == 'schedule':
+        benchmark_schedule(args.ticks, args.interval, args.work_ms)
+        return
+    if args.benchmark == 'running':
+        benchmark_running(args.values, args.shards, args.window)
+        return
+    if args.benchmark == 'startup':
+        _, regressions = benchmark_startup(args.modules, args.repeat, args.top, args.budget_ms)
+        if regressions:
+            print("Regressions found:")
+            for regression in regressions:
+                print(f"- {regression}")
+            sys.exit(1)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = pathlib.Path(args.work_dir or temp_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        if args.benchmark == 'csv':
+            benchmark_csv(args.rows, work_dir)
+        elif args.benchmark == 'words':
+            benchmark_words(args.megabytes, args.max_workers, work_dir)
+        elif args.benchmark == 'excel':
+            benchmark_excel(args.rows, work_dir)
+        elif args.benchmark == 'writes':
+            benchmark_writes(args.small_files, args.small_bytes, args.large_files, args.large_megabytes, work_dir)
+        elif args.benchmark == 'parsed':
+            benchmark_parsed(args.csv_rows, args.xls_rows, work_dir, args.repeat)
+        elif args.benchmark == 'suite':
+            results = benchmark_suite(work_dir, args.txt_megabytes, args.csv_rows, args.json_records,
+                                      args.xls_rows, args.repeat)
+            regressions = compare_results(results, args.baseline, args.threshold) if args.baseline else []
+            if args.save:
+                save_results(results, args.save)
+            if regressions:
+                print("Regressions found:")
+                for regression in regressions:
+                    print(f"- {regression}")
+                sys.exit(1)
+
+#####################################
+# Conditional Execution
+#####################################
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Module: Python With Bin - Conditional-GET HTTP Cache
+
+Remembers the ETag, Last-Modified header and content hash of every URL we
+have downloaded, in a small JSON index next to the data-* folders. The
+next fetch sends If-None-Match / If-Modified-Since so an unchanged
+upstream answers 304 and we can skip both the write and the processing.
+
+Entries expire after a TTL, and the least recently used entries are
+dropped once the index tracks more than a size budget of content.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import pathlib
+import threading
+import time
+from typing import Optional
+
+# Local module imports
+import binware_write
+
+#####################################
+# Global Variables
+#####################################
+
+DEFAULT_INDEX_FILENAME: str = 'http_cache_index.json'
+DEFAULT_TTL_SECONDS: float = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES: int = 10 * 1024 * 1024 * 1024
+
+#####################################
+# Hash Functions
+#####################################
+
+def sha256_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+#####################################
+# Cache Index
+#####################################
+
+class HttpCache:
+    """
+    Thread-safe URL -> validator index persisted as JSON.
+
+    Each entry holds etag, last_modified, sha256, size, path,
+    fetched_at (last full download or 304) and last_used.
+    """
+
+    def __init__(self, index_path: str = DEFAULT_INDEX_FILENAME,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.index_path = pathlib.Path(index_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.load()
+
+    def load(self) -> None:
+        """Read the index from disk; a missing or corrupt index starts empty."""
+        try:
+            with self.index_path.open('r', encoding='utf-8') as file:
+                entries = json.load(file)
+        except (IOError, json.JSONDecodeError):
+            entries = {}
+        with self._lock:
+            self._entries = entries if isinstance(entries, dict) else {}
+
+    def save(self) -> None:
+        """Write the index to disk atomically (binware_write) so a crash never leaves it half-written."""
+        with self._lock:
+            snapshot = json.dumps(self._entries, indent=2, sort_keys=True)
+        binware_write.write_atomic(self.index_path, snapshot)
+
+    def get(self, url: str) -> Optional[dict]:
+        """Return a copy of the entry for a URL, or None."""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def conditional_headers(self, url: str, file_path: pathlib.Path) -> dict:
+        """
+        Build If-None-Match / If-Modified-Since headers for a URL.
+
+        No headers are sent when the entry has expired or the local copy
+        is gone (or lives at a different path), because a 304 would then
+        leave us with nothing on disk.
+        """
+        entry = self.get(url)
+        if not entry or entry.get('path') != str(file_path) or not pathlib.Path(file_path).exists():
+            return {}
+        if time.time() - entry.get('fetched_at', 0) > self.ttl_seconds:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record(self, url: str, headers, file_path: pathlib.Path, sha256: str, size: int) -> bool:
+        """
+        Store validators after a full download.
+
+        Returns:
+        - bool: True if the content or its destination differs from what we had before.
+        """
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(url)
+            self._entries[url] = {
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'sha256': sha256,
+                'size': size,
+                'path': str(file_path),
+                'fetched_at': now,
+                'last_used': now,
+            }
+        return previous is None or previous.get('sha256') != sha256 or previous.get('path') != str(file_path)
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as revalidated after a 304."""
+        now = time.time()
+        with self._lock:
+            if url in self._entries:
+                self._entries[url]['fetched_at'] = now
+                self._entries[url]['last_used'] = now
+
+    def evict(self) -> int:
+        """
+        Drop expired entries, then least recently used ones until under max_bytes.
+
+        Only index entries are removed; the downloaded files stay on disk
+        and are simply fetched in full next time.
+
+        Returns:
+        - int: Number of entries removed.
+        """
+        now = time.time()
+        with self._lock:
+            before = len(self._entries)
+            self._entries = {url: entry for url, entry in self._entries.items()
+                             if now - entry.get('fetched_at', 0) <= self.ttl_seconds}
+            total = sum(entry.get('size', 0) for entry in self._entries.values())
+            for url in sorted(self._entries, key=lambda u: self._entries[u].get('last_used', 0)):
+                if total <= self.max_bytes:
+                    break
+                total -= self._entries.pop(url).get('size', 0)
+            return before - len(self._entries)
@@ -0,0 +1,338 @@
+"""
+Module: Python With Bin - Columnar CSV Analytics
+
+Opt-in NumPy path for wide numeric CSVs. Only the requested columns are
+parsed, a chunk of rows at a time, straight into typed float64 arrays. Summary statistics and group-by aggregates
+are then computed with vectorized operations and merged chunk by chunk,
+so memory is bounded by the chunk size rather than the file size.
+"""
+
+# Standard library imports
+import csv
+import fractions
+import itertools
+import math
+import pathlib
+from typing import Iterable, Optional
+
+# External library imports (requires virtual environment), loaded on first use
+import binware_lazy
+try:
+    np = binware_lazy.lazy_import('numpy')
+except ImportError:  # NumPy is only needed for the columnar mode
+    np = None
+
+#####################################
+# Global Variables
+#####################################
+
+DEFAULT_CHUNK_ROWS: int = 100_000
+
+# exact_sum adds integer halves of at most 27 bits in float64 bins; this
+# many values per block keeps every bin total below 2**53, so it stays exact
+EXACT_SUM_BLOCK: int = 1 << 24
+
+# Bit pattern of the NaN that marks a blank cell. It has a payload, so it
+# can be told apart from a 'nan' cell, which parses to the plain NaN.
+BLANK_BITS: int = 0x7FF8_0000_0000_0001
+
+#####################################
+# Column Summary
+#####################################
+
+class ColumnSummary:
+    """
+    Mergeable count, mean, min, max and variance built from whole arrays.
+
+    Exposes the same attributes as binware_aggregate.ColumnStats so the
+    two can be written out by the same code, and gives the same results:
+    blank cells are skipped, the mean is exact (exact_sum), and 'nan' or
+    'inf' cells are counted and make the mean nan or infinite, as in
+    utils_binware.RunningStats.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._sum = fractions.Fraction(0)
+        # Sum of the infinite and NaN values, which the exact sum cannot hold
+        self._nonfinite = 0.0
+        self.quantiles = {}
+
+    def update_array(self, values) -> None:
+        """Fold a float64 array into the summary, skipping blank cells."""
+        values = values[~blank_mask(values)]
+        n = values.size
+        if not n:
+            return
+        numbers = values[~np.isnan(values)]
+        if numbers.size:
+            self.minimum = min(self.minimum, float(numbers.min()))
+            self.maximum = max(self.maximum, float(numbers.max()))
+        finite = np.isfinite(values)
+        # 'nan' and 'inf' cells make the mean and variance nan or infinite
+        # as in the streaming path, without NumPy's invalid-value warnings
+        with np.errstate(invalid='ignore', over='ignore'):
+            if finite.all():
+                self._sum += exact_sum(values)
+            else:
+                self._sum += exact_sum(values[finite])
+                self._nonfinite += float(values[~finite].sum())
+            chunk_mean = float(values.mean())
+            chunk_m2 = float(np.square(values - chunk_mean).sum())
+        # Chan et al. pairwise combination of two (count, mean, M2) triples
+        total = self.count + n
+        delta = chunk_mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def merge(self, other: 'ColumnSummary') -> None:
+        """Fold another summary into this one (Chan et al. pairwise combination)."""
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._sum += other._sum
+        self._nonfinite += other._nonfinite
+
+    @property
+    def mean(self) -> float:
+        """The exactly rounded mean; nan, inf or -inf if such cells were seen."""
+        if not self.count:
+            return 0.0
+        if self._nonfinite:
+            return self._nonfinite
+        return float(self._sum / self.count)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+#####################################
+# Chunked Column Reading
+#####################################
+
+def require_numpy() -> None:
+    """Raise a helpful ImportError when the columnar mode is used without NumPy."""
+    if np is None:
+        raise ImportError("The columnar CSV mode requires numpy (pip install numpy)")
+
+def exact_sum(values) -> fractions.Fraction:
+    """
+    Sum a float64 array exactly, as statistics.mean does, but vectorized.
+
+    Each value is split into a 53-bit integer mantissa and a power-of-two
+    exponent. The mantissas are split again into two halves and binned by
+    exponent, so every partial sum stays an exact integer.
+
+    Parameters:
+    - values (ndarray): Finite float64 values (drop NaNs and infinities first).
+
+    Returns:
+    - Fraction: The exact sum.
+    """
+    total = fractions.Fraction(0)
+    for start in range(0, values.size, EXACT_SUM_BLOCK):
+        block = np.asarray(values[start:start + EXACT_SUM_BLOCK], dtype=np.float64)
+        if not np.isfinite(block).all():
+            raise ValueError("Cannot take the exact sum of infinite values")
+        mantissas, exponents = np.frexp(block)
+        integers = (mantissas * 2.0 ** 53).astype(np.int64)
+        bins = exponents.astype(np.int64) + 1073  # value = integer * 2**(exponent - 53); exponent >= -1073
+        high = np.bincount(bins, weights=integers >> 26)
+        low = np.bincount(bins, weights=integers & ((1 << 26) - 1))
+        for index in np.flatnonzero(high.astype(bool) | low.astype(bool)):
+            integer = (int(high[index]) << 26) + int(low[index])
+            total += fractions.Fraction(integer) * fractions.Fraction(2) ** (int(index) - 1073 - 53)
+    return total
+
+def to_float_array(values: list):
+    """Convert a list of CSV strings to float64 in one call; blank cells become the blank NaN (see blank_mask)."""
+    array = np.array(values, dtype=str)
+    blank = array == ''
+    floats = np.where(blank, '0', array).astype(np.float64)
+    floats.view(np.uint64)[blank] = BLANK_BITS
+    return floats
+
+def blank_mask(values):
+    """
+    Return a boolean array marking the blank cells of a float64 array from to_float_array.
+
+    Blank cells are NaN, so code that skips NaN skips them too, but only
+    they carry the BLANK_BITS pattern; a 'nan' cell is a plain NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return values.view(np.uint64) == BLANK_BITS
+
+def iter_column_chunks(file_path: pathlib.Path, columns: Iterable[str],
+                       group_by: Optional[str] = None,
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Yield the requested columns of a CSV file a chunk of rows at a time.
+
+    Each chunk of lines goes through NumPy's C parser (np.loadtxt with
+    usecols). Chunks it rejects, such as ones with blank cells, are
+    parsed again with the csv module. Quoted fields must not contain
+    line breaks.
+
+    Parameters:
+    - file_path (pathlib.Path): The CSV file to read.
+    - columns (iterable): Numeric columns to load as float64 arrays.
+    - group_by (str): Optional text column to load alongside, as a str array.
+    - chunk_rows (int): Rows per chunk.
+
+    Yields:
+    - dict: Column name -> NumPy array for one chunk. Columns missing
+      from the header are left out.
+    """
+    require_numpy()
+    with pathlib.Path(file_path).open('r', encoding='utf-8', newline='') as csvfile:
+        header = next(csv.reader([csvfile.readline()]), [])
+        wanted = [column for column in columns if column in header]
+        if group_by is not None and group_by not in header:
+            raise KeyError(group_by)
+        indexes = [header.index(column) for column in wanted]
+        group_index = header.index(group_by) if group_by is not None else None
+        while True:
+            lines = list(itertools.islice(csvfile, chunk_rows))
+            if not lines:
+                break
+            try:
+                chunk = _parse_chunk_fast(lines, wanted, indexes, group_by, group_index)
+            except ValueError:
+                chunk = _parse_chunk_csv(lines, wanted, indexes, group_by, group_index)
+            yield chunk
+
+def _parse_chunk_fast(lines: list, columns: list, indexes: list,
+                      group_by: Optional[str], group_index: Optional[int]) -> dict:
+    chunk = {}
+    if indexes:
+        values = np.loadtxt(lines, delimiter=',', quotechar='"', usecols=indexes,
+                            dtype=np.float64, ndmin=2)
+        chunk = {column: values[:, i] for i, column in enumerate(columns)}
+    if group_by is not None:
+        chunk[group_by] = np.loadtxt(lines, delimiter=',', quotechar='"', usecols=[group_index],
+                                     dtype=str, ndmin=1)
+    return chunk
+
+def _parse_chunk_csv(lines: list, columns: list, indexes: list,
+                     group_by: Optional[str], group_index: Optional[int]) -> dict:
+    wanted = indexes + ([group_index] if group_by is not None else [])
+    width = max(wanted) + 1 if wanted else 0
+    buffers = [[] for _ in wanted]
+    for row in csv.reader(lines):
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        for buffer, index in zip(buffers, wanted):
+            buffer.append(row[index])
+    chunk = {column: to_float_array(buffer) for column, buffer in zip(columns, buffers)}
+    if group_by is not None:
+        chunk[group_by] = np.array(buffers[-1], dtype=str)
+    return chunk
+
+#####################################
+# Columnar Aggregation
+#####################################
+
+def summarize_csv(file_path: pathlib.Path, columns: Iterable[str],
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """
+    Compute vectorized summary statistics for numeric CSV columns.
+
+    Parameters:
+    - file_path (pathlib.Path): The CSV file to read.
+    - columns (iterable): Numeric columns to summarize.
+    - chunk_rows (int): Rows per chunk.
+
+    Returns:
+    - dict: Column name -> ColumnSummary (count 0 if the column is missing).
+    """
+    columns = list(columns)
+    return summarize_chunks(iter_column_chunks(file_path, columns, chunk_rows=chunk_rows), columns)
+
+def summarize_chunks(chunks: Iterable[dict], columns: list) -> dict:
+    """
+    Fold column chunks (name -> float64 array) into one ColumnSummary per column.
+
+    Parameters:
+    - chunks (iterable): Dicts of arrays, e.g. from iter_column_chunks or a parsed cache.
+    - columns (list): Columns to summarize.
+
+    Returns:
+    - dict: Column name -> ColumnSummary (count 0 if the column never appears).
+    """
+    summaries = {column: ColumnSummary() for column in columns}
+    for chunk in chunks:
+        for column in columns:
+            if column in chunk:
+                summaries[column].update_array(chunk[column])
+    return summaries
+
+def group_means_csv(file_path: pathlib.Path, columns: Iterable[str], group_by: str,
+                    chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """
+    Compute the mean of numeric columns per value of a grouping column.
+
+    Each chunk is reduced with np.unique and np.bincount, and the
+    per-group sums and counts are merged across chunks.
+
+    Parameters:
+    - file_path (pathlib.Path): The CSV file to read.
+    - columns (iterable): Numeric columns to average.
+    - group_by (str): The column to group on, e.g. 'Regional indicator'.
+    - chunk_rows (int): Rows per chunk.
+
+    Returns:
+    - dict: Group value -> {column: (count, mean)}, sorted by group.
+    """
+    columns = list(columns)
+    return group_means_chunks(iter_column_chunks(file_path, columns, group_by, chunk_rows), columns, group_by)
+
+def group_means_chunks(chunks: Iterable[dict], columns: list, group_by: str) -> dict:
+    """
+    Per-group means from column chunks that include the grouping column.
+
+    Blank cells are skipped; a 'nan' or 'inf' cell counts and makes its
+    group's mean nan or infinite, as in summarize_chunks.
+
+    Parameters:
+    - chunks (iterable): Dicts of arrays, e.g. from iter_column_chunks or a parsed cache.
+    - columns (list): Numeric columns to average.
+    - group_by (str): The grouping column, present in every chunk.
+
+    Returns:
+    - dict: Group value -> {column: (count, mean)}, sorted by group.
+    """
+    sums = {}
+    counts = {}
+    for chunk in chunks:
+        groups, inverse = np.unique(chunk[group_by], return_inverse=True)
+        for column in columns:
+            if column not in chunk:
+                continue
+            values = chunk[column]
+            present = ~blank_mask(values)
+            group_sums = np.bincount(inverse[present], weights=values[present], minlength=groups.size)
+            group_counts = np.bincount(inverse[present], minlength=groups.size)
+            for group, group_sum, group_count in zip(groups.tolist(), group_sums, group_counts):
+                key = (group, column)
+                sums[key] = sums.get(key, 0.0) + float(group_sum)
+                counts[key] = counts.get(key, 0) + int(group_count)
+    results = {}
+    for (group, column), count in sorted(counts.items()):
+        if count:
+            results.setdefault(group, {})[column] = (count, sums[(group, column)] / count)
+    return results
@@ -0,0 +1,165 @@
+"""
+Module: Python With Bin - Excel Ingestion
+
+Sums one column of one sheet without parsing the rest of the workbook.
+Legacy .xls files are opened with xlrd in on_demand mode, so only the
+requested sheet is loaded, and the column is pulled in bulk with
+col_values. Modern .xlsx files are streamed row by row through openpyxl
+in read_only mode, so memory stays flat regardless of sheet size.
+"""
+
+# Standard library imports
+import pathlib
+from typing import Union
+
+# External library imports (requires virtual environment), loaded on first use
+import binware_lazy
+openpyxl = binware_lazy.lazy_import('openpyxl')  # For .xlsx files
+xlrd = binware_lazy.lazy_import('xlrd')          # For reading .xls files directly
+
+#####################################
+# Global Variables
+#####################################
+
+XLSX_SUFFIXES = ('.xlsx', '.xlsm')
+
+#####################################
+# Column Functions
+#####################################
+
+def sum_numbers(values) -> float:
+    """Add up the numeric cells in order, skipping text and blanks."""
+    total = 0
+    for value in values:
+        if isinstance(value, (int, float)):
+            total += value
+    return total
+
+def resolve_column(header: list, column: Union[int, str]) -> int:
+    """
+    Turn a column index or header name into a zero-based index.
+
+    Parameters:
+    - header (list): Values of the header row.
+    - column (int or str): Zero-based index, or the header text of the column.
+
+    Returns:
+    - int: The zero-based column index.
+    """
+    if isinstance(column, int):
+        return column
+    try:
+        return list(header).index(column)
+    except ValueError:
+        raise KeyError(f"Column '{column}' not found in header {list(header)}") from None
+
+def check_column_index(index: int, width: int) -> None:
+    """
+    Raise IndexError for a column index outside a sheet's columns.
+
+    An empty sheet (width 0) has no columns to check, and its column sums to 0.
+
+    Parameters:
+    - index (int): The zero-based column index.
+    - width (int): Number of columns in the sheet.
+    """
+    if width and not 0 <= index < width:
+        raise IndexError(f"Column {index} is out of range; the sheet has {width} columns")
+
+def sum_xls_column(file_path: pathlib.Path, sheet: Union[int, str] = 0,
+                   column: Union[int, str] = 1, header_rows: int = 1) -> float:
+    """
+    Sum a column of an .xls sheet, loading only that sheet.
+
+    Parameters:
+    - file_path (pathlib.Path): The workbook.
+    - sheet (int or str): Sheet index or name.
+    - column (int or str): Zero-based column index or header name.
+    - header_rows (int): Rows to skip at the top of the sheet.
+
+    Returns:
+    - float: The sum of the numeric cells below the header.
+
+    Raises:
+    - IndexError: If the column index is past the sheet's last column.
+    - KeyError: If the column name is not in the header row.
+    """
+    workbook = xlrd.open_workbook(str(file_path), on_demand=True)
+    try:
+        worksheet = workbook.sheet_by_name(sheet) if isinstance(sheet, str) else workbook.sheet_by_index(sheet)
+        header = worksheet.row_values(0) if worksheet.nrows and isinstance(column, str) else []
+        index = resolve_column(header, column)
+        check_column_index(index, worksheet.ncols)
+        if not worksheet.ncols:
+            return 0
+        return sum_numbers(worksheet.col_values(index, start_rowx=header_rows))
+    finally:
+        workbook.release_resources()
+
+def sum_xlsx_column(file_path: pathlib.Path, sheet: Union[int, str] = 0,
+                    column: Union[int, str] = 1, header_rows: int = 1) -> float:
+    """
+    Sum a column of an .xlsx sheet by streaming its rows in read-only mode.
+
+    Parameters:
+    - file_path (pathlib.Path): The workbook.
+    - sheet (int or str): Sheet index or name.
+    - column (int or str): Zero-based column index or header name.
+    - header_rows (int): Rows to skip at the top of the sheet.
+
+    Returns:
+    - float: The sum of the numeric cells below the header.
+
+    Raises:
+    - IndexError: If the column index is past the sheet's last column. Workbooks
+      saved without their dimensions cannot be checked and sum to 0 instead.
+    - KeyError: If the column name is not in the header row.
+    """
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if isinstance(sheet, str) else workbook.worksheets[sheet]
+        header = []
+        if isinstance(column, str):
+            header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+        index = resolve_column(header, column)
+        check_column_index(index, worksheet.max_column or 0)
+        rows = worksheet.iter_rows(min_row=header_rows + 1, min_col=index + 1, max_col=index + 1,
+                                   values_only=True)
+        return sum_numbers(row[0] for row in rows if row)
+    finally:
+        workbook.close()
+
+def iter_sheet_rows(file_path: pathlib.Path, sheet: Union[int, str] = 0):
+    """
+    Yield every row of one sheet as a list of cell values.
+
+    Parameters:
+    - file_path (pathlib.Path): The workbook (.xls or .xlsx).
+    - sheet (int or str): Sheet index or name.
+
+    Yields:
+    - list: Cell values, as xlrd or openpyxl returns them.
+    """
+    if pathlib.Path(file_path).suffix.lower() in XLSX_SUFFIXES:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if isinstance(sheet, str) else workbook.worksheets[sheet]
+            for row in worksheet.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+        return
+    workbook = xlrd.open_workbook(str(file_path), on_demand=True)
+    try:
+        worksheet = workbook.sheet_by_name(sheet) if isinstance(sheet, str) else workbook.sheet_by_index(sheet)
+        for row_index in range(worksheet.nrows):
+            yield worksheet.row_values(row_index)
+    finally:
+        workbook.release_resources()
+
+def sum_excel_column(file_path: pathlib.Path, sheet: Union[int, str] = 0,
+                     column: Union[int, str] = 1, header_rows: int = 1) -> float:
+    """Sum a column with the reader that matches the file extension."""
+    if pathlib.Path(file_path).suffix.lower() in XLSX_SUFFIXES:
+        return sum_xlsx_column(file_path, sheet, column, header_rows)
+    return sum_xls_column(file_path, sheet, column, header_rows)
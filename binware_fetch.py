@@ -0,0 +1,340 @@
+"""
+Module: Python With Bin - Concurrent Fetch Engine
+
+Fetches a manifest of (url, folder, filename, kind) jobs with a bounded
+thread pool. All jobs share one binware_http.FetchClient (a pooled
+session with timeouts and retries), and a per-host limit keeps us from
+opening too many connections to any single upstream. Every job produces
+a result with its status and timing.
+
+In streaming mode the body is written to disk chunk by chunk and
+renamed into place when complete, so memory use does not grow with the
+size of the download.
+
+Passing an HttpCache makes every request conditional so unchanged
+upstreams cost a 304 instead of a full download.
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import concurrent.futures
+import csv
+import hashlib
+import pathlib
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+# Local module imports
+import binware_lazy
+import binware_cache
+import binware_http
+import binware_write
+
+# External library imports (requires virtual environment), loaded on first use
+requests = binware_lazy.lazy_import('requests')
+
+#####################################
+# Global Variables
+#####################################
+
+# Kinds of data a job can fetch; each maps to one write_*_file function
+FETCH_KINDS = ('txt', 'csv', 'json', 'excel')
+
+DEFAULT_MAX_WORKERS: int = 8
+DEFAULT_PER_HOST_LIMIT: int = 2
+DEFAULT_CHUNK_SIZE: int = 1024 * 1024
+
+#####################################
+# Job and Result Types
+#####################################
+
+@dataclass(frozen=True)
+class FetchJob:
+    """One download: where to get it, where to put it, and what it is."""
+    url: str
+    folder_name: str
+    filename: str
+    kind: str
+
+@dataclass
+class FetchResult:
+    """Outcome and timing of a single FetchJob."""
+    job: FetchJob
+    ok: bool
+    status_code: Optional[int] = None
+    bytes_received: int = 0
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+    changed: bool = True
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Download throughput for this job."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_received / self.elapsed_seconds
+
+#####################################
+# Manifest Functions
+#####################################
+
+def read_manifest(manifest_path: str) -> list:
+    """
+    Read fetch jobs from a CSV manifest.
+
+    The manifest needs the columns url, folder_name, filename and kind.
+
+    Parameters:
+    - manifest_path (str): Path to the CSV manifest file.
+
+    Returns:
+    - list: The FetchJob entries in file order.
+    """
+    jobs = []
+    with pathlib.Path(manifest_path).open('r', encoding='utf-8', newline='') as csvfile:
+        for row in csv.DictReader(csvfile):
+            jobs.append(make_job(row['url'], row['folder_name'], row['filename'], row['kind']))
+    return jobs
+
+def make_job(url: str, folder_name: str, filename: str, kind: str) -> FetchJob:
+    """
+    Build a FetchJob, checking that its kind is one we know how to write.
+
+    Parameters:
+    - url (str): The URL to fetch.
+    - folder_name (str): The folder where the file will be saved.
+    - filename (str): The name of the file to save the data.
+    - kind (str): One of FETCH_KINDS.
+
+    Returns:
+    - FetchJob: The validated job.
+    """
+    kind = kind.strip().lower()
+    if kind not in FETCH_KINDS:
+        raise ValueError(f"Unknown fetch kind '{kind}', expected one of {FETCH_KINDS}")
+    return FetchJob(url.strip(), folder_name.strip(), filename.strip(), kind)
+
+#####################################
+# Session and Host Limits
+#####################################
+
+def create_session(pool_size: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """
+    Create a session whose connection pool is large enough for every worker.
+
+    Parameters:
+    - pool_size (int): Connections to keep open per host.
+
+    Returns:
+    - requests.Session: A session that can be shared by all worker threads.
+    """
+    return binware_http.create_pooled_session(pool_size)
+
+class HostLimiter:
+    """Hands out one bounded semaphore per host so no host sees more than `limit` requests at once."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self._semaphores[host]
+
+#####################################
+# Streaming Functions
+#####################################
+
+def stream_response_to_file(response: requests.Response, file_path: pathlib.Path,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE, digest=None) -> int:
+    """
+    Write a streamed response to a temp file and atomically rename it into place.
+
+    Uses binware_write.atomic_open: the temp file lives in the target
+    folder so the final rename never crosses filesystems, and a failed
+    download leaves the old file untouched.
+
+    Parameters:
+    - response (requests.Response): A response opened with stream=True.
+    - file_path (pathlib.Path): Where the finished file should end up.
+    - chunk_size (int): Bytes to read per chunk.
+    - digest (hashlib hash): Optional hash object updated with every chunk.
+
+    Returns:
+    - int: The number of bytes written.
+    """
+    bytes_written = 0
+    with binware_write.atomic_open(file_path, 'wb') as file:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            file.write(chunk)
+            bytes_written += len(chunk)
+            if digest is not None:
+                digest.update(chunk)
+    return bytes_written
+
+def stream_download(url: str, file_path: pathlib.Path, session=None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Download a URL straight to disk without holding the body in memory.
+
+    Parameters:
+    - url (str): The URL to download.
+    - file_path (pathlib.Path): Where the file should be saved.
+    - session (FetchClient or requests.Session): Optional client to reuse; the shared FetchClient if omitted.
+    - chunk_size (int): Bytes to read per chunk.
+
+    Returns:
+    - int: The number of bytes written.
+    """
+    getter = session.get if session is not None else binware_http.get
+    with getter(url, stream=True) as response:
+        response.raise_for_status()
+        return stream_response_to_file(response, pathlib.Path(file_path), chunk_size)
+
+#####################################
+# Fetch Functions
+#####################################
+
+def run_job(job: FetchJob, session, limiter: HostLimiter,
+            handler: Callable[[FetchJob, requests.Response], Optional[bool]],
+            stream: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE,
+            cache: Optional[binware_cache.HttpCache] = None) -> FetchResult:
+    """
+    Fetch one job and hand the response to the handler.
+
+    In streaming mode the handler is skipped and the body goes straight
+    to folder_name/filename on disk. With a cache, the request is made
+    conditional; a 304, or a 200 whose body hashes the same as last
+    time, comes back with changed=False and nothing is rewritten.
+
+    Parameters:
+    - job (FetchJob): The job to run.
+    - session (FetchClient or requests.Session): The shared client.
+    - limiter (HostLimiter): Per-host concurrency limits.
+    - handler (callable): Called with (job, response) once the download succeeds; returning
+      False marks the job as failed and leaves the cache entry as it was.
+    - stream (bool): Write the body to disk in chunks instead of buffering it.
+    - chunk_size (int): Bytes to read per chunk in streaming mode.
+    - cache (HttpCache): Optional validator cache for conditional requests.
+
+    Returns:
+    - FetchResult: The outcome and timing of the job.
+    """
+    start = time.perf_counter()
+    result = FetchResult(job=job, ok=False)
+    file_path = pathlib.Path(job.folder_name) / job.filename
+    headers = cache.conditional_headers(job.url, file_path) if cache is not None else {}
+    sha256 = None
+    try:
+        with limiter.for_url(job.url):
+            if stream:
+                with session.get(job.url, headers=headers, stream=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != 304:
+                        digest = hashlib.sha256()
+                        result.bytes_received = stream_response_to_file(response, file_path, chunk_size, digest)
+                        sha256 = digest.hexdigest()
+            else:
+                response = session.get(job.url, headers=headers)
+        result.status_code = response.status_code
+        response.raise_for_status()
+        if response.status_code == 304:
+            if cache is not None:
+                cache.touch(job.url)
+            result.changed = False
+        else:
+            if not stream:
+                result.bytes_received = len(response.content)
+                if cache is not None:
+                    sha256 = binware_cache.sha256_bytes(response.content)
+                    previous = cache.get(job.url)
+                    if headers and previous and previous.get('sha256') == sha256:
+                        result.changed = False
+                # The write_* handlers print their own errors; False means nothing usable was written
+                if result.changed and handler(job, response) is False:
+                    raise OSError(f"Could not write {file_path}")
+            if cache is not None:
+                result.changed = cache.record(job.url, response.headers, file_path,
+                                              sha256, result.bytes_received) and result.changed
+        result.ok = True
+    except (requests.RequestException, ValueError, OSError) as e:
+        result.error = str(e)
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
+
+def fetch_all(jobs: Iterable[FetchJob],
+              handler: Callable[[FetchJob, requests.Response], Optional[bool]],
+              max_workers: int = DEFAULT_MAX_WORKERS,
+              per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+              session=None,
+              stream: bool = False,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              cache: Optional[binware_cache.HttpCache] = None) -> list:
+    """
+    Fetch every job concurrently and return one result per job.
+
+    Parameters:
+    - jobs (iterable): The FetchJob entries to run.
+    - handler (callable): Called with (job, response) for each successful download.
+    - max_workers (int): Size of the thread pool.
+    - per_host_limit (int): Maximum requests in flight to a single host.
+    - session (FetchClient or requests.Session): Optional client to use; a FetchClient is created if omitted.
+    - stream (bool): Write bodies straight to disk in chunks instead of calling the handler.
+    - chunk_size (int): Bytes to read per chunk in streaming mode.
+    - cache (HttpCache): Optional validator cache; evicted and saved once all jobs finish.
+
+    Returns:
+    - list: FetchResult entries in the same order as the jobs.
+    """
+    jobs = list(jobs)
+    own_session = session is None
+    if own_session:
+        session = binware_http.FetchClient(pool_size=max_workers)
+    limiter = HostLimiter(per_host_limit)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(run_job, job, session, limiter, handler, stream, chunk_size, cache)
+                       for job in jobs]
+            return [future.result() for future in futures]
+    finally:
+        if own_session:
+            session.close()
+        if cache is not None:
+            cache.evict()
+            cache.save()
+
+#####################################
+# Report Functions
+#####################################
+
+def format_report(results: list) -> str:
+    """
+    Build a plain-text table summarizing a list of FetchResult entries.
+
+    Parameters:
+    - results (list): The results returned by fetch_all.
+
+    Returns:
+    - str: One line per job plus a totals line.
+    """
+    lines = []
+    for result in results:
+        if not result.ok:
+            status = f"FAILED ({result.error})"
+        else:
+            status = 'OK' if result.changed else 'NOT MODIFIED'
+        lines.append(f"{result.elapsed_seconds:8.3f}s {result.bytes_received:>12} bytes "
+                     f"{result.bytes_per_second / 1e6:8.2f} MB/s "
+                     f"{result.job.kind:<5} {result.job.url} -> {status}")
+    succeeded = sum(1 for result in results if result.ok)
+    total_bytes = sum(result.bytes_received for result in results)
+    lines.append(f"{succeeded}/{len(results)} jobs succeeded, {total_bytes} bytes received")
+    return "\n".join(lines)
@@ -0,0 +1,309 @@
+"""
+Module: Python With Bin - Resilient HTTP Client
+
+One shared client for every HTTP fetch. It wraps a pooled
+`requests.Session` so connections are reused across calls, and it
+applies connect/read timeouts to every request so a stalled upstream
+fails instead of hanging the run.
+
+Connection errors, timeouts and 429/5xx answers are retried with
+exponential backoff and full jitter (honoring Retry-After). A retry
+budget caps retries to a fraction of all requests, so a dead upstream
+cannot multiply our traffic. An optional per-host rate limit spaces out
+requests, and the latency of every attempt lands in a per-host
+histogram for the end-of-run report.
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import bisect
+import random
+import threading
+import time
+import urllib.parse
+from typing import Optional
+
+# External library imports (requires virtual environment), loaded on first use
+import binware_lazy
+requests = binware_lazy.lazy_import('requests')
+
+#####################################
+# Global Variables
+#####################################
+
+DEFAULT_POOL_SIZE: int = 8
+DEFAULT_CONNECT_TIMEOUT: float = 5.0
+DEFAULT_READ_TIMEOUT: float = 30.0
+DEFAULT_MAX_RETRIES: int = 4
+DEFAULT_BACKOFF_FACTOR: float = 0.5
+DEFAULT_MAX_BACKOFF: float = 30.0
+
+# Statuses worth asking again for; anything else is returned to the caller as-is
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Upper bounds, in seconds, of the latency histogram buckets (the last bucket is open-ended)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+#####################################
+# Retry Budget and Rate Limits
+#####################################
+
+class RetryBudget:
+    """
+    Allow retries only while they stay under a fraction of all requests.
+
+    A small floor of retries is always available so a short run with a
+    single flaky request still gets its retries.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; return False if it is used up."""
+        with self._lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+class HostRateLimiter:
+    """Space out requests to each host so no host sees more than `per_second` requests a second."""
+
+    def __init__(self, per_second: Optional[float] = None) -> None:
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host: str) -> None:
+        """Block until the host's next request slot, then claim it."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+#####################################
+# Latency Histograms
+#####################################
+
+class LatencyHistogram:
+    """Bucketed counts of request latencies, cheap enough to update on every attempt."""
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.seconds = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+        self.seconds += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a latency percentile as the upper bound of its bucket.
+
+        Parameters:
+        - p (float): Percentile between 0 and 100.
+
+        Returns:
+        - float: Seconds, never more than the observed maximum.
+        """
+        if not self.total:
+            return 0.0
+        rank = p / 100 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[index], self.maximum) if index < len(self.bounds) else self.maximum
+        return self.maximum
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound}s" for bound in self.bounds] + [f">{self.bounds[-1]}s"]
+        return {
+            'requests': self.total,
+            'mean_seconds': self.seconds / self.total if self.total else 0.0,
+            'p50_seconds': self.percentile(50),
+            'p95_seconds': self.percentile(95),
+            'max_seconds': self.maximum,
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+#####################################
+# Fetch Client
+#####################################
+
+class FetchClient:
+    """
+    Thread-safe HTTP client with pooling, timeouts, retries and per-host metrics.
+
+    Its get() takes the same arguments as requests.Session.get, so it can
+    be passed anywhere the fetch engine expects a session.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF,
+                 requests_per_second: Optional[float] = None,
+                 retry_budget: Optional[RetryBudget] = None,
+                 session: Optional[requests.Session] = None) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = retry_budget or RetryBudget()
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.session = session or create_pooled_session(pool_size)
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._stats = {}
+
+    def __enter__(self) -> 'FetchClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _record(self, host: str, seconds: Optional[float] = None, **counts) -> None:
+        with self._lock:
+            if seconds is not None:
+                self._histograms.setdefault(host, LatencyHistogram()).record(seconds)
+            stats = self._stats.setdefault(host, {'requests': 0, 'attempts': 0, 'retries': 0, 'failures': 0})
+            for key, value in counts.items():
+                stats[key] += value
+
+    def backoff_seconds(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        Delay before retry number `attempt` (0-based): Retry-After if the server
+        sent a number of seconds, otherwise exponential backoff with full jitter.
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass  # An HTTP date; fall back to our own backoff
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET a URL, retrying connection errors, timeouts and retryable statuses.
+
+        Parameters:
+        - url (str): The URL to fetch.
+        - kwargs: Passed to requests.Session.get; timeout defaults to the client's.
+
+        Returns:
+        - requests.Response: The final response, which may still be an error status.
+
+        Raises:
+        - requests.RequestException: If the last attempt failed without a response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        self.budget.record_request()
+        self._record(host, requests=1)
+        attempt = 0
+        while True:
+            self.rate_limiter.wait(host)
+            start = time.perf_counter()
+            response = None
+            try:
+                response = self.session.get(url, **kwargs)
+                self._record(host, time.perf_counter() - start, attempts=1)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(host, time.perf_counter() - start, attempts=1)
+                error = e
+            if attempt >= self.max_retries or not self.budget.try_spend():
+                self._record(host, failures=1)
+                if error is not None:
+                    raise error
+                return response
+            delay = self.backoff_seconds(attempt, response)
+            if response is not None:
+                response.close()
+            self._record(host, retries=1)
+            time.sleep(delay)
+            attempt += 1
+
+    def metrics(self) -> dict:
+        """
+        Per-host request counts and latency histograms.
+
+        Returns:
+        - dict: Host -> counts plus a 'latency' histogram summary.
+        """
+        with self._lock:
+            return {host: dict(stats, latency=self._histograms[host].as_dict() if host in self._histograms else {})
+                    for host, stats in self._stats.items()}
+
+    def format_metrics(self) -> str:
+        """Build a plain-text table of per-host requests, retries and latency percentiles."""
+        lines = []
+        for host, stats in sorted(self.metrics().items()):
+            latency = stats['latency']
+            lines.append(f"{host:<40} {stats['requests']:>4} requests {stats['retries']:>3} retries "
+                         f"{stats['failures']:>3} failed  p50 {latency.get('p50_seconds', 0):6.2f}s "
+                         f"p95 {latency.get('p95_seconds', 0):6.2f}s max {latency.get('max_seconds', 0):6.2f}s")
+        return "\n".join(lines)
+
+#####################################
+# Session Functions
+#####################################
+
+def create_pooled_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Create a session whose connection pool is large enough for every worker.
+
+    Parameters:
+    - pool_size (int): Connections to keep open per host.
+
+    Returns:
+    - requests.Session: A session that can be shared by all worker threads.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_client() -> FetchClient:
+    """Return the process-wide client, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = FetchClient()
+        return _default_client
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET a URL through the process-wide client."""
+    return get_client().get(url, **kwargs)
@@ -0,0 +1,279 @@
+"""
+Module: Python With Bin - Instrumentation
+
+Records one timing entry per call of every instrumented fetch, write and
+process function: wall time, bytes in and out, rows or words processed,
+and whether it succeeded. At the end of a run the entries are written as
+a JSON run report, together with the process's peak memory, so a slow
+night can be traced to network, disk or parsing.
+
+A call fails when it raises, when it returns False (a write_* function
+that could not write), when a process_* function returns None (it caught
+and printed its own error), or when it calls note(error=...).
+
+Set BINWARE_PROFILE (or call configure) to capture more detail:
+- 'tracemalloc': per-call peak of traced Python allocations (process-wide,
+  so overlapping calls from other threads are included).
+- 'cprofile': a cProfile of the instrumented calls, saved as a .prof file.
+- 'all': both.
+"""
+
+# Standard library imports
+import cProfile
+import functools
+import inspect
+import json
+import marshal
+import os
+import pathlib
+import platform
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+
+# Local module imports
+import binware_write
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+#####################################
+# Global Variables
+#####################################
+
+PROFILE_ENV_VAR: str = 'BINWARE_PROFILE'
+DEFAULT_REPORT_FILENAME: str = 'run_report.json'
+PROFILE_MODES = ('', 'tracemalloc', 'cprofile', 'all')
+
+_lock = threading.Lock()
+_local = threading.local()
+_run = {'id': None, 'started_at': None, 'records': []}
+_settings = {'profile': os.environ.get(PROFILE_ENV_VAR, '').strip().lower()}
+_profile_stats = {'stats': None}
+
+# Only one cProfile profiler may be active at a time, so concurrent calls take turns
+_profiler_lock = threading.Lock()
+
+#####################################
+# Configuration
+#####################################
+
+def configure(profile: str = None) -> None:
+    """
+    Choose the capture mode, overriding the BINWARE_PROFILE environment variable.
+
+    Parameters:
+    - profile (str): '', 'tracemalloc', 'cprofile' or 'all'.
+    """
+    if profile is not None:
+        profile = profile.strip().lower()
+        if profile not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{profile}', expected one of {PROFILE_MODES}")
+        _settings['profile'] = profile
+
+def tracemalloc_enabled() -> bool:
+    return _settings['profile'] in ('tracemalloc', 'all')
+
+def cprofile_enabled() -> bool:
+    return _settings['profile'] in ('cprofile', 'all')
+
+def start_run() -> str:
+    """
+    Clear previous records and start a new run.
+
+    Returns:
+    - str: The new run id.
+    """
+    with _lock:
+        _run['id'] = uuid.uuid4().hex
+        _run['started_at'] = time.time()
+        _run['records'] = []
+        _profile_stats['stats'] = None
+    if tracemalloc_enabled() and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return _run['id']
+
+#####################################
+# Recording
+#####################################
+
+def note(**metrics) -> None:
+    """
+    Add metrics such as rows=, words= or bytes_in= to the innermost instrumented call.
+
+    note(error='...') marks the call as failed, for functions that print
+    an error instead of raising; the first error noted is kept.
+
+    Does nothing when called outside an instrumented function.
+    """
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        record = stack[-1]
+        for key, value in metrics.items():
+            if key == 'error':
+                record.setdefault('error', value)
+            else:
+                record[key] = record.get(key, 0) + value
+
+def add_record(**fields) -> None:
+    """
+    Append a record for work done outside an instrumented function,
+    e.g. a download made by the pipeline's fetch stage.
+    """
+    fields.setdefault('ok', True)
+    with _lock:
+        _run['records'].append(fields)
+
+def _file_size(path: pathlib.Path):
+    if path is None:
+        return None
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+def _max_rss_kb():
+    # ru_maxrss is the peak of the whole process so far, so it is reported once per run, not per call
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def instrument(stage: str):
+    """
+    Decorate a fetch_*, write_* or process_* function so every call is recorded.
+
+    File sizes are read from the function's usual arguments: a write or
+    fetch reports the size of folder_name/filename as bytes_out, and a
+    process reports its input as bytes_in and its results file as bytes_out.
+
+    Parameters:
+    - stage (str): 'fetch', 'write' or 'process'.
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            folder = pathlib.Path(arguments.get('folder_name', '.'))
+            record = {'function': function.__name__, 'stage': stage, 'folder': str(folder)}
+            if stage == 'process':
+                record['input'] = arguments.get('input_filename')
+                record['bytes_in'] = _file_size(folder / record['input']) if record['input'] else None
+                output_filename = arguments.get('output_filename')
+            else:
+                record['file'] = output_filename = arguments.get('filename')
+            output_path = folder / output_filename if output_filename else None
+            if stage == 'fetch':
+                record['url'] = arguments.get('url')
+
+            stack = getattr(_local, 'stack', None)
+            if stack is None:
+                stack = _local.stack = []
+            stack.append(record)
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            profiler = None
+            if cprofile_enabled() and _profiler_lock.acquire(blocking=False):
+                profiler = cProfile.Profile()
+            record['started_at'] = time.time()
+            start = time.perf_counter()
+            try:
+                if profiler is not None:
+                    result = profiler.runcall(function, *args, **kwargs)
+                else:
+                    result = function(*args, **kwargs)
+                # These functions print their errors and signal them through the return value
+                if result is False or (result is None and stage == 'process'):
+                    record.setdefault('error', f"{function.__name__} returned {result}")
+                return result
+            except BaseException as e:
+                record['error'] = repr(e)
+                raise
+            finally:
+                record['seconds'] = time.perf_counter() - start
+                stack.pop()
+                record['ok'] = 'error' not in record
+                record['bytes_out'] = _file_size(output_path)
+                if tracemalloc.is_tracing():
+                    record['traced_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+                if profiler is not None:
+                    _merge_profile(profiler)
+                    _profiler_lock.release()
+                with _lock:
+                    _run['records'].append(record)
+        return wrapper
+    return decorator
+
+def _merge_profile(profiler: cProfile.Profile) -> None:
+    with _lock:
+        if _profile_stats['stats'] is None:
+            _profile_stats['stats'] = pstats.Stats(profiler)
+        else:
+            _profile_stats['stats'].add(profiler)
+
+#####################################
+# Report Functions
+#####################################
+
+def summarize(records: list) -> dict:
+    """
+    Total seconds, bytes and counts per function.
+
+    Parameters:
+    - records (list): Entries recorded by instrumented calls.
+
+    Returns:
+    - dict: Function name -> totals.
+    """
+    totals = {}
+    for record in records:
+        entry = totals.setdefault(record.get('function', record.get('stage')), {'calls': 0, 'seconds': 0.0, 'bytes_in': 0,
+                                                       'bytes_out': 0, 'rows': 0, 'words': 0, 'errors': 0})
+        entry['calls'] += 1
+        entry['seconds'] += record.get('seconds', 0.0)
+        entry['errors'] += 0 if record.get('ok') else 1
+        for key in ('bytes_in', 'bytes_out', 'rows', 'words'):
+            entry[key] += record.get(key) or 0
+    return totals
+
+def write_run_report(report_path: str = DEFAULT_REPORT_FILENAME) -> dict:
+    """
+    Write every record of the current run, plus per-function totals, as JSON.
+
+    In cprofile mode the merged profile is saved next to the report with a
+    .prof extension (open it with pstats or snakeviz).
+
+    Parameters:
+    - report_path (str): Where to write the report.
+
+    Returns:
+    - dict: The report that was written.
+    """
+    with _lock:
+        records = list(_run['records'])
+        stats = _profile_stats['stats']
+    report_path = pathlib.Path(report_path)
+    report = {
+        'run_id': _run['id'],
+        'started_at': _run['started_at'],
+        'finished_at': time.time(),
+        'python': platform.python_version(),
+        'profile': _settings['profile'],
+        # Peak resident set size of the process up to the end of the run (KB on Linux)
+        'max_rss_kb': _max_rss_kb(),
+        'totals': summarize(records),
+        'records': records,
+    }
+    if stats is not None:
+        profile_path = report_path.with_suffix('.prof')
+        # What pstats.Stats.dump_stats writes, but through the atomic write path
+        with binware_write.atomic_open(profile_path, 'wb') as file:
+            marshal.dump(stats.stats, file)
+        report['cprofile'] = str(profile_path)
+    binware_write.write_atomic(report_path, json.dumps(report, indent=2))
+    return report
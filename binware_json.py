@@ -0,0 +1,104 @@
+"""
+Module: Python With Bin - Streaming JSON Extraction
+
+Pulls the values at a dotted path such as 'people.item.name' out of a
+JSON document without loading the whole document. The path uses ijson
+prefix syntax, where 'item' steps into every element of an array.
+
+With ijson installed, memory is bounded by the largest single value
+matched. Without it, the document is loaded with json.load and walked
+the same way, so results are identical either way. JSON Lines input
+(.jsonl / .ndjson) is always streamed one record at a time, and the
+path is applied to each record.
+"""
+
+# Standard library imports
+import json
+import pathlib
+from typing import Any, Iterator, Optional
+
+# Local module imports
+import binware_lazy
+
+# External library imports (requires virtual environment), loaded on first use
+try:
+    ijson = binware_lazy.lazy_import('ijson')
+except ImportError:  # Optional; only needed to stream large JSON documents
+    ijson = None
+
+#####################################
+# Global Variables
+#####################################
+
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+class MalformedJSONError(ValueError):
+    """Raised in place of ijson.JSONError, so catching it does not import ijson."""
+
+# Errors a malformed document can raise, whichever parser handles it
+JSON_ERRORS = (json.JSONDecodeError, MalformedJSONError)
+
+#####################################
+# Path Functions
+#####################################
+
+def walk_path(value: Any, parts: list) -> Iterator[Any]:
+    """
+    Yield every value reached by following path parts from an in-memory value.
+
+    Parameters:
+    - value (any): A decoded JSON value.
+    - parts (list): Path segments; 'item' steps into each array element.
+
+    Yields:
+    - any: The matched values, in document order. Missing keys match nothing.
+    """
+    if not parts:
+        yield value
+        return
+    head, rest = parts[0], parts[1:]
+    if head == 'item' and isinstance(value, list):
+        for element in value:
+            yield from walk_path(element, rest)
+    elif isinstance(value, dict) and head in value:
+        yield from walk_path(value[head], rest)
+
+def is_json_lines(file_path: pathlib.Path) -> bool:
+    """Return True if the file extension marks it as JSON Lines."""
+    return pathlib.Path(file_path).suffix.lower() in JSON_LINES_SUFFIXES
+
+#####################################
+# Streaming Functions
+#####################################
+
+def iter_json_path(file_path: pathlib.Path, path: str,
+                   json_lines: Optional[bool] = None) -> Iterator[Any]:
+    """
+    Stream the values at a dotted path out of a JSON or JSON Lines file.
+
+    Parameters:
+    - file_path (pathlib.Path): The file to read.
+    - path (str): Dotted path, e.g. 'people.item.name'. Empty matches the whole record.
+    - json_lines (bool): Treat the file as JSON Lines; guessed from the extension if None.
+
+    Yields:
+    - any: The matched values, in document order.
+    """
+    file_path = pathlib.Path(file_path)
+    parts = path.split('.') if path else []
+    if json_lines is None:
+        json_lines = is_json_lines(file_path)
+    if json_lines:
+        with file_path.open('r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield from walk_path(json.loads(line), parts)
+    elif ijson is not None:
+        with file_path.open('rb') as file:
+            try:
+                yield from ijson.items(file, path, use_float=True)
+            except ijson.JSONError as e:
+                raise MalformedJSONError(f"{file_path}: {e}") from e
+    else:
+        with file_path.open('r', encoding='utf-8') as file:
+            yield from walk_path(json.load(file), parts)
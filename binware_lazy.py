@@ -0,0 +1,70 @@
+"""
+Module: Python With Bin - Lazy Imports
+
+Defers importing heavy third-party packages (requests, openpyxl, xlrd,
+NumPy, ijson) until one of their attributes is first used, so short commands
+that never fetch or read a workbook do not pay for them at startup.
+
+    requests = binware_lazy.lazy_import('requests')
+
+Whether the package is installed is still checked up front (a cheap
+lookup on sys.path), so the try/except ImportError pattern used for
+optional dependencies keeps working. Modules that mention a lazy
+package in annotations use `from __future__ import annotations`, so
+defining a function does not trigger the import.
+"""
+
+# Standard library imports
+import importlib
+import importlib.util
+import sys
+
+#####################################
+# Lazy Modules
+#####################################
+
+class LazyModule:
+    """Stand-in for a module that imports the real one on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            # import_module holds the per-module import lock, so concurrent first uses are safe
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> list:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name: str):
+    """
+    Return a module that is imported on first use.
+
+    Parameters:
+    - name (str): Module name, e.g. 'requests' or 'numpy'.
+
+    Returns:
+    - The module itself if it is already imported, otherwise a LazyModule.
+
+    Raises:
+    - ImportError: If the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    return LazyModule(name)
+
+def is_loaded(module) -> bool:
+    """Return True if a module from lazy_import has actually been imported."""
+    return not isinstance(module, LazyModule) or module._module is not None
@@ -0,0 +1,182 @@
+"""
+Module: Python With Bin - Incremental Processing Manifest
+
+Records, for every results file we produce, the content hash of the input
+it was built from and the version of the processor that built it. When
+both still match, the processing step can be skipped entirely.
+
+Like make, the input's size and mtime are checked first and the file is
+only re-hashed when they differ, so unchanged files cost a single stat.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import os
+import pathlib
+import threading
+
+# Local module imports
+import binware_write
+
+#####################################
+# Global Variables
+#####################################
+
+DEFAULT_MANIFEST_FILENAME: str = 'process_manifest.json'
+HASH_CHUNK_SIZE: int = 1024 * 1024
+
+# Keys of builds whose results live in a ResultStore database rather than a file
+STORE_KEY_PREFIX: str = 'store:'
+
+#####################################
+# Hash Functions
+#####################################
+
+def file_sha256(file_path: pathlib.Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    Hash a file in chunks so large inputs are never read into memory at once.
+
+    Parameters:
+    - file_path (pathlib.Path): The file to hash.
+    - chunk_size (int): Bytes to read per chunk.
+
+    Returns:
+    - str: The hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with pathlib.Path(file_path).open('rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+#####################################
+# Output Keys
+#####################################
+
+def store_key(db_path: str, dataset: str) -> str:
+    """
+    Manifest key for a dataset whose results are only recorded in a ResultStore.
+
+    Parameters:
+    - db_path (str): The result store database.
+    - dataset (str): The dataset name the metrics are stored under.
+
+    Returns:
+    - str: A key that is_up_to_date, record and prune accept in place of a results path.
+    """
+    return f"{STORE_KEY_PREFIX}{db_path}#{dataset}"
+
+def output_exists(output: str) -> bool:
+    """Check that a results file, or the database behind a store_key, still exists."""
+    if output.startswith(STORE_KEY_PREFIX):
+        return os.path.exists(output[len(STORE_KEY_PREFIX):].rpartition('#')[0])
+    return os.path.exists(output)
+
+#####################################
+# Build Manifest
+#####################################
+
+class BuildManifest:
+    """
+    Thread-safe output path -> build record index persisted as JSON.
+
+    Each record holds input, input_sha256, input_size, input_mtime_ns,
+    processor and version. Records are keyed by the results path, or by
+    a store_key when the results only go to the result store.
+    """
+
+    def __init__(self, manifest_path: str = DEFAULT_MANIFEST_FILENAME) -> None:
+        self.manifest_path = pathlib.Path(manifest_path)
+        self._lock = threading.Lock()
+        self._records = {}
+        self.load()
+
+    def load(self) -> None:
+        """Read the manifest from disk; a missing or corrupt manifest starts empty."""
+        try:
+            with self.manifest_path.open('r', encoding='utf-8') as file:
+                records = json.load(file)
+        except (IOError, json.JSONDecodeError):
+            records = {}
+        with self._lock:
+            self._records = records if isinstance(records, dict) else {}
+
+    def save(self) -> None:
+        """Write the manifest to disk atomically (binware_write)."""
+        with self._lock:
+            snapshot = json.dumps(self._records, indent=2, sort_keys=True)
+        binware_write.write_atomic(self.manifest_path, snapshot)
+
+    def prune(self) -> int:
+        """
+        Drop records whose results file (or store database) no longer exists, so the manifest does not grow without bound.
+
+        Returns:
+        - int: Number of records removed.
+        """
+        with self._lock:
+            missing = [output for output in self._records if not output_exists(output)]
+            for output in missing:
+                del self._records[output]
+        return len(missing)
+
+    def is_up_to_date(self, input_path: pathlib.Path, output_path: pathlib.Path,
+                      processor: str, version: int) -> bool:
+        """
+        Check whether output_path was built from the current input by this processor version.
+
+        Parameters:
+        - input_path (pathlib.Path): The input file.
+        - output_path (pathlib.Path or str): The results file, or a store_key.
+        - processor (str): Name of the processing function.
+        - version (int): Version of the processing function.
+
+        Returns:
+        - bool: True if processing can be skipped.
+        """
+        with self._lock:
+            record = self._records.get(str(output_path))
+        if not record or not output_exists(str(output_path)):
+            return False
+        if record.get('input') != str(input_path) or record.get('processor') != processor \
+                or record.get('version') != version:
+            return False
+        try:
+            stat = os.stat(input_path)
+        except OSError:
+            return False
+        if stat.st_size == record.get('input_size') and stat.st_mtime_ns == record.get('input_mtime_ns'):
+            return True
+        # Touched but possibly unchanged: fall back to the content hash
+        if stat.st_size != record.get('input_size') or file_sha256(input_path) != record.get('input_sha256'):
+            return False
+        self.record(input_path, output_path, processor, version, record['input_sha256'], stat)
+        return True
+
+    def record(self, input_path: pathlib.Path, output_path: pathlib.Path,
+               processor: str, version: int, input_sha256: str = None,
+               input_stat: os.stat_result = None) -> None:
+        """
+        Remember that output_path was just built from input_path.
+
+        Parameters:
+        - input_path (pathlib.Path): The input file.
+        - output_path (pathlib.Path or str): The results file, or a store_key.
+        - processor (str): Name of the processing function.
+        - version (int): Version of the processing function.
+        - input_sha256 (str): The input hash, if already known.
+        - input_stat (os.stat_result): The input stat taken alongside input_sha256.
+        """
+        stat = input_stat if input_stat is not None else os.stat(input_path)
+        if input_sha256 is None:
+            input_sha256 = file_sha256(input_path)
+        with self._lock:
+            self._records[str(output_path)] = {
+                'input': str(input_path),
+                'input_sha256': input_sha256,
+                'input_size': stat.st_size,
+                'input_mtime_ns': stat.st_mtime_ns,
+                'processor': processor,
+                'version': version,
+            }
@@ -0,0 +1,421 @@
+"""
+Module: Python With Bin - Parsed Columnar Cache
+
+Parses a CSV file or an Excel sheet once and keeps every column as a
+typed .npy file in a hidden .parsed folder next to the source. Later
+runs memory-map those files instead of re-parsing text, so a processor
+touches only the pages of the columns it reads.
+
+- CSV: numeric columns become float64 (blank cells are NaN); any other
+  column is stored as a fixed-width string array. The file is parsed a
+  chunk of rows at a time and each chunk is appended to the column
+  files, so building the cache does not hold the whole file in memory.
+- Excel: each column becomes float64, with NaN for text and blank cells,
+  so numeric sums skip them as before, plus a small array recording
+  which cells held integers.
+
+A cache is valid only for the exact source it came from. Size and
+mtime are checked first, then the SHA-256 of the source, and a stale
+cache is simply rebuilt. The metadata file is written last, so a
+reader never sees a half-written cache.
+"""
+
+from __future__ import annotations
+
+# Standard library imports
+import csv
+import itertools
+import json
+import operator
+import os
+import pathlib
+import uuid
+from typing import Optional, Union
+
+# Local module imports
+import binware_lazy
+import binware_columnar
+import binware_excel
+import binware_manifest
+
+# External library imports (requires virtual environment), loaded on first use
+try:
+    np = binware_lazy.lazy_import('numpy')
+except ImportError:  # NumPy is only needed for the parsed cache
+    np = None
+
+#####################################
+# Global Variables
+#####################################
+
+CACHE_DIRNAME: str = '.parsed'
+META_FILENAME: str = 'meta.json'
+
+# Bump when the cache layout or parsing rules change, so old caches are rebuilt
+CACHE_FORMAT_VERSION: int = 2
+
+# Rows parsed and appended at a time when building a CSV cache
+CSV_CHUNK_ROWS: int = binware_columnar.DEFAULT_CHUNK_ROWS
+
+#####################################
+# Parsed Tables
+#####################################
+
+class ParsedTable:
+    """Named columns loaded from a parsed cache, memory-mapped read-only."""
+
+    def __init__(self, columns: dict, header: list, meta: dict) -> None:
+        self.columns = columns
+        self.header = header
+        self.meta = meta
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+def cache_dir(file_path: pathlib.Path, sheet: Union[int, str, None] = None) -> pathlib.Path:
+    """Return the cache folder for a source file (and sheet, for workbooks)."""
+    file_path = pathlib.Path(file_path)
+    name = file_path.name if sheet is None else f"{file_path.name}.sheet-{sheet}"
+    return file_path.parent / CACHE_DIRNAME / name
+
+def _source_fingerprint(file_path: pathlib.Path) -> dict:
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': binware_manifest.file_sha256(file_path)}
+
+def load_cache(file_path: pathlib.Path, sheet: Union[int, str, None] = None) -> Optional[ParsedTable]:
+    """
+    Open the parsed cache of a source file if it is still current.
+
+    Parameters:
+    - file_path (pathlib.Path): The source CSV or workbook.
+    - sheet (int or str): Sheet index or name for workbooks; None for CSV.
+
+    Returns:
+    - ParsedTable: The memory-mapped columns, or None if there is no valid cache.
+    """
+    binware_columnar.require_numpy()
+    folder = cache_dir(file_path, sheet)
+    try:
+        with (folder / META_FILENAME).open('r', encoding='utf-8') as file:
+            meta = json.load(file)
+        stat = os.stat(file_path)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if meta.get('version') != CACHE_FORMAT_VERSION or meta.get('size') != stat.st_size:
+        return None
+    if meta.get('mtime_ns') != stat.st_mtime_ns:
+        # Touched but possibly unchanged: fall back to the content hash
+        if binware_manifest.file_sha256(file_path) != meta.get('sha256'):
+            return None
+        meta['mtime_ns'] = stat.st_mtime_ns
+        _write_meta(folder, meta)
+    try:
+        columns = {name: np.load(folder / entry['file'], mmap_mode='r', allow_pickle=False)
+                   for name, entry in meta['columns'].items()}
+    except (OSError, ValueError):
+        return None
+    return ParsedTable(columns, meta['header'], meta)
+
+def _write_meta(folder: pathlib.Path, meta: dict) -> None:
+    temp_path = folder / f".{META_FILENAME}.{uuid.uuid4().hex}.tmp"
+    with temp_path.open('w', encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+    os.replace(temp_path, folder / META_FILENAME)
+
+def _save_table(file_path: pathlib.Path, sheet, header: list, arrays: dict, extra: dict) -> ParsedTable:
+    """Write the column files under a fresh generation id, then the metadata, then drop old files."""
+    folder = cache_dir(file_path, sheet)
+    folder.mkdir(parents=True, exist_ok=True)
+    generation = uuid.uuid4().hex[:12]
+    files = {}
+    for index, (name, array) in enumerate(arrays.items()):
+        filename = f"{generation}-{index}.npy"
+        np.save(folder / filename, array, allow_pickle=False)
+        files[name] = (filename, array.dtype)
+    return _commit_table(file_path, sheet, generation, header, files, extra)
+
+def _commit_table(file_path: pathlib.Path, sheet, generation: str, header: list,
+                  files: dict, extra: dict) -> ParsedTable:
+    """Write the metadata for a finished generation of column files ({name: (filename, dtype)}), then drop old files."""
+    folder = cache_dir(file_path, sheet)
+    meta = dict(_source_fingerprint(file_path), version=CACHE_FORMAT_VERSION, header=header, columns={}, **extra)
+    for name, (filename, dtype) in files.items():
+        meta['columns'][name] = {'file': filename, 'dtype': dtype.str}
+    _write_meta(folder, meta)
+    for path in folder.glob('*.npy'):
+        if not path.name.startswith(generation):
+            path.unlink(missing_ok=True)
+    return load_cache(file_path, sheet)
+
+class _NpyAppender:
+    """
+    Appends 1-D chunks of one dtype to a .npy file.
+
+    The header is written for zero rows and rewritten with the final row
+    count on close; NumPy pads .npy headers so the shape can grow in place.
+    """
+
+    def __init__(self, path: pathlib.Path, dtype) -> None:
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self._file = path.open('wb')
+        self._write_header()
+        self._data_offset = self._file.tell()
+
+    def _write_header(self) -> None:
+        np.lib.format.write_array_header_1_0(self._file, {
+            'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False, 'shape': (self.rows,)})
+
+    def append(self, values) -> None:
+        self._file.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self.rows += len(values)
+
+    def close(self) -> np.dtype:
+        """Write the final row count into the header and return the dtype."""
+        self._file.seek(0)
+        self._write_header()
+        grew = self._file.tell() != self._data_offset
+        self._file.close()
+        if grew:
+            raise ValueError(f"{self.path}: the .npy header grew past its padding")
+        return self.dtype
+
+    def discard(self) -> None:
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+class _TextSpill:
+    """
+    Collects 1-D string chunks for a fixed-width text column.
+
+    The width is only known after the last chunk, so chunks are saved one
+    after another to a spill file and copied into the .npy file at the end.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self.rows = 0
+        self.width = 1
+        self._spill_path = path.with_suffix('.spill')
+        self._file = self._spill_path.open('wb')
+
+    def append(self, values) -> None:
+        array = np.array(values, dtype=str)
+        self.width = max(self.width, array.dtype.itemsize // 4)
+        np.save(self._file, array, allow_pickle=False)
+        self.rows += len(array)
+
+    def close(self) -> np.dtype:
+        """Write the assembled column and return its dtype."""
+        self._file.close()
+        dtype = np.dtype(f"<U{self.width}")
+        column = np.lib.format.open_memmap(self.path, mode='w+', dtype=dtype, shape=(self.rows,))
+        start = 0
+        with self._spill_path.open('rb') as spill_file:
+            while start < self.rows:
+                array = np.load(spill_file, allow_pickle=False)
+                column[start:start + len(array)] = array
+                start += len(array)
+        column.flush()
+        del column
+        self._spill_path.unlink()
+        return dtype
+
+#####################################
+# Cache Builders
+#####################################
+
+def _iter_csv_chunks(reader, indexes: list, chunk_rows: int):
+    """Yield the cells at the given indexes, one list per index, chunk_rows rows at a time; short rows are padded with ''."""
+    getters = [operator.itemgetter(index) for index in indexes]
+    while True:
+        rows = list(itertools.islice(reader, chunk_rows))
+        if not rows:
+            return
+        try:
+            yield [list(map(getter, rows)) for getter in getters]
+        except IndexError:
+            yield [[row[index] if index < len(row) else '' for row in rows] for index in indexes]
+
+def build_csv_cache(file_path: pathlib.Path, chunk_rows: int = CSV_CHUNK_ROWS) -> ParsedTable:
+    """
+    Parse a CSV file into typed columns and save them, a chunk of rows at a time.
+
+    Every chunk is converted to float64 (like binware_columnar) and
+    appended to its column's .npy file, so memory is bounded by
+    chunk_rows rather than the file size. A column with a cell that is
+    not a number is stored as text instead. When that cell is in a later
+    chunk, the earlier chunks of the column are gone, so the file is read
+    a second time for just those columns.
+
+    Parameters:
+    - file_path (pathlib.Path): The CSV file.
+    - chunk_rows (int): Rows to parse per chunk.
+
+    Returns:
+    - ParsedTable: The freshly written cache, memory-mapped.
+    """
+    binware_columnar.require_numpy()
+    folder = cache_dir(file_path)
+    folder.mkdir(parents=True, exist_ok=True)
+    generation = uuid.uuid4().hex[:12]
+    try:
+        with pathlib.Path(file_path).open('r', encoding='utf-8', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            # Duplicate header: csv lookups by name use the first one as well
+            indexes = {}
+            for index, name in enumerate(header):
+                indexes.setdefault(name, index)
+            paths = {name: folder / f"{generation}-{position}.npy" for position, name in enumerate(indexes)}
+            writers = {name: _NpyAppender(paths[name], np.float64) for name in indexes}
+            reread = []
+            for first, chunk in enumerate(_iter_csv_chunks(reader, list(indexes.values()), chunk_rows)):
+                for name, values in zip(indexes, chunk):
+                    writer = writers.get(name)
+                    if isinstance(writer, _TextSpill):
+                        writer.append(values)
+                        continue
+                    if writer is None:
+                        continue
+                    try:
+                        writer.append(binware_columnar.to_float_array(values))
+                    except ValueError:
+                        writer.discard()
+                        if first == 0:
+                            writers[name] = _TextSpill(paths[name])
+                            writers[name].append(values)
+                        else:
+                            del writers[name]
+                            reread.append(name)
+        if reread:
+            _reread_text_columns(file_path, writers, reread, indexes, paths, chunk_rows)
+        files = {name: (paths[name].name, writers[name].close()) for name in indexes}
+    except BaseException:
+        for path in folder.glob(f"{generation}-*"):
+            path.unlink(missing_ok=True)
+        raise
+    return _commit_table(file_path, None, generation, header, files, {})
+
+def _reread_text_columns(file_path: pathlib.Path, writers: dict, names: list, indexes: dict,
+                         paths: dict, chunk_rows: int) -> None:
+    """Read the CSV again and spill the given columns as text, for columns found to be text after their first chunk."""
+    for name in names:
+        writers[name] = _TextSpill(paths[name])
+    with pathlib.Path(file_path).open('r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+        for chunk in _iter_csv_chunks(reader, [indexes[name] for name in names], chunk_rows):
+            for name, values in zip(names, chunk):
+                writers[name].append(values)
+
+def build_excel_cache(file_path: pathlib.Path, sheet: Union[int, str] = 0) -> ParsedTable:
+    """
+    Read one sheet of a workbook into float64 columns and save them.
+
+    Next to each column ('0', '1', ...) an int8 array ('0:kinds', ...)
+    marks every cell as 0 (not a number), 1 (integer) or 2 (float), so
+    sums come back as int exactly when the cell-by-cell sum would.
+
+    Parameters:
+    - file_path (pathlib.Path): The .xls or .xlsx workbook.
+    - sheet (int or str): Sheet index or name.
+
+    Returns:
+    - ParsedTable: The freshly written cache, memory-mapped.
+    """
+    binware_columnar.require_numpy()
+    rows = list(binware_excel.iter_sheet_rows(file_path, sheet))
+    width = max((len(row) for row in rows), default=0)
+    header = [value if isinstance(value, (str, int, float)) else None for value in (rows[0] if rows else [])]
+    arrays = {}
+    for index in range(width):
+        values = [row[index] if index < len(row) else None for row in rows]
+        arrays[str(index)] = np.array([float(value) if isinstance(value, (int, float)) else np.nan
+                                       for value in values], dtype=np.float64)
+        arrays[f"{index}:kinds"] = np.array([1 if isinstance(value, int) else 2 if isinstance(value, float) else 0
+                                             for value in values], dtype=np.int8)
+    return _save_table(file_path, sheet, header, arrays, {})
+
+def ensure_csv_cache(file_path: pathlib.Path) -> ParsedTable:
+    """Load the CSV cache, building it first if it is missing or stale."""
+    return load_cache(file_path) or build_csv_cache(file_path)
+
+def ensure_excel_cache(file_path: pathlib.Path, sheet: Union[int, str] = 0) -> ParsedTable:
+    """Load the sheet cache, building it first if it is missing or stale."""
+    return load_cache(file_path, sheet) or build_excel_cache(file_path, sheet)
+
+#####################################
+# Cached Processing
+#####################################
+
+def summarize_csv(file_path: pathlib.Path, columns) -> dict:
+    """
+    Column statistics from the parsed cache.
+
+    The mean is exact (same bits as statistics.mean and the streaming
+    path); variance is computed in two vectorized passes. Blank cells
+    are skipped, while 'nan' and 'inf' cells count and make the mean nan
+    or infinite, as in the streaming path.
+
+    Parameters:
+    - file_path (pathlib.Path): The CSV file.
+    - columns (iterable): Numeric columns to summarize.
+
+    Returns:
+    - dict: Column name -> ColumnSummary (count 0 if the column is missing).
+    """
+    table = ensure_csv_cache(file_path)
+    columns = list(columns)
+    for column in columns:
+        if column in table and table[column].dtype.kind != 'f':
+            raise ValueError(f"Column '{column}' is not numeric")
+    present = {column: table[column] for column in columns if column in table}
+    return binware_columnar.summarize_chunks([present], columns)
+
+def group_means_csv(file_path: pathlib.Path, columns, group_by: str) -> dict:
+    """Per-group means from the parsed cache; see binware_columnar.group_means_csv."""
+    table = ensure_csv_cache(file_path)
+    if group_by not in table:
+        raise KeyError(group_by)
+    columns = list(columns)
+    chunk = {column: table[column] for column in columns + [group_by] if column in table}
+    return binware_columnar.group_means_chunks([chunk], columns, group_by)
+
+def sum_excel_column(file_path: pathlib.Path, sheet: Union[int, str] = 0,
+                     column: Union[int, str] = 1, header_rows: int = 1):
+    """
+    Sum a workbook column from the parsed cache.
+
+    Values are added one after another in row order (a cumulative sum),
+    so the total has the same bits as binware_excel.sum_excel_column.
+
+    Parameters:
+    - file_path (pathlib.Path): The workbook.
+    - sheet (int or str): Sheet index or name.
+    - column (int or str): Zero-based column index or header name.
+    - header_rows (int): Rows to skip at the top of the sheet.
+
+    Returns:
+    - float or int: The sum of the numeric cells below the header.
+
+    Raises:
+    - IndexError: If the column index is past the sheet's last column.
+    """
+    table = ensure_excel_cache(file_path, sheet)
+    index = binware_excel.resolve_column(table.header if isinstance(column, str) else [], column)
+    # Columns are saved as '0'..'n-1', each with a ':kinds' companion
+    binware_excel.check_column_index(index, len(table.columns) // 2)
+    if str(index) not in table:
+        return 0
+    values = table[str(index)][header_rows:]
+    kinds = table[f"{index}:kinds"][header_rows:]
+    values = values[kinds > 0]
+    if not values.size:
+        return 0
+    total = float(np.cumsum(values)[-1])
+    return total if (kinds == 2).any() else int(total)
@@ -0,0 +1,197 @@
+"""
+Module: Python With Bin - Pipeline Runner
+
+Runs datasets declared in a JSON config as chains of stages
+(fetch -> persist -> process). Chains that do not depend on each other
+run concurrently, and each chain moves on to processing as soon as its
+own input lands instead of waiting for every download. A dataset can
+list other datasets in depends_on, which turns the chains into a DAG.
+
+Example config:
+
+    {
+        "max_workers": 8,
+        "per_host_limit": 2,
+        "datasets": [
+            {"name": "happiness", "kind": "csv", "url": "https://...",
+             "folder": "data-csv", "filename": "data.csv",
+             "output": "results_csv.txt", "options": {"summary": true}}
+        ]
+    }
+"""
+
+# Standard library imports
+import concurrent.futures
+import json
+import pathlib
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+#####################################
+# Global Variables
+#####################################
+
+DEFAULT_PIPELINE_CONFIG: str = 'pipeline.json'
+DEFAULT_MAX_WORKERS: int = 8
+
+#####################################
+# Pipeline Types
+#####################################
+
+@dataclass
+class Dataset:
+    """One declared dataset: where it comes from, where it lands, and how it is processed."""
+    name: str
+    kind: str
+    url: str
+    folder_name: str
+    filename: str
+    output_filename: Optional[str] = None
+    options: dict = field(default_factory=dict)
+    depends_on: tuple = ()
+
+@dataclass
+class StageTiming:
+    """Wall time and outcome of one stage of one dataset."""
+    dataset: str
+    stage: str
+    seconds: float
+    ok: bool
+    detail: str = ''
+
+#####################################
+# Config Functions
+#####################################
+
+def load_pipeline(config_path: str = DEFAULT_PIPELINE_CONFIG) -> dict:
+    """
+    Read a pipeline config and check that its dependencies form a DAG.
+
+    Parameters:
+    - config_path (str): Path to the JSON config.
+
+    Returns:
+    - dict: The config, with 'datasets' turned into Dataset entries.
+    """
+    with pathlib.Path(config_path).open('r', encoding='utf-8') as file:
+        config = json.load(file)
+    datasets = []
+    for entry in config.get('datasets', []):
+        datasets.append(Dataset(
+            name=entry.get('name', entry['filename']),
+            kind=entry['kind'],
+            url=entry['url'],
+            folder_name=entry['folder'],
+            filename=entry['filename'],
+            output_filename=entry.get('output'),
+            options=entry.get('options', {}),
+            depends_on=tuple(entry.get('depends_on', ())),
+        ))
+    validate_pipeline(datasets)
+    config['datasets'] = datasets
+    return config
+
+def validate_pipeline(datasets: list) -> None:
+    """
+    Raise ValueError for duplicate names, unknown dependencies or cycles.
+
+    Parameters:
+    - datasets (list): The Dataset entries to check.
+    """
+    by_name = {}
+    for dataset in datasets:
+        if dataset.name in by_name:
+            raise ValueError(f"Duplicate dataset name '{dataset.name}'")
+        by_name[dataset.name] = dataset
+    for dataset in datasets:
+        for dependency in dataset.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Dataset '{dataset.name}' depends on unknown dataset '{dependency}'")
+    # Depth-first search for cycles: 1 = on the current path, 2 = finished
+    state = {}
+
+    def visit(name: str) -> None:
+        state[name] = 1
+        for dependency in by_name[name].depends_on:
+            if state.get(dependency) == 1:
+                raise ValueError(f"Dependency cycle through '{name}' and '{dependency}'")
+            if dependency not in state:
+                visit(dependency)
+        state[name] = 2
+
+    for name in by_name:
+        if name not in state:
+            visit(name)
+
+#####################################
+# Scheduler
+#####################################
+
+def run_pipeline(datasets: list, run_chain: Callable[[Dataset], tuple],
+                 max_workers: int = DEFAULT_MAX_WORKERS) -> list:
+    """
+    Run every dataset's stage chain, concurrently where dependencies allow.
+
+    A chain starts as soon as all of its dependencies have succeeded. If a
+    dependency fails, the dependent chain is skipped and recorded as such.
+
+    Parameters:
+    - datasets (list): The Dataset entries to run.
+    - run_chain (callable): Runs one dataset's stages and returns (ok, [StageTiming, ...]).
+    - max_workers (int): Chains to run at the same time.
+
+    Returns:
+    - list: StageTiming entries for every stage that ran or was skipped.
+    """
+    validate_pipeline(datasets)
+    pending = {dataset.name: dataset for dataset in datasets}
+    succeeded = set()
+    failed = set()
+    timings = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while pending or running:
+            for name, dataset in list(pending.items()):
+                if any(dependency in failed for dependency in dataset.depends_on):
+                    del pending[name]
+                    failed.add(name)
+                    timings.append(StageTiming(name, 'skipped', 0.0, False, 'a dependency failed'))
+                elif all(dependency in succeeded for dependency in dataset.depends_on):
+                    del pending[name]
+                    running[pool.submit(run_chain, dataset)] = dataset
+            if not running:
+                continue
+            finished, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                dataset = running.pop(future)
+                try:
+                    ok, chain_timings = future.result()
+                except Exception as e:
+                    ok, chain_timings = False, [StageTiming(dataset.name, 'chain', 0.0, False, str(e))]
+                timings.extend(chain_timings)
+                (succeeded if ok else failed).add(dataset.name)
+    return timings
+
+#####################################
+# Report Functions
+#####################################
+
+def format_timings(timings: list) -> str:
+    """
+    Build a plain-text table of per-stage timings.
+
+    Parameters:
+    - timings (list): StageTiming entries from run_pipeline.
+
+    Returns:
+    - str: One line per stage plus a per-stage-type total.
+    """
+    lines = []
+    totals = {}
+    for timing in timings:
+        status = 'OK' if timing.ok else 'FAILED'
+        detail = f" ({timing.detail})" if timing.detail else ''
+        lines.append(f"{timing.seconds:8.3f}s {timing.stage:<8} {timing.dataset:<20} {status}{detail}")
+        totals[timing.stage] = totals.get(timing.stage, 0.0) + timing.seconds
+    lines.append("Totals: " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in totals.items()))
+    return "\n".join(lines)
@@ -4,8 +4,14 @@ Module: Python With Bin - Project Folder Automation
 Module 2 Project
 """
 
+import concurrent.futures
+import datetime
+import os
 import pathlib
 import time
+from typing import Iterable
+
+import binware_schedule
 
 #####################################
 # Global Variables
@@ -15,9 +21,6 @@ import time
 project_path = pathlib.Path.cwd()
 data_path = project_path.joinpath('data')
 
-# Ensure the data directory exists
-data_path.mkdir(exist_ok=True)
-
 # Lists
 tools_used: list = ["Git", "GitHub", "Python", "VS Code"]
 regions = [
@@ -30,10 +33,26 @@ regions = [
     "Middle East"
 ]
 
+# Layout of time-partitioned folders (a strftime pattern; '/' separates levels)
+TIME_PARTITION_PATTERN: str = "%Y/%m/%d/%H%M%S"
+
+# Folders already known to exist, so repeated partitions skip the mkdir calls
+_created_folders: set = set()
+
 #####################################
 # Define Functions
 #####################################
 
+def ensure_data_path() -> pathlib.Path:
+    """
+    Create the data directory if it does not exist yet.
+
+    Called by every folder function instead of at import time, so
+    importing this module never touches the filesystem.
+    """
+    data_path.mkdir(parents=True, exist_ok=True)
+    return data_path
+
 def create_folders_for_range(start_year: int, end_year: int) -> None:
     """
     Create folders for each year.
@@ -43,6 +62,7 @@ def create_folders_for_range(start_year: int, end_year: int) -> None:
     end_year - The ending year of the range.
     """
     print(f"Creating folders for years {start_year} to {end_year}...")
+    ensure_data_path()
     for year in range(start_year, end_year + 1):
         year_path = data_path.joinpath(str(year))
         year_path.mkdir(exist_ok=True)
@@ -58,6 +78,7 @@ def create_folders_from_list(folder_list: list, to_lowercase: bool = False, remo
     remove_spaces - Replace spaces with underscores in folder names if True.
     """
     print("Creating folders from the provided list...")
+    ensure_data_path()
     for name in folder_list:
         original_name = name
         if to_lowercase:
@@ -77,30 +98,232 @@ def create_prefixed_folders(folder_list: list, prefix: str) -> None:
     prefix - The prefix to be added to each folder name.
     """
     print(f"Creating folders with prefix '{prefix}'...")
+    ensure_data_path()
     for name in folder_list:
         prefixed_name = f"{prefix}{name}"
         folder_path = data_path.joinpath(prefixed_name)
         folder_path.mkdir(exist_ok=True)
         print(f"Folder created: {folder_path}")
 
-def create_folders_periodically(duration_seconds: int, interval_seconds: int = 5) -> None:
+def time_partition_path(when: datetime.datetime = None, base_path: pathlib.Path = None,
+                        pattern: str = TIME_PARTITION_PATTERN) -> pathlib.Path:
+    """
+    Return the time-partitioned folder for a moment, e.g. data/2024/05/01/120005.
+
+    Arguments:
+    when - The moment to partition by (default: now, in UTC).
+    base_path - Folder the partitions go under (default: data_path).
+    pattern - strftime pattern for the partition levels.
+    """
+    when = when or datetime.datetime.now(datetime.timezone.utc)
+    base_path = pathlib.Path(base_path) if base_path is not None else data_path
+    return base_path.joinpath(*when.strftime(pattern).split('/'))
+
+def create_time_partition(when: datetime.datetime = None, base_path: pathlib.Path = None,
+                          pattern: str = TIME_PARTITION_PATTERN) -> pathlib.Path:
+    """
+    Create the time-partitioned folder for a moment and return it.
+
+    Parent folders (the year, month and day levels) are remembered once
+    created, so a partition per tick costs one mkdir instead of one per level.
+
+    Arguments:
+    See time_partition_path.
+    """
+    folder_path = time_partition_path(when, base_path, pattern)
+    if folder_path.parent not in _created_folders:
+        folder_path.parent.mkdir(parents=True, exist_ok=True)
+        _created_folders.add(folder_path.parent)
+    folder_path.mkdir(exist_ok=True)
+    return folder_path
+
+def create_folders_periodically(duration_seconds: int, interval_seconds: int = 5,
+                                time_partitioned: bool = False) -> None:
     """
     Create a series of folders periodically over a specified duration.
 
+    Folders are created on a fixed schedule (see binware_schedule), so the
+    time spent creating and reporting each one does not delay the next.
+
     Arguments:
     duration_seconds - The total duration over which folders will be created.
     interval_seconds - The interval between folder creation in seconds.
+    time_partitioned - Name each folder after its tick time (data/YYYY/MM/DD/HHMMSS)
+                       instead of periodic_folder_N.
     """
     print(f"Creating folders every {interval_seconds} seconds for a total duration of {duration_seconds} seconds...")
-    start_time = time.time()
-    folder_count = 0
-    while (time.time() - start_time) < duration_seconds:
-        folder_count += 1
-        folder_path = data_path.joinpath(f"periodic_folder_{folder_count}")
-        folder_path.mkdir(exist_ok=True)
+    ensure_data_path()
+
+    def create_folder(tick: binware_schedule.Tick) -> None:
+        if time_partitioned:
+            folder_path = create_time_partition(tick.wall_time)
+        else:
+            folder_path = data_path.joinpath(f"periodic_folder_{tick.number + 1}")
+            folder_path.mkdir(exist_ok=True)
         print(f"Folder created: {folder_path}")
-        time.sleep(interval_seconds)
-    print(f"Finished creating {folder_count} folders.")
+
+    report = binware_schedule.Scheduler(create_folder, interval_seconds).run(duration=duration_seconds)
+    print(f"Finished creating {report.runs - report.failed} folders.")
+
+#####################################
+# Bulk Provisioning Functions
+#####################################
+
+def _partition_names(regions: Iterable[str], prefixes: Iterable[str],
+                     to_lowercase: bool, remove_spaces: bool) -> list:
+    """Return the outer folder names, <prefix><region>, normalized like create_folders_from_list."""
+    names = []
+    for region in regions:
+        if to_lowercase:
+            region = region.lower()
+        if remove_spaces:
+            region = region.replace(" ", "_")
+        names.append(region)
+    return list(dict.fromkeys(f"{prefix}{name}" for prefix in prefixes for name in names))
+
+def partition_paths(years: Iterable[int] = (), regions: Iterable[str] = (), prefixes: Iterable[str] = ('',),
+                    to_lowercase: bool = False, remove_spaces: bool = False,
+                    base_path: pathlib.Path = None) -> list:
+    """
+    Expand a partition spec (years x regions x prefixes) into folder paths.
+
+    Each partition is <base>/<prefix><region>/<year>. Leave out regions
+    or years to drop that level.
+
+    Arguments:
+    years - Years for the inner level.
+    regions - Region names for the outer level.
+    prefixes - Prefixes put in front of every region name; each prefix adds a full set of regions.
+    to_lowercase - Convert region names to lowercase if True.
+    remove_spaces - Replace spaces with underscores in region names if True.
+    base_path - Folder the partitions go under (default: data_path).
+    """
+    base_path = pathlib.Path(base_path) if base_path is not None else data_path
+    outer = [base_path / name for name in _partition_names(regions, prefixes, to_lowercase, remove_spaces)]
+    years = list(dict.fromkeys(str(year) for year in years))
+    if not outer:
+        return [base_path / year for year in years]
+    return [folder / year for folder in outer for year in years] if years else outer
+
+def _mkdir_all(paths: list) -> list:
+    """Create each folder in turn; return (path, error) for the ones that failed."""
+    failed = []
+    for path in paths:
+        try:
+            os.mkdir(path)
+        except FileExistsError as e:
+            if not os.path.isdir(path):
+                failed.append((path, e))
+        except OSError as e:
+            failed.append((path, e))
+    return failed
+
+def _provision_levels(base_path: pathlib.Path, levels: list, targets: list, workers: int = None) -> dict:
+    """
+    Create the folders in levels (a list of {path: parent} dicts, parents first) and summarize.
+
+    Paths are plain strings built as parent + os.sep + name, so they match
+    the paths os.scandir reports; pathlib objects would cost more than the
+    mkdir calls themselves.
+    """
+    start = time.perf_counter()
+    base = os.fspath(base_path)
+    base_path.mkdir(parents=True, exist_ok=True)
+
+    # Dedup against what is already there: list each existing parent once
+    existing = {base}
+    for level in levels:
+        children = {}
+        for path, parent in level.items():
+            if parent in existing:
+                children.setdefault(parent, set()).add(path)
+        for parent, wanted in children.items():
+            with os.scandir(parent) as entries:
+                existing.update(entry.path for entry in entries if entry.path in wanted and entry.is_dir())
+
+    # Create what is missing, parents before children, each level in parallel batches
+    workers = workers or min(8, os.cpu_count() or 1)
+    created = 0
+    failed = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        for level in levels:
+            missing = [path for path in level if path not in existing]
+            size = max(256, -(-len(missing) // (workers * 4)))
+            batches = [missing[i:i + size] for i in range(0, len(missing), size)]
+            results = pool.map(_mkdir_all, batches) if workers > 1 and len(batches) > 1 else map(_mkdir_all, batches)
+            level_failed = [failure for result in results for failure in result]
+            created += len(missing) - len(level_failed)
+            failed.extend(level_failed)
+
+    summary = {
+        'requested': len(targets),
+        'existing': sum(1 for path in targets if path in existing),
+        'created': created,
+        'failed': failed,
+        'seconds': time.perf_counter() - start,
+    }
+    print(f"Provisioned {summary['requested']} folders under {base_path}: {summary['created']} created, "
+          f"{summary['existing']} already existed, {len(failed)} failed ({summary['seconds']:.2f}s)")
+    for path, error in failed[:10]:
+        print(f"- {path}: {error}")
+    if len(failed) > 10:
+        print(f"- ... and {len(failed) - 10} more")
+    return summary
+
+def provision_folders(paths: Iterable, base_path: pathlib.Path = None, workers: int = None) -> dict:
+    """
+    Create many folders at once and return a summary instead of printing each one.
+
+    Existing folders are found with one scandir pass per parent folder
+    rather than one stat per path. The missing ones are created level by
+    level (parents first), each level split into batches that threads
+    create in parallel.
+
+    Arguments:
+    paths - Folders to create; relative paths are taken under base_path. All must be under base_path.
+    base_path - Root of the folders (default: data_path); created if missing.
+    workers - Threads issuing mkdir calls (default: one per CPU, at most 8).
+
+    Returns a dict with requested, existing, created (including intermediate folders),
+    failed ([(path, error), ...]) and seconds.
+    """
+    base_path = pathlib.Path(os.path.normpath(base_path if base_path is not None else data_path))
+    base = os.fspath(base_path)
+    levels = []
+    targets = []
+    for path in dict.fromkeys(os.fspath(path) for path in paths):
+        relative = os.path.relpath(os.path.normpath(os.path.join(base, path)), base)
+        if relative == os.curdir or relative.split(os.sep)[0] == os.pardir:
+            raise ValueError(f"{path} is not inside {base}")
+        current = base
+        for depth, part in enumerate(relative.split(os.sep)):
+            parent, current = current, current + os.sep + part
+            if depth == len(levels):
+                levels.append({})
+            levels[depth][current] = parent
+        targets.append(current)
+    return _provision_levels(base_path, levels, list(dict.fromkeys(targets)), workers)
+
+def provision_partitions(years: Iterable[int] = (), regions: Iterable[str] = (), prefixes: Iterable[str] = ('',),
+                         to_lowercase: bool = False, remove_spaces: bool = False,
+                         base_path: pathlib.Path = None, workers: int = None) -> dict:
+    """
+    Create every <prefix><region>/<year> partition folder in bulk.
+
+    Arguments:
+    See partition_paths for the spec and provision_folders for base_path, workers and the summary returned.
+    """
+    base_path = pathlib.Path(os.path.normpath(base_path if base_path is not None else data_path))
+    base = os.fspath(base_path)
+    outer = {base + os.sep + name: base for name in _partition_names(regions, prefixes, to_lowercase, remove_spaces)}
+    years = list(dict.fromkeys(str(year) for year in years))
+    if not years:
+        return _provision_levels(base_path, [outer], list(outer), workers)
+    if not outer:
+        inner = {base + os.sep + year: base for year in years}
+        return _provision_levels(base_path, [inner], list(inner), workers)
+    inner = {folder + os.sep + year: folder for folder in outer for year in years}
+    return _provision_levels(base_path, [outer, inner], list(inner), workers)
 
 #####################################
 # Byline Function
@@ -122,7 +345,9 @@ def get_byline() -> str:
         - create_folders_for_range(start_year, end_year)
         - create_folders_from_list(folder_list, to_lowercase=False, remove_spaces=False)
         - create_prefixed_folders(folder_list, prefix)
-        - create_folders_periodically(duration_seconds, interval_seconds=5)
+        - create_folders_periodically(duration_seconds, interval_seconds=5, time_partitioned=False)
+        - create_time_partition(when=None, base_path=None)
+        - provision_partitions(years, regions, prefixes, ...)
     """
     return byline
 
@@ -145,6 +370,9 @@ def main() -> None:
     # Demonstrating folder creation with a prefix
     create_prefixed_folders(tools_used, prefix="tool-")
 
+    # Demonstrating bulk provisioning of region/year partitions
+    provision_partitions(range(2020, 2024), regions, to_lowercase=True, remove_spaces=True)
+
     # Demonstrating periodic folder creation
     create_folders_periodically(duration_seconds=15, interval_seconds=5)
 
@@ -0,0 +1,258 @@
+"""
+Module: Python With Bin - Result Store
+
+Keeps every metric the processors compute in one SQLite database
+instead of scattered results_*.txt files. Each row is keyed by dataset,
+metric and run id, so downstream jobs can query a metric's history
+directly instead of parsing text with regexes.
+
+The database runs in WAL mode, so readers never block the writer, and
+rows are buffered and written with executemany in a single transaction.
+That keeps thousands of small results cheap. The text files are still
+written by default and can be switched off (text_results in
+pipeline.json) once nothing reads them.
+"""
+
+# Standard library imports
+import math
+import pathlib
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+#####################################
+# Global Variables
+#####################################
+
+DEFAULT_DB_FILENAME: str = 'results.sqlite'
+DEFAULT_BATCH_SIZE: int = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    dataset TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    value,  -- no declared type, so integers stay integers and floats stay floats
+    text_value TEXT,
+    PRIMARY KEY (dataset, metric, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_history ON metrics (dataset, metric, recorded_at);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics (run_id);
+"""
+
+#####################################
+# Metric Conversion
+#####################################
+
+def metrics_from_result(kind: str, result) -> dict:
+    """
+    Flatten a process_*_file return value into metric name -> value.
+
+    Parameters:
+    - kind (str): 'txt', 'csv', 'json' or 'excel'.
+    - result: What the processor returned.
+
+    Returns:
+    - dict: e.g. {'words': 31374, 'unique_words': 4312} or {'Ladder score.mean': 5.47, ...}.
+    """
+    if result is None:
+        return {}
+    if kind == 'txt':
+        return {'words': result['words'], 'unique_words': result['unique_words']}
+    if kind == 'csv':
+        metrics = {}
+        for column, stats in result.items():
+            metrics[f"{column}.count"] = stats.count
+            metrics[f"{column}.mean"] = stats.mean
+            if stats.count:
+                metrics[f"{column}.min"] = stats.minimum
+                metrics[f"{column}.max"] = stats.maximum
+                metrics[f"{column}.variance"] = stats.variance
+                metrics[f"{column}.stdev"] = stats.stdev
+            for p, estimator in stats.quantiles.items():
+                metrics[f"{column}.p{p * 100:g}"] = estimator.value()
+        return metrics
+    if kind == 'json':
+        return {'values': result}
+    return {'total': result}
+
+#####################################
+# Result Store
+#####################################
+
+class ResultStore:
+    """
+    Append-only SQLite store of (dataset, metric, run_id) -> value.
+
+    Safe to share between threads: rows are buffered under a lock and
+    written in batches on one connection.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_FILENAME, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.db_path = pathlib.Path(db_path)
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending = []
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Write any buffered rows and close the database."""
+        self.flush()
+        with self._lock:
+            self._connection.close()
+
+    def start_run(self, run_id: Optional[str] = None) -> str:
+        """
+        Register a run.
+
+        Parameters:
+        - run_id (str): Id to use, e.g. the instrumentation run id; a new one if omitted.
+
+        Returns:
+        - str: The run id.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        with self._lock, self._connection:
+            self._connection.execute('INSERT OR IGNORE INTO runs (run_id, started_at) VALUES (?, ?)',
+                                     (run_id, time.time()))
+        return run_id
+
+    def add(self, run_id: str, dataset: str, metrics: dict, recorded_at: Optional[float] = None) -> None:
+        """
+        Buffer one dataset's metrics; they are written once batch_size rows are waiting.
+
+        Numbers are stored in value and anything else as text_value. NaN is stored as NULL.
+
+        Parameters:
+        - run_id (str): The run the metrics belong to.
+        - dataset (str): Dataset name or input path.
+        - metrics (dict): Metric name -> value.
+        - recorded_at (float): Unix time; now if omitted.
+        """
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        rows = []
+        for metric, value in metrics.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                rows.append((dataset, metric, run_id, recorded_at, None if math.isnan(value) else value, None))
+            else:
+                rows.append((dataset, metric, run_id, recorded_at, None, str(value)))
+        with self._lock:
+            self._pending.extend(rows)
+            ready = len(self._pending) >= self.batch_size
+        if ready:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write buffered rows in one transaction.
+
+        Returns:
+        - int: Rows written.
+        """
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if rows:
+                with self._connection:
+                    self._connection.executemany(
+                        'INSERT OR REPLACE INTO metrics (dataset, metric, run_id, recorded_at, value, text_value) '
+                        'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def history(self, dataset: str, metric: str, since: Optional[float] = None,
+                limit: Optional[int] = None) -> list:
+        """
+        Values of one metric over time, newest first.
+
+        Parameters:
+        - dataset (str): Dataset name.
+        - metric (str): Metric name, e.g. 'Ladder score.mean'.
+        - since (float): Only rows recorded at or after this Unix time.
+        - limit (int): Most rows to return.
+
+        Returns:
+        - list: (recorded_at, run_id, value) tuples.
+        """
+        self.flush()
+        query = ('SELECT recorded_at, run_id, COALESCE(value, text_value) FROM metrics '
+                 'WHERE dataset = ? AND metric = ? AND recorded_at >= ? ORDER BY recorded_at DESC')
+        parameters = [dataset, metric, since if since is not None else -math.inf]
+        if limit is not None:
+            query += ' LIMIT ?'
+            parameters.append(limit)
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
+
+    def latest(self, dataset: str) -> dict:
+        """
+        The most recent value of every metric recorded for a dataset.
+
+        Returns:
+        - dict: Metric name -> value.
+        """
+        self.flush()
+        query = ('SELECT metric, COALESCE(value, text_value) FROM metrics AS m '
+                 'WHERE dataset = ? AND recorded_at = (SELECT MAX(recorded_at) FROM metrics '
+                 'WHERE dataset = m.dataset AND metric = m.metric)')
+        with self._lock:
+            return dict(self._connection.execute(query, (dataset,)).fetchall())
+
+    def copy_latest(self, dataset: str, run_id: str, recorded_at: Optional[float] = None) -> int:
+        """
+        Record a dataset's metrics from its most recent run again under run_id.
+
+        Used when a run reuses the cached result instead of processing, so
+        run_metrics(run_id) still covers every dataset. Values are copied
+        as stored, NULLs included.
+
+        Parameters:
+        - dataset (str): Dataset name.
+        - run_id (str): The run to copy the metrics into.
+        - recorded_at (float): Unix time; now if omitted.
+
+        Returns:
+        - int: Rows copied; 0 if the dataset has no metrics yet.
+        """
+        self.flush()
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                'INSERT OR REPLACE INTO metrics (dataset, metric, run_id, recorded_at, value, text_value) '
+                'SELECT dataset, metric, ?, ?, value, text_value FROM metrics '
+                'WHERE dataset = ? AND run_id = (SELECT run_id FROM metrics WHERE dataset = ? AND run_id != ? '
+                'ORDER BY recorded_at DESC LIMIT 1)',
+                (run_id, recorded_at, dataset, dataset, run_id))
+            return cursor.rowcount
+
+    def run_metrics(self, run_id: str) -> dict:
+        """
+        Every metric recorded in one run.
+
+        Returns:
+        - dict: Dataset -> {metric: value}.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT dataset, metric, COALESCE(value, text_value) FROM metrics WHERE run_id = ? '
+                'ORDER BY dataset, metric', (run_id,)).fetchall()
+        results = {}
+        for dataset, metric, value in rows:
+            results.setdefault(dataset, {})[metric] = value
+        return results
@@ -0,0 +1,176 @@
+"""
+Module: Python With Bin - Scheduled Runs
+
+Drift-free periodic scheduler for long-running refresh loops. Tick n is
+due at start + n * interval on the monotonic clock, so the time a run
+takes (or a late wake-up) never pushes later ticks back, and wall-clock
+changes do not affect the schedule. Between ticks the loop blocks on an
+Event instead of polling, so an idle scheduler uses no CPU.
+
+The task runs on a worker thread. A tick that comes due while the
+previous run is still going is skipped rather than queued, so a slow
+run cannot pile up a backlog. Optional jitter delays each tick by a
+random amount up to `jitter` seconds, measured from its own deadline,
+so it spreads load without adding up over time.
+
+    scheduler = binware_schedule.Scheduler(task, interval=5, jitter=0.5)
+    report = scheduler.run(duration=3600)
+"""
+
+# Standard library imports
+import concurrent.futures
+import datetime
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# Local module imports
+import utils_binware
+
+#####################################
+# Scheduler Types
+#####################################
+
+@dataclass
+class Tick:
+    """One scheduled run: its number, when it was due (monotonic) and the wall-clock time it started."""
+    number: int
+    due: float
+    started: float
+    wall_time: datetime.datetime
+
+    @property
+    def lateness(self) -> float:
+        """Seconds between the deadline and the actual start (including jitter)."""
+        return self.started - self.due
+
+@dataclass
+class ScheduleReport:
+    """What a scheduler run did; lateness and run time are RunningStats in seconds."""
+    ticks: int = 0
+    runs: int = 0
+    failed: int = 0
+    skipped: int = 0
+    lateness: utils_binware.RunningStats = None
+    run_seconds: utils_binware.RunningStats = None
+
+    def __post_init__(self) -> None:
+        self.lateness = self.lateness or utils_binware.RunningStats()
+        self.run_seconds = self.run_seconds or utils_binware.RunningStats()
+
+    def format(self) -> str:
+        lines = [f"{self.ticks} ticks: {self.runs} runs, {self.failed} failed, "
+                 f"{self.skipped} skipped (previous run still going or missed)"]
+        if self.lateness.count:
+            lines.append(f"Start lateness: mean {self.lateness.mean * 1000:.1f} ms, "
+                         f"max {self.lateness.maximum * 1000:.1f} ms")
+        if self.run_seconds.count:
+            lines.append(f"Run time: mean {self.run_seconds.mean:.3f}s, max {self.run_seconds.maximum:.3f}s")
+        return '\n'.join(lines)
+
+#####################################
+# Scheduler
+#####################################
+
+class Scheduler:
+    """
+    Call a task every `interval` seconds on a fixed, drift-free schedule.
+
+    Parameters:
+    - task (callable): Called with the Tick; an exception marks the run as failed and is printed.
+    - interval (float): Seconds between deadlines.
+    - jitter (float): Maximum random delay added to each tick, below interval (default 0).
+    - clock (callable): Monotonic clock that deadlines are computed on (default: time.monotonic).
+    - wait (callable): Called with the seconds until the next tick; blocks that long on the
+      same time base as clock and returns True if the scheduler was stopped meanwhile.
+      Defaults to waiting on the stop Event in real time, so a fake clock (e.g. in a test)
+      needs a matching wait that advances it. The task still runs on a real thread, so such a
+      wait should also yield briefly, or ticks that find the last run unfinished are skipped.
+    """
+
+    def __init__(self, task: Callable[[Tick], object], interval: float, jitter: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 wait: Optional[Callable[[float], bool]] = None) -> None:
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        if not 0 <= jitter < interval:
+            raise ValueError(f"jitter must be in [0, interval), got {jitter}")
+        self.task = task
+        self.interval = interval
+        self.jitter = jitter
+        self.clock = clock
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.wait = wait or self._stop.wait
+
+    def stop(self) -> None:
+        """Stop after the current run; safe to call from another thread or the task itself."""
+        self._stop.set()
+
+    def _run_task(self, tick: Tick, report: ScheduleReport) -> None:
+        start = self.clock()
+        ok = True
+        try:
+            self.task(tick)
+        except Exception as e:
+            ok = False
+            print(f"Scheduled run {tick.number} failed: {e}")
+        with self._lock:
+            report.runs += 1
+            report.failed += not ok
+            report.run_seconds.update(self.clock() - start)
+
+    def run(self, duration: Optional[float] = None, max_ticks: Optional[int] = None) -> ScheduleReport:
+        """
+        Run the schedule until duration has passed, max_ticks ticks have come due, or stop() is called.
+
+        Ticks are due at 0, interval, 2 * interval, ... seconds from the
+        start, while they fall inside duration. Ctrl+C stops the schedule
+        and waits for the current run to finish.
+
+        Parameters:
+        - duration (float): Seconds to keep scheduling (default: no limit).
+        - max_ticks (int): Number of ticks to schedule (default: no limit).
+
+        Returns:
+        - ScheduleReport: Runs, failures, skipped ticks, start lateness and run times.
+        """
+        report = ScheduleReport()
+        self._stop.clear()
+        start = self.clock()
+        limit = max_ticks if max_ticks is not None else math.inf
+        if duration is not None:
+            limit = min(limit, math.ceil(duration / self.interval))
+        running = None
+        number = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='binware-schedule') as pool:
+            try:
+                while number < limit and not self._stop.is_set():
+                    due = start + number * self.interval
+                    fire_at = due + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+                    # Sleep until the tick is due; stop() wakes the wait early
+                    if self.wait(max(0.0, fire_at - self.clock())) or self._stop.is_set():
+                        break
+                    report.ticks += 1
+                    if running is not None and not running.done():
+                        report.skipped += 1
+                    else:
+                        now = self.clock()
+                        tick = Tick(number, due, now, datetime.datetime.now(datetime.timezone.utc))
+                        report.lateness.update(tick.lateness)
+                        running = pool.submit(self._run_task, tick, report)
+                    number += 1
+                    # A stalled loop (e.g. a suspended machine) does not fire the missed ticks in a burst
+                    behind = math.floor((self.clock() - start) / self.interval) - number
+                    if behind > 0:
+                        behind = min(behind, limit - number)
+                        report.ticks += behind
+                        report.skipped += behind
+                        number += behind
+            except KeyboardInterrupt:
+                print("Stopping the schedule after the current run...")
+                self._stop.set()
+        return report
@@ -0,0 +1,256 @@
+"""
+Module: Python With Bin - Streaming Word Counting
+
+Counts words in a text file a fixed-size chunk at a time, so memory is
+bounded by the chunk size plus one Counter entry per distinct word, not
+by the size of the file. A word cut in half at a chunk boundary is
+carried over and joined with the start of the next chunk.
+
+Words are split and lowercased exactly like text.lower().split().
+
+For very large inputs, count_words_parallel splits files into byte
+ranges that end on whitespace and counts them in a process pool.
+"""
+
+# Standard library imports
+import codecs
+import collections
+import concurrent.futures
+import heapq
+import os
+import pathlib
+from typing import Iterable, Iterator
+
+# Local module imports
+import binware_sketch
+
+#####################################
+# Global Variables
+#####################################
+
+# Characters per read; large enough that split() dominates, small enough to stay cache-friendly
+DEFAULT_CHUNK_CHARS: int = 1024 * 1024
+
+# Smallest byte range worth sending to another process
+MIN_SHARD_BYTES: int = 1024 * 1024
+SCAN_BYTES: int = 4096
+
+# Byte values str.split() treats as whitespace that are also single-byte in UTF-8
+ASCII_WHITESPACE = frozenset(b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f')
+
+#####################################
+# Word Functions
+#####################################
+
+def split_blocks(blocks: Iterable[str]) -> Iterator[list]:
+    """
+    Split a stream of text blocks into lists of lowercased words.
+
+    A block that ends mid-word leaves its last word to be joined with
+    the start of the next block.
+
+    Parameters:
+    - blocks (iterable): Consecutive pieces of one text.
+
+    Yields:
+    - list: The complete words found in one block.
+    """
+    carry = ''
+    for block in blocks:
+        if not block:
+            continue
+        text = carry + block
+        words = text.split()
+        carry = words.pop() if words and not text[-1].isspace() else ''
+        if words:
+            yield [word.lower() for word in words]
+    if carry:
+        yield [carry.lower()]
+
+def iter_word_batches(file_path: pathlib.Path, chunk_size: int = DEFAULT_CHUNK_CHARS) -> Iterator[list]:
+    """
+    Yield lists of lowercased words, one list per chunk of the file.
+
+    Parameters:
+    - file_path (pathlib.Path): The text file to read.
+    - chunk_size (int): Characters to read per chunk.
+
+    Yields:
+    - list: The complete words found in one chunk.
+    """
+    with pathlib.Path(file_path).open('r', encoding='utf-8') as file:
+        yield from split_blocks(iter(lambda: file.read(chunk_size), ''))
+
+def count_words(file_path: pathlib.Path, chunk_size: int = DEFAULT_CHUNK_CHARS) -> collections.Counter:
+    """
+    Count every distinct lowercased word in a file in one streaming pass.
+
+    Parameters:
+    - file_path (pathlib.Path): The text file to read.
+    - chunk_size (int): Characters to read per chunk.
+
+    Returns:
+    - collections.Counter: Word -> occurrences. Its total() is the word count.
+    """
+    counts = collections.Counter()
+    for words in iter_word_batches(file_path, chunk_size):
+        counts.update(words)
+    return counts
+
+def top_words(counts: collections.Counter, n: int) -> list:
+    """
+    Return the n most frequent words using a bounded heap of size n.
+
+    Ties are broken alphabetically so the output is stable between runs.
+
+    Parameters:
+    - counts (collections.Counter): Word counts.
+    - n (int): How many words to return.
+
+    Returns:
+    - list: (word, count) pairs, most frequent first.
+    """
+    return heapq.nsmallest(n, counts.items(), key=lambda item: (-item[1], item[0]))
+
+def sketch_words(file_path: pathlib.Path, precision: int = binware_sketch.DEFAULT_PRECISION,
+                 chunk_size: int = DEFAULT_CHUNK_CHARS) -> tuple:
+    """
+    Count words exactly but distinct words approximately, in a few KB of memory.
+
+    Parameters:
+    - file_path (pathlib.Path): The text file to read.
+    - precision (int): HyperLogLog precision; 2**precision registers.
+    - chunk_size (int): Characters to read per chunk.
+
+    Returns:
+    - tuple: (total words, HyperLogLog sketch of the distinct words).
+    """
+    total = 0
+    sketch = binware_sketch.HyperLogLog(precision)
+    for words in iter_word_batches(file_path, chunk_size):
+        total += len(words)
+        sketch.update(words)
+    return total, sketch
+
+def summarize_counts(counts: collections.Counter) -> tuple:
+    """Return (total words, unique words) for a Counter."""
+    return sum(counts.values()), len(counts)
+
+#####################################
+# Parallel Word Counting
+#####################################
+
+def find_text_files(path: pathlib.Path, pattern: str = '*.txt') -> list:
+    """Return [path] for a file, or the sorted files matching pattern for a directory."""
+    path = pathlib.Path(path)
+    if path.is_dir():
+        return sorted(child for child in path.glob(pattern) if child.is_file())
+    return [path]
+
+def split_ranges(file_path: pathlib.Path, shard_bytes: int) -> list:
+    """
+    Cut a file into byte ranges of roughly shard_bytes that end on ASCII whitespace.
+
+    An ASCII whitespace byte can never sit inside a UTF-8 character or a
+    word, so every range decodes cleanly and no word spans two ranges.
+
+    Parameters:
+    - file_path (pathlib.Path): The file to split.
+    - shard_bytes (int): Target size of each range.
+
+    Returns:
+    - list: (start, end) byte offsets covering the whole file.
+    """
+    size = pathlib.Path(file_path).stat().st_size
+    ranges = []
+    start = 0
+    with pathlib.Path(file_path).open('rb') as file:
+        while start < size:
+            end = min(start + shard_bytes, size)
+            if end < size:
+                file.seek(end)
+                # Walk forward to the next whitespace byte; the range absorbs the word in between
+                while True:
+                    block = file.read(SCAN_BYTES)
+                    if not block:
+                        end = size
+                        break
+                    cut = next((i for i, byte in enumerate(block) if byte in ASCII_WHITESPACE), None)
+                    if cut is not None:
+                        end += cut
+                        break
+                    end += len(block)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def count_range(file_path: pathlib.Path, start: int, end: int,
+                chunk_size: int = DEFAULT_CHUNK_CHARS) -> collections.Counter:
+    """
+    Count the words in one byte range of a file.
+
+    Parameters:
+    - file_path (pathlib.Path): The text file to read.
+    - start (int): First byte of the range.
+    - end (int): Byte just past the range.
+    - chunk_size (int): Bytes to read per chunk.
+
+    Returns:
+    - collections.Counter: Word -> occurrences within the range.
+    """
+    def blocks():
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        remaining = end - start
+        with pathlib.Path(file_path).open('rb') as file:
+            file.seek(start)
+            while remaining > 0:
+                data = file.read(min(chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield decoder.decode(data)
+        yield decoder.decode(b'', final=True)
+
+    counts = collections.Counter()
+    for words in split_blocks(blocks()):
+        counts.update(words)
+    return counts
+
+def _count_range_job(job: tuple) -> collections.Counter:
+    return count_range(*job)
+
+def count_words_parallel(path: pathlib.Path, workers: int = None, shard_bytes: int = None,
+                         pattern: str = '*.txt') -> collections.Counter:
+    """
+    Count words in a file or a directory of files with a pool of processes.
+
+    Files are cut into whitespace-aligned byte ranges, each worker counts
+    its ranges, and the partial Counters are merged. The result is the
+    same as count_words over every file.
+
+    Parameters:
+    - path (pathlib.Path): A text file, or a directory of them.
+    - workers (int): Number of processes; defaults to os.cpu_count().
+    - shard_bytes (int): Target bytes per range; by default the data is cut
+      into about four ranges per worker.
+    - pattern (str): Glob used to pick files when path is a directory.
+
+    Returns:
+    - collections.Counter: Word -> occurrences across everything counted.
+    """
+    workers = workers or os.cpu_count() or 1
+    files = find_text_files(path, pattern)
+    if shard_bytes is None:
+        total_bytes = sum(file_path.stat().st_size for file_path in files)
+        shard_bytes = max(MIN_SHARD_BYTES, total_bytes // (workers * 4) + 1)
+    jobs = [(file_path, start, end) for file_path in files
+            for start, end in split_ranges(file_path, shard_bytes)]
+    counts = collections.Counter()
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            counts.update(_count_range_job(job))
+        return counts
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_count_range_job, jobs):
+            counts.update(partial)
+    return counts
@@ -0,0 +1,254 @@
+"""
+Module: Python With Bin - Atomic File Writes
+
+Shared write path for the write_*_file functions, the streamed downloads
+and the results files. Every file is written to a temp file in its
+target folder and renamed over the target only once it is complete, so
+a crash or an exception mid-write leaves the previous file (or no file)
+behind, never a truncated one that a later process_* step misreads.
+
+How much is flushed to disk is set with configure(sync=...):
+
+- 'batch' (the default): outside a batch, each file is fsynced before the
+  rename and its folder after. Inside sync_batch() (a pipeline run),
+  files are renamed into place right away, so later stages can read
+  them, and are fsynced together when the batch ends, each folder once.
+- 'file': fsync every file and folder as it is written, even in a batch.
+- 'none': atomic renames only; the OS flushes when it likes.
+
+Folders are created once per process and then remembered, so writing
+many files into the same folder does not repeat the mkdir calls.
+"""
+
+# Standard library imports
+import concurrent.futures
+import contextlib
+import itertools
+import os
+import pathlib
+import shutil
+import threading
+from typing import Union
+
+#####################################
+# Global Variables
+#####################################
+
+SYNC_MODES = ('batch', 'file', 'none')
+
+# Temp files are created like open(path, 'w') would (mode 0o666 less the umask), but must not exist yet
+TEMP_FLAGS: int = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+# Threads issuing the fsync calls when a batch ends
+SYNC_WORKERS: int = 8
+
+_settings = {'sync': 'batch'}
+_lock = threading.Lock()
+_created_folders: set = set()
+_temp_ids = itertools.count()
+# Files renamed into place during the current batch, and how many batches are open
+_batch = {'depth': 0, 'files': {}}
+
+#####################################
+# Configuration
+#####################################
+
+def configure(sync: str = 'batch') -> None:
+    """
+    Choose how written files are flushed to disk.
+
+    Parameters:
+    - sync (str): 'batch', 'file' or 'none' (see the module docstring).
+    """
+    if sync not in SYNC_MODES:
+        raise ValueError(f"Unknown sync mode '{sync}', expected one of {SYNC_MODES}")
+    _settings['sync'] = sync
+
+def ensure_folder(folder: Union[str, pathlib.Path]) -> None:
+    """Create a folder (and its parents) unless this process already did."""
+    key = os.fspath(folder)
+    if key in _created_folders:
+        return
+    os.makedirs(key, exist_ok=True)
+    with _lock:
+        _created_folders.add(key)
+
+def forget_folders() -> None:
+    """Clear the remembered folders, e.g. after deleting them."""
+    with _lock:
+        _created_folders.clear()
+
+#####################################
+# Syncing
+#####################################
+
+def _fsync_path(path: str, directory: bool = False) -> None:
+    fd = os.open(path, os.O_RDONLY | (getattr(os, 'O_DIRECTORY', 0) if directory else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _fsync_file(path: str) -> None:
+    # A file replaced or removed later in the batch has nothing left to sync
+    try:
+        _fsync_path(path)
+    except FileNotFoundError:
+        pass
+
+def _fsync_folder(folder: str) -> None:
+    # Windows cannot open or fsync a directory; the rename is already durable there
+    if os.name != 'nt':
+        _fsync_path(folder, directory=True)
+
+def sync_mode() -> str:
+    """Return the current sync mode."""
+    return _settings['sync']
+
+def sync_files(paths) -> int:
+    """
+    Fsync a set of files, then each of their folders once, with SYNC_WORKERS threads.
+
+    Used at the end of a batch, and by binware_batch for the results its
+    worker processes wrote without syncing.
+
+    Returns:
+    - int: The number of files synced.
+    """
+    files = list(dict.fromkeys(os.path.abspath(os.fspath(path)) for path in paths))
+    if not files:
+        return 0
+    folders = list(dict.fromkeys(os.path.dirname(path) for path in files))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SYNC_WORKERS) as pool:
+        # list() so an error in any fsync is raised here
+        list(pool.map(_fsync_file, files))
+        list(pool.map(_fsync_folder, folders))
+    return len(files)
+
+def flush_batch() -> int:
+    """
+    Fsync every file renamed into place since the batch started.
+
+    Returns:
+    - int: The number of files synced.
+    """
+    with _lock:
+        files = list(_batch['files'])
+        _batch['files'] = {}
+    return sync_files(files)
+
+@contextlib.contextmanager
+def sync_batch():
+    """
+    Defer fsyncs to the end of a run (in 'batch' mode); nested batches flush with the outermost one.
+
+    Files written by other threads while the batch is open are included.
+
+    Usage:
+        with binware_write.sync_batch():
+            ...write many files...
+    """
+    with _lock:
+        _batch['depth'] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _batch['depth'] -= 1
+            outermost = _batch['depth'] == 0
+        if outermost:
+            flush_batch()
+
+#####################################
+# Atomic Writes
+#####################################
+
+@contextlib.contextmanager
+def atomic_open(file_path: Union[str, pathlib.Path], mode: str = 'w', encoding: str = 'utf-8',
+                newline: str = None):
+    """
+    Open a temp file next to file_path and rename it over file_path when the block succeeds.
+
+    If the block raises, the temp file is removed and file_path is left as it was.
+
+    Parameters:
+    - file_path (str or pathlib.Path): Where the finished file should end up.
+    - mode (str): 'w' for text or 'wb' for bytes.
+    - encoding (str): Text encoding (text mode only).
+    - newline (str): Passed to open() (text mode only).
+
+    Yields:
+    - file: The open temp file.
+    """
+    if mode not in ('w', 'wb'):
+        raise ValueError(f"atomic_open supports 'w' and 'wb', got '{mode}'")
+    path = os.path.abspath(os.fspath(file_path))
+    folder, name = os.path.split(path)
+    ensure_folder(folder)
+    # Unique per process, thread and call, so concurrent writers never share a temp file
+    temp_name = os.path.join(folder, f".{name}.{os.getpid()}.{threading.get_ident()}.{next(_temp_ids)}.part")
+    try:
+        fd = os.open(temp_name, TEMP_FLAGS, 0o666)
+    except FileNotFoundError:
+        # The folder was removed since it was remembered
+        with _lock:
+            _created_folders.discard(folder)
+        ensure_folder(folder)
+        fd = os.open(temp_name, TEMP_FLAGS, 0o666)
+    sync = _settings['sync']
+    if sync == 'batch' and not _batch['depth']:
+        sync = 'file'
+    try:
+        if mode == 'wb':
+            file = os.fdopen(fd, 'wb')
+        else:
+            file = os.fdopen(fd, 'w', encoding=encoding, newline=newline)
+        with file:
+            yield file
+            if sync == 'file':
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        pathlib.Path(temp_name).unlink(missing_ok=True)
+        raise
+    if sync == 'file':
+        _fsync_folder(folder)
+    elif sync == 'batch':
+        with _lock:
+            _batch['files'][path] = None
+
+def write_atomic(file_path: Union[str, pathlib.Path], data: Union[str, bytes], encoding: str = 'utf-8') -> None:
+    """
+    Write a whole str or bytes payload to file_path atomically.
+
+    Parameters:
+    - file_path (str or pathlib.Path): Where to write.
+    - data (str or bytes): The payload; str is written in text mode, bytes as is.
+    - encoding (str): Encoding for str payloads.
+    """
+    with atomic_open(file_path, 'wb' if isinstance(data, bytes) else 'w', encoding) as file:
+        file.write(data)
+
+def link_or_copy(source: Union[str, pathlib.Path], destination: Union[str, pathlib.Path]) -> None:
+    """
+    Hard-link source to destination, replacing destination; copy it when linking is not possible.
+
+    A snapshot linked this way keeps its content when source is later
+    rewritten through atomic_open, which replaces the file instead of
+    changing it in place.
+    """
+    destination = os.path.abspath(os.fspath(destination))
+    folder, name = os.path.split(destination)
+    ensure_folder(folder)
+    temp_name = os.path.join(folder, f".{name}.{os.getpid()}.{threading.get_ident()}.{next(_temp_ids)}.part")
+    try:
+        os.link(source, temp_name)
+    except OSError:
+        # Another filesystem, or one without hard links
+        shutil.copy2(source, temp_name)
+    try:
+        os.replace(temp_name, destination)
+    except BaseException:
+        pathlib.Path(temp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,128 @@
+"""
+Shared fixtures for the test suite: the repository root on sys.path and
+a scriptable HTTP stub server on localhost.
+"""
+
+# Standard library imports
+import http.server
+import pathlib
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+#####################################
+# Stub Server
+#####################################
+
+class StubResponse:
+    """
+    One scripted answer: status, headers and body, optionally after a delay.
+
+    With drop=True the connection is closed without any answer.
+    """
+
+    def __init__(self, status: int = 200, body: bytes = b'', headers: dict = None,
+                 delay: float = 0.0, drop: bool = False) -> None:
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.delay = delay
+        self.drop = drop
+
+class StubServer:
+    """
+    HTTP server whose answers are scripted per path.
+
+    script(path, *responses) queues answers; the last one repeats. A
+    route(path, function) answers with function(headers) -> StubResponse
+    instead, e.g. to honor If-None-Match. Every request is logged as
+    (path, headers).
+    """
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._scripts = {}
+        self._routes = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                server._handle(self)
+
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, path: str) -> str:
+        return self.base + path
+
+    def script(self, path: str, *responses: StubResponse) -> None:
+        with self._lock:
+            self._scripts[path] = list(responses)
+
+    def route(self, path: str, function) -> None:
+        with self._lock:
+            self._routes[path] = function
+
+    def count(self, path: str) -> int:
+        with self._lock:
+            return sum(1 for logged, _ in self.requests if logged == path)
+
+    def _next_response(self, path: str, headers: dict) -> StubResponse:
+        with self._lock:
+            self.requests.append((path, headers))
+            if path in self._routes:
+                return self._routes[path](headers)
+            queue = self._scripts.get(path)
+            if not queue:
+                return StubResponse(404, b'not found')
+            return queue.pop(0) if len(queue) > 1 else queue[0]
+
+    def _handle(self, handler: http.server.BaseHTTPRequestHandler) -> None:
+        response = self._next_response(handler.path, dict(handler.headers))
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if response.delay:
+                time.sleep(response.delay)
+            if response.drop:
+                handler.close_connection = True
+                handler.connection.shutdown(2)
+                return
+            handler.send_response(response.status)
+            for name, value in response.headers.items():
+                handler.send_header(name, value)
+            body = b'' if response.status == 304 else response.body
+            handler.send_header('Content-Length', str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
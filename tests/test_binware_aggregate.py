@@ -0,0 +1,73 @@
+"""
+Tests for binware_aggregate: single-pass CSV column statistics and the
+P-squared quantile estimates.
+"""
+
+# Standard library imports
+import math
+import random
+import statistics
+
+import pytest
+
+import binware_aggregate
+
+#####################################
+# Helpers
+#####################################
+
+def write_csv(tmp_path, values: list, column: str = 'Ladder score'):
+    file_path = tmp_path / 'data.csv'
+    lines = ['Country name,' + column] + [f"C{index},{value}" for index, value in enumerate(values)]
+    file_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return file_path
+
+#####################################
+# Aggregation Tests
+#####################################
+
+def test_aggregate_matches_statistics(tmp_path):
+    values = [round(random.Random(3).uniform(2, 8) + index / 1000, 3) for index in range(2000)]
+    stats = binware_aggregate.aggregate_csv(write_csv(tmp_path, values), ['Ladder score'],
+                                            quantiles=[0.5])['Ladder score']
+    assert stats.count == len(values)
+    assert stats.mean == statistics.mean(values)
+    assert stats.stdev == pytest.approx(statistics.stdev(values))
+    assert stats.quantiles[0.5].value() == pytest.approx(statistics.median(values), abs=0.05)
+
+def test_blank_cells_and_missing_columns(tmp_path):
+    stats = binware_aggregate.aggregate_csv(write_csv(tmp_path, [1, '', 3]), ['Ladder score', 'Missing'])
+    assert stats['Ladder score'].count == 2
+    assert stats['Missing'].count == 0
+
+def test_non_numeric_cell_raises(tmp_path):
+    with pytest.raises(ValueError):
+        binware_aggregate.aggregate_csv(write_csv(tmp_path, [1, 'abc']), ['Ladder score'])
+
+def test_nan_and_inf_cells(tmp_path):
+    values = [7.5, 'nan', 6, 5, 4, 3, 'inf', 2]
+    stats = binware_aggregate.aggregate_csv(write_csv(tmp_path, values), ['Ladder score'],
+                                            quantiles=[0.5])['Ladder score']
+    assert stats.count == len(values)
+    assert math.isnan(stats.mean)
+    assert stats.maximum == math.inf
+    # The median estimate ignores the NaN and stays a finite value
+    assert 3 <= stats.quantiles[0.5].value() <= 7.5
+
+def test_infinite_cell_makes_mean_infinite(tmp_path):
+    stats = binware_aggregate.aggregate_csv(write_csv(tmp_path, [1, 2, '-inf']), ['Ladder score'])
+    assert stats['Ladder score'].mean == -math.inf
+
+#####################################
+# Quantile Tests
+#####################################
+
+def test_p2_quantile_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        binware_aggregate.P2Quantile(1.0)
+
+def test_p2_quantile_skips_nan():
+    estimator = binware_aggregate.P2Quantile(0.5)
+    for value in [math.nan, 1, 2, math.nan, 3]:
+        estimator.update(value)
+    assert estimator.value() == 2
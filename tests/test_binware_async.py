@@ -0,0 +1,70 @@
+"""
+Tests for binware_async.arefresh_datasets against a stub server.
+"""
+
+# Standard library imports
+import asyncio
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import binware_async
+import binware_pipeline
+from conftest import StubResponse
+
+#####################################
+# Helpers
+#####################################
+
+CSV_BODY = b'Country name,Ladder score\nA,7.5\nB,6.5\n'
+
+def dataset(stub_server, tmp_path, name: str, kind: str, filename: str, **extra) -> binware_pipeline.Dataset:
+    return binware_pipeline.Dataset(name, kind, stub_server.url(f'/{name}'), str(tmp_path / f'data-{kind}'),
+                                    filename, **extra)
+
+def refresh(datasets: list) -> dict:
+    timings = asyncio.run(binware_async.arefresh_datasets(datasets, concurrency=4))
+    return {timing.dataset: timing for timing in timings}
+
+#####################################
+# Refresh Tests
+#####################################
+
+def test_refresh_writes_and_processes(stub_server, tmp_path):
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY))
+    timings = refresh([dataset(stub_server, tmp_path, 'happiness', 'csv', 'data.csv')])
+    assert timings['happiness'].ok
+    assert (tmp_path / 'data-csv' / 'data.csv').read_bytes() == CSV_BODY
+    assert (tmp_path / 'data-csv' / 'results_csv.txt').exists()
+
+def test_failed_processor_fails_the_dataset(stub_server, tmp_path):
+    stub_server.script('/cattle', StubResponse(200, b'not an excel file'))
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY))
+    timings = refresh([dataset(stub_server, tmp_path, 'cattle', 'excel', 'data.xls'),
+                       dataset(stub_server, tmp_path, 'happiness', 'csv', 'data.csv', depends_on=('cattle',))])
+    assert not timings['cattle'].ok
+    assert timings['cattle'].detail == 'processor failed'
+    assert timings['happiness'].stage == 'skipped'
+
+def test_http_error_fails_the_dataset(stub_server, tmp_path):
+    stub_server.script('/gone', StubResponse(404))
+    timings = refresh([dataset(stub_server, tmp_path, 'gone', 'txt', 'data.txt')])
+    assert not timings['gone'].ok
+    assert '404' in timings['gone'].detail
+
+#####################################
+# Process Function Tests
+#####################################
+
+def test_process_functions_return_the_result(tmp_path):
+    (tmp_path / 'data.csv').write_bytes(CSV_BODY)
+    (tmp_path / 'data.json').write_text('{"people": [{"name": "A"}, {"name": "B"}]}', encoding='utf-8')
+    stats = asyncio.run(binware_async.aprocess_csv_file(str(tmp_path), 'data.csv', None))
+    assert stats['Ladder score'].mean == 7.0
+    assert asyncio.run(binware_async.aprocess_json_file(str(tmp_path), 'data.json', None)) == 2
+
+def test_process_function_failure_returns_none(tmp_path):
+    (tmp_path / 'data.xls').write_bytes(b'not an excel file')
+    assert asyncio.run(binware_async.aprocess_excel_file(str(tmp_path), 'data.xls', None)) is None
+    assert asyncio.run(binware_async.aprocess_txt_file(str(tmp_path), 'missing.txt', None)) is None
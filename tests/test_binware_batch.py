@@ -0,0 +1,88 @@
+"""
+Tests for binware_batch.run_batch: failures do not stop the batch, and the
+roll-up equals the per-file results merged serially.
+"""
+
+# Standard library imports
+import statistics
+
+import pytest
+
+import binware_aggregate
+import binware_batch
+import binware_sketch
+import binware_text
+
+#####################################
+# Helpers
+#####################################
+
+TEXTS = {
+    'a.txt': "the quick brown fox jumps over the lazy dog\n" * 3,
+    'b.txt': "The dog sleeps. A fox runs; the end\n",
+    'c.txt': "",
+}
+
+CSVS = {
+    'one.csv': 'Country name,Ladder score,Generosity\nA,7.5,0.1\nB,6.25,\nC,5.125,0.3\n',
+    'two.csv': 'Country name,Ladder score,Generosity\nD,4.0,0.2\nE,,0.4\n',
+}
+
+@pytest.fixture
+def batch_folder(tmp_path):
+    folder = tmp_path / 'inputs'
+    folder.mkdir()
+    for name, text in {**TEXTS, **CSVS}.items():
+        (folder / name).write_text(text, encoding='utf-8')
+    return folder
+
+#####################################
+# Batch Tests
+#####################################
+
+def test_bad_file_does_not_abort_the_batch(batch_folder, tmp_path):
+    (batch_folder / 'broken.xls').write_bytes(b'not an excel file')
+    (batch_folder / 'broken.csv').write_text('Country name,Ladder score\nA,high\n', encoding='utf-8')
+    (batch_folder / 'broken.json').write_text('{"people": [', encoding='utf-8')
+    output = tmp_path / 'results'
+
+    results, totals = binware_batch.run_batch(str(batch_folder), str(output), workers=2)
+
+    failed = sorted(result.input_path.rsplit('/', 1)[-1] for result in results if not result.ok)
+    assert failed == ['broken.csv', 'broken.json', 'broken.xls']
+    assert all(result.error for result in results if not result.ok)
+    assert sum(result.ok for result in results) == len(TEXTS) + len(CSVS)
+    assert totals['csv'] == {**totals['csv'], 'files': 2, 'failed': 1}
+    assert (totals['excel']['files'], totals['excel']['failed']) == (0, 1)
+    assert (output / 'results_a.txt.txt').exists()
+    assert 'EXCEL files processed: 0 (1 failed)' in (output / binware_batch.DEFAULT_ROLLUP_FILENAME).read_text(
+        encoding='utf-8')
+
+def test_rollup_equals_serial_merge(batch_folder, tmp_path):
+    results, totals = binware_batch.run_batch(str(batch_folder), str(tmp_path / 'results'), workers=2,
+                                              text_results=False)
+    assert all(result.ok for result in results)
+
+    # Text: words add up and the merged sketch equals the serially merged per-file sketches
+    sketch = binware_sketch.HyperLogLog()
+    words = 0
+    for name in TEXTS:
+        counts = binware_text.count_words(batch_folder / name)
+        words += sum(counts.values())
+        file_sketch = binware_sketch.HyperLogLog()
+        file_sketch.update(counts)
+        sketch.merge(file_sketch)
+    assert totals['txt']['words'] == words
+    assert totals['txt']['sketch'].registers == sketch.registers
+
+    # CSV: per-file ColumnStats merged in order, and the exact mean over all rows
+    columns = ('Ladder score',)
+    merged = None
+    for name in sorted(CSVS):
+        stats = binware_aggregate.aggregate_csv(batch_folder / name, columns)['Ladder score']
+        merged = stats if merged is None else merged.merge(stats)
+    rolled = totals['csv']['columns']['Ladder score']
+    assert (rolled.count, rolled.mean, rolled.minimum, rolled.maximum) == \
+        (merged.count, merged.mean, merged.minimum, merged.maximum)
+    assert rolled.variance == pytest.approx(merged.variance)
+    assert rolled.mean == statistics.mean([7.5, 6.25, 5.125, 4.0])
@@ -0,0 +1,197 @@
+"""
+Tests for binware_cache.HttpCache and the conditional GETs fetch_all
+makes with it: 304 reuse, unchanged content, failed writes, TTL and
+LRU eviction.
+"""
+
+# Standard library imports
+import pathlib
+
+import binware_cache
+import binware_fetch
+from conftest import StubResponse
+
+#####################################
+# Helpers
+#####################################
+
+class Handler:
+    """fetch_all handler that saves the body and counts its calls; ok=False simulates a failed write."""
+
+    def __init__(self, ok: bool = True) -> None:
+        self.ok = ok
+        self.calls = 0
+
+    def __call__(self, job: binware_fetch.FetchJob, response) -> bool:
+        self.calls += 1
+        if not self.ok:
+            return False
+        file_path = pathlib.Path(job.folder_name) / job.filename
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(response.content)
+        return True
+
+def etag_route(state: dict):
+    """Answer state['body'] with ETag state['etag'], or 304 when If-None-Match matches it."""
+    def answer(headers: dict) -> StubResponse:
+        if headers.get('If-None-Match') == state['etag']:
+            return StubResponse(304, headers={'ETag': state['etag']})
+        return StubResponse(200, state['body'], headers={'ETag': state['etag']})
+    return answer
+
+def fetch_one(stub_server, cache, handler, folder: pathlib.Path, path: str = '/data'):
+    job = binware_fetch.make_job(stub_server.url(path), str(folder), 'data.txt', 'txt')
+    [result] = binware_fetch.fetch_all([job], handler, cache=cache)
+    return result
+
+def record(cache, url: str, file_path: pathlib.Path, size: int = 10) -> None:
+    file_path.write_bytes(b'x' * size)
+    cache.record(url, {'ETag': '"v1"'}, file_path, binware_cache.sha256_bytes(b'x' * size), size)
+
+#####################################
+# Conditional GET Tests
+#####################################
+
+def test_304_reuses_local_copy(stub_server, tmp_path):
+    stub_server.route('/data', etag_route({'etag': '"v1"', 'body': b'hello'}))
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    handler = Handler()
+
+    first = fetch_one(stub_server, cache, handler, tmp_path)
+    second = fetch_one(stub_server, cache, handler, tmp_path)
+
+    assert first.ok and first.changed and first.status_code == 200
+    assert second.ok and not second.changed and second.status_code == 304
+    assert handler.calls == 1
+    assert stub_server.requests[1][1].get('If-None-Match') == '"v1"'
+    assert (tmp_path / 'data.txt').read_bytes() == b'hello'
+
+def test_last_modified_is_sent_back(stub_server, tmp_path):
+    stamp = 'Wed, 21 Oct 2026 07:28:00 GMT'
+    stub_server.script('/data', StubResponse(200, b'hello', headers={'Last-Modified': stamp}))
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    fetch_one(stub_server, cache, Handler(), tmp_path)
+    fetch_one(stub_server, cache, Handler(), tmp_path)
+    assert stub_server.requests[1][1].get('If-Modified-Since') == stamp
+
+def test_identical_200_is_not_changed(stub_server, tmp_path):
+    # An upstream that ignores the validators but sends the same bytes
+    stub_server.script('/data', StubResponse(200, b'same', headers={'ETag': '"v1"'}))
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    handler = Handler()
+
+    fetch_one(stub_server, cache, handler, tmp_path)
+    second = fetch_one(stub_server, cache, handler, tmp_path)
+
+    assert second.ok and second.status_code == 200
+    assert not second.changed
+    assert handler.calls == 1
+
+def test_changed_content_is_rewritten(stub_server, tmp_path):
+    state = {'etag': '"v1"', 'body': b'old'}
+    stub_server.route('/data', etag_route(state))
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    fetch_one(stub_server, cache, Handler(), tmp_path)
+
+    state.update(etag='"v2"', body=b'new')
+    second = fetch_one(stub_server, cache, Handler(), tmp_path)
+
+    assert second.changed
+    assert (tmp_path / 'data.txt').read_bytes() == b'new'
+    assert cache.get(stub_server.url('/data'))['etag'] == '"v2"'
+
+def test_failed_write_leaves_cache_unchanged(stub_server, tmp_path):
+    state = {'etag': '"v1"', 'body': b'old'}
+    stub_server.route('/data', etag_route(state))
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    url = stub_server.url('/data')
+    fetch_one(stub_server, cache, Handler(), tmp_path)
+    before = cache.get(url)
+
+    state.update(etag='"v2"', body=b'new')
+    failed = fetch_one(stub_server, cache, Handler(ok=False), tmp_path)
+    assert not failed.ok
+    assert cache.get(url) == before
+
+    # The next run still asks with the old validator and gets the new body
+    retried = fetch_one(stub_server, cache, Handler(), tmp_path)
+    assert stub_server.requests[-1][1].get('If-None-Match') == '"v1"'
+    assert retried.ok and retried.changed
+    assert (tmp_path / 'data.txt').read_bytes() == b'new'
+
+def test_failed_first_write_records_nothing(stub_server, tmp_path):
+    stub_server.route('/data', etag_route({'etag': '"v1"', 'body': b'hello'}))
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    result = fetch_one(stub_server, cache, Handler(ok=False), tmp_path)
+    assert not result.ok
+    assert cache.get(stub_server.url('/data')) is None
+
+#####################################
+# Index Tests
+#####################################
+
+def test_conditional_headers_need_the_local_copy(tmp_path):
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    file_path = tmp_path / 'data.txt'
+    record(cache, 'http://example.com/data', file_path)
+
+    assert cache.conditional_headers('http://example.com/data', file_path) == {'If-None-Match': '"v1"'}
+    # Same URL saved somewhere else: a 304 would leave nothing there
+    assert cache.conditional_headers('http://example.com/data', tmp_path / 'other.txt') == {}
+    file_path.unlink()
+    assert cache.conditional_headers('http://example.com/data', file_path) == {}
+    assert cache.conditional_headers('http://example.com/unknown', file_path) == {}
+
+def test_save_and_load_round_trip(tmp_path):
+    cache = binware_cache.HttpCache(tmp_path / 'index.json')
+    record(cache, 'http://example.com/data', tmp_path / 'data.txt')
+    cache.save()
+    assert binware_cache.HttpCache(tmp_path / 'index.json').get('http://example.com/data') == \
+        cache.get('http://example.com/data')
+
+def test_corrupt_index_starts_empty(tmp_path):
+    (tmp_path / 'index.json').write_text('{not json', encoding='utf-8')
+    assert binware_cache.HttpCache(tmp_path / 'index.json').get('http://example.com/data') is None
+
+#####################################
+# Eviction Tests
+#####################################
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    clock = {'now': 1000.0}
+    monkeypatch.setattr(binware_cache.time, 'time', lambda: clock['now'])
+    cache = binware_cache.HttpCache(tmp_path / 'index.json', ttl_seconds=60)
+    file_path = tmp_path / 'data.txt'
+    record(cache, 'http://example.com/data', file_path)
+
+    clock['now'] += 61
+    assert cache.conditional_headers('http://example.com/data', file_path) == {}
+    assert cache.evict() == 1
+    assert cache.get('http://example.com/data') is None
+
+def test_touch_extends_ttl(tmp_path, monkeypatch):
+    clock = {'now': 1000.0}
+    monkeypatch.setattr(binware_cache.time, 'time', lambda: clock['now'])
+    cache = binware_cache.HttpCache(tmp_path / 'index.json', ttl_seconds=60)
+    record(cache, 'http://example.com/data', tmp_path / 'data.txt')
+
+    clock['now'] += 50
+    cache.touch('http://example.com/data')
+    clock['now'] += 50
+    assert cache.evict() == 0
+
+def test_lru_eviction_over_max_bytes(tmp_path, monkeypatch):
+    clock = {'now': 1000.0}
+    monkeypatch.setattr(binware_cache.time, 'time', lambda: clock['now'])
+    cache = binware_cache.HttpCache(tmp_path / 'index.json', max_bytes=25)
+    for name in ('a', 'b', 'c'):
+        record(cache, f'http://example.com/{name}', tmp_path / f'{name}.txt', size=10)
+        clock['now'] += 1
+    # 'a' was revalidated last, so 'b' is now the least recently used
+    cache.touch('http://example.com/a')
+
+    assert cache.evict() == 1
+    assert cache.get('http://example.com/b') is None
+    assert cache.get('http://example.com/a') and cache.get('http://example.com/c')
+    # Eviction only forgets validators, the files stay on disk
+    assert (tmp_path / 'b.txt').exists()
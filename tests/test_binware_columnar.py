@@ -0,0 +1,122 @@
+"""
+Tests for the binware_columnar summaries and group-by means, compared with
+the default streaming path of process_csv_file.
+"""
+
+# Standard library imports
+import csv
+import math
+import pathlib
+import shutil
+import statistics
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import binware_analytics
+import binware_columnar
+
+#####################################
+# Helpers
+#####################################
+
+DATA_CSV = pathlib.Path(__file__).resolve().parent.parent / 'data-csv' / 'data.csv'
+
+COLUMNS = ('Ladder score', 'Generosity', 'Perceptions of corruption', 'Healthy life expectancy')
+
+NON_FINITE_CSV = ('group,a,b,c,d\n'
+                  'x,1.5,1,nan,inf\n'
+                  'y,,2,2,-inf\n'
+                  'x,2,inf,,1\n'
+                  'y,2,3,4,\n')
+
+def process(folder: pathlib.Path, columns: tuple, **options) -> dict:
+    return binware_analytics.process_csv_file(str(folder), 'data.csv', None, columns=columns, **options)
+
+def same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+def assert_matches_default(streamed: dict, summaries: dict) -> None:
+    for column, expected in streamed.items():
+        actual = summaries[column]
+        assert actual.count == expected.count, column
+        assert same(actual.mean, expected.mean), (column, actual.mean, expected.mean)
+        assert actual.minimum == expected.minimum and actual.maximum == expected.maximum, column
+        if math.isnan(expected.variance):
+            assert math.isnan(actual.variance), column
+        else:
+            assert actual.variance == pytest.approx(expected.variance, rel=1e-9), column
+
+#####################################
+# Summary Tests
+#####################################
+
+def test_summary_matches_default_path(tmp_path):
+    shutil.copy(DATA_CSV, tmp_path / 'data.csv')
+    streamed = process(tmp_path, COLUMNS)
+    columnar = process(tmp_path, COLUMNS, columnar=True)
+    assert_matches_default(streamed, columnar)
+    assert columnar['Ladder score'].mean == 5.473239862849673
+
+@pytest.mark.parametrize('chunk_rows', [1, 3, 100])
+def test_non_finite_cells_match_default_path(tmp_path, chunk_rows):
+    (tmp_path / 'data.csv').write_text(NON_FINITE_CSV, encoding='utf-8')
+    columns = ('a', 'b', 'c', 'd')
+    streamed = process(tmp_path, columns)
+    summaries = binware_columnar.summarize_csv(tmp_path / 'data.csv', columns, chunk_rows=chunk_rows)
+    assert_matches_default(streamed, summaries)
+    assert summaries['a'].count == 3 and summaries['a'].mean == statistics.mean([1.5, 2, 2])
+    assert summaries['b'].mean == math.inf
+    assert summaries['c'].count == 3 and math.isnan(summaries['c'].mean)
+    assert math.isnan(summaries['d'].mean)
+
+def test_merge_matches_single_summary(tmp_path):
+    shutil.copy(DATA_CSV, tmp_path / 'data.csv')
+    whole = binware_columnar.summarize_csv(tmp_path / 'data.csv', COLUMNS)['Ladder score']
+    merged = binware_columnar.ColumnSummary()
+    for chunk in binware_columnar.iter_column_chunks(tmp_path / 'data.csv', COLUMNS, chunk_rows=10):
+        part = binware_columnar.ColumnSummary()
+        part.update_array(chunk['Ladder score'])
+        merged.merge(part)
+    assert (merged.count, merged.mean, merged.minimum, merged.maximum) == \
+        (whole.count, whole.mean, whole.minimum, whole.maximum)
+    assert merged.variance == pytest.approx(whole.variance, rel=1e-12)
+
+def test_blank_cells_are_marked():
+    values = binware_columnar.to_float_array(['1', '', 'nan', '-inf'])
+    assert np.isnan(values[1]) and np.isnan(values[2])
+    assert binware_columnar.blank_mask(values).tolist() == [False, True, False, False]
+
+#####################################
+# Group-By Tests
+#####################################
+
+def test_group_means_match_statistics_mean(tmp_path):
+    shutil.copy(DATA_CSV, tmp_path / 'data.csv')
+    groups = binware_columnar.group_means_csv(tmp_path / 'data.csv', ['Ladder score'], 'Regional indicator',
+                                              chunk_rows=25)
+    expected = {}
+    with DATA_CSV.open(encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            if row['Ladder score']:
+                expected.setdefault(row['Regional indicator'], []).append(float(row['Ladder score']))
+    assert list(groups) == sorted(expected)
+    for group, values in expected.items():
+        count, mean = groups[group]['Ladder score']
+        assert count == len(values)
+        assert mean == pytest.approx(statistics.mean(values), rel=1e-12)
+
+def test_group_means_non_finite_cells(tmp_path):
+    (tmp_path / 'data.csv').write_text(NON_FINITE_CSV, encoding='utf-8')
+    groups = binware_columnar.group_means_csv(tmp_path / 'data.csv', ['a', 'b', 'c'], 'group', chunk_rows=2)
+    assert groups['x']['a'] == (2, 1.75)
+    assert groups['y']['a'] == (1, 2.0)
+    assert groups['x']['b'] == (2, math.inf)
+    count, mean = groups['x']['c']
+    assert count == 1 and math.isnan(mean)
+
+def test_unknown_group_column_raises(tmp_path):
+    (tmp_path / 'data.csv').write_text(NON_FINITE_CSV, encoding='utf-8')
+    with pytest.raises(KeyError):
+        binware_columnar.group_means_csv(tmp_path / 'data.csv', ['a'], 'region')
@@ -0,0 +1,73 @@
+"""
+Tests for binware_excel column sums on .xlsx and .xls workbooks, and the parsed
+cache path that must give the same totals.
+"""
+
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+
+import binware_excel
+
+#####################################
+# Helpers
+#####################################
+
+def write_xlsx(file_path, rows: list):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(file_path)
+    return file_path
+
+ROWS = [['Year', 'Cattle', 'Note'], [2020, 10, 'a'], [2021, 2.5, None], [2022, 'n/a', 'b']]
+
+#####################################
+# Column Sum Tests
+#####################################
+
+def test_sum_by_index_and_name(tmp_path):
+    file_path = write_xlsx(tmp_path / 'data.xlsx', ROWS)
+    assert binware_excel.sum_excel_column(file_path) == 12.5
+    assert binware_excel.sum_excel_column(file_path, column='Year') == 6063
+
+def test_unknown_column_name_raises(tmp_path):
+    file_path = write_xlsx(tmp_path / 'data.xlsx', ROWS)
+    with pytest.raises(KeyError):
+        binware_excel.sum_excel_column(file_path, column='Sheep')
+
+def test_out_of_range_column_raises(tmp_path):
+    file_path = write_xlsx(tmp_path / 'data.xlsx', ROWS)
+    with pytest.raises(IndexError):
+        binware_excel.sum_excel_column(file_path, column=3)
+
+def test_check_column_index():
+    binware_excel.check_column_index(2, 3)
+    binware_excel.check_column_index(5, 0)
+    with pytest.raises(IndexError):
+        binware_excel.check_column_index(3, 3)
+    with pytest.raises(IndexError):
+        binware_excel.check_column_index(-1, 3)
+
+def test_parsed_cache_matches(tmp_path):
+    binware_parsed = pytest.importorskip('binware_parsed')
+    pytest.importorskip('numpy')
+    file_path = write_xlsx(tmp_path / 'data.xlsx', ROWS)
+    assert binware_parsed.sum_excel_column(file_path) == binware_excel.sum_excel_column(file_path)
+    with pytest.raises(IndexError):
+        binware_parsed.sum_excel_column(file_path, column=3)
+
+def test_xls_out_of_range_column_raises(tmp_path):
+    xlwt = pytest.importorskip('xlwt')
+    workbook = xlwt.Workbook()
+    worksheet = workbook.add_sheet('Sheet1')
+    for row_index, row in enumerate(ROWS):
+        for column_index, value in enumerate(row):
+            if value is not None:
+                worksheet.write(row_index, column_index, value)
+    file_path = tmp_path / 'data.xls'
+    workbook.save(str(file_path))
+    assert binware_excel.sum_excel_column(file_path) == 12.5
+    with pytest.raises(IndexError):
+        binware_excel.sum_excel_column(file_path, column=3)
@@ -0,0 +1,109 @@
+"""
+Tests for binware_fetch: result ordering, per-host limits, streaming
+and error reporting in fetch_all.
+"""
+
+# Standard library imports
+import pathlib
+
+import pytest
+
+import binware_fetch
+import binware_http
+from conftest import StubResponse
+
+#####################################
+# Helpers
+#####################################
+
+def write_body(job: binware_fetch.FetchJob, response) -> bool:
+    """Handler that saves the body like the write_*_file functions do."""
+    file_path = pathlib.Path(job.folder_name) / job.filename
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(response.content)
+    return True
+
+def make_jobs(stub_server, folder: pathlib.Path, names: list) -> list:
+    return [binware_fetch.make_job(stub_server.url(f'/{name}'), str(folder), f'{name}.txt', 'txt')
+            for name in names]
+
+#####################################
+# Job Tests
+#####################################
+
+def test_make_job_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        binware_fetch.make_job('http://example.com/x', 'data', 'x.bin', 'binary')
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / 'manifest.csv'
+    manifest.write_text('url,folder_name,filename,kind\n'
+                        ' http://example.com/a.csv ,data-csv,a.csv, CSV \n', encoding='utf-8')
+    assert binware_fetch.read_manifest(str(manifest)) == [
+        binware_fetch.FetchJob('http://example.com/a.csv', 'data-csv', 'a.csv', 'csv')]
+
+#####################################
+# Fetch Tests
+#####################################
+
+def test_fetch_all_keeps_job_order(stub_server, tmp_path):
+    # Later jobs answer first, results must still follow the job order
+    names = ['slow', 'medium', 'fast']
+    for name, delay in zip(names, (0.3, 0.15, 0.0)):
+        stub_server.script(f'/{name}', StubResponse(200, name.encode(), delay=delay))
+    jobs = make_jobs(stub_server, tmp_path, names)
+    results = binware_fetch.fetch_all(jobs, write_body, max_workers=3, per_host_limit=3)
+    assert [result.job for result in results] == jobs
+    assert all(result.ok and result.status_code == 200 for result in results)
+    assert [(tmp_path / f'{name}.txt').read_bytes() for name in names] == [b'slow', b'medium', b'fast']
+
+def test_fetch_all_respects_per_host_limit(stub_server, tmp_path):
+    names = [f'file{index}' for index in range(6)]
+    for name in names:
+        stub_server.script(f'/{name}', StubResponse(200, b'x', delay=0.1))
+    results = binware_fetch.fetch_all(make_jobs(stub_server, tmp_path, names), write_body,
+                                      max_workers=6, per_host_limit=2)
+    assert all(result.ok for result in results)
+    assert stub_server.max_active == 2
+
+def test_fetch_all_reports_http_errors(stub_server, tmp_path):
+    stub_server.script('/good', StubResponse(200, b'ok'))
+    stub_server.script('/gone', StubResponse(404))
+    good, gone = binware_fetch.fetch_all(make_jobs(stub_server, tmp_path, ['good', 'gone']), write_body)
+    assert good.ok and good.bytes_received == 2
+    assert not gone.ok
+    assert gone.status_code == 404
+    assert '404' in gone.error
+    assert not (tmp_path / 'gone.txt').exists()
+
+def test_fetch_all_fails_job_when_handler_returns_false(stub_server, tmp_path):
+    stub_server.script('/data', StubResponse(200, b'data'))
+    [result] = binware_fetch.fetch_all(make_jobs(stub_server, tmp_path, ['data']), lambda job, response: False)
+    assert not result.ok
+    assert 'Could not write' in result.error
+
+def test_streaming_writes_body_to_disk(stub_server, tmp_path):
+    body = bytes(range(256)) * 1000
+    stub_server.script('/big', StubResponse(200, body))
+
+    def unexpected(job, response):
+        raise AssertionError('the handler is skipped in streaming mode')
+
+    [result] = binware_fetch.fetch_all(make_jobs(stub_server, tmp_path, ['big']), unexpected,
+                                       stream=True, chunk_size=4096)
+    assert result.ok
+    assert result.bytes_received == len(body)
+    assert (tmp_path / 'big.txt').read_bytes() == body
+    # Only the finished file is left behind, no temp files
+    assert [path.name for path in tmp_path.iterdir()] == ['big.txt']
+
+def test_format_report_lists_every_job(stub_server, tmp_path):
+    stub_server.script('/good', StubResponse(200, b'ok'))
+    stub_server.script('/bad', StubResponse(500))
+    with binware_http.FetchClient(max_retries=0) as client:
+        results = binware_fetch.fetch_all(make_jobs(stub_server, tmp_path, ['good', 'bad']), write_body,
+                                          session=client)
+    lines = binware_fetch.format_report(results).splitlines()
+    assert lines[0].endswith(stub_server.url('/good') + ' -> OK')
+    assert '/bad -> FAILED (500' in lines[1]
+    assert lines[2] == '1/2 jobs succeeded, 2 bytes received'
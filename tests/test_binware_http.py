@@ -0,0 +1,120 @@
+"""
+Tests for binware_http.FetchClient against a flaky stub server:
+retries, Retry-After, the retry budget, timeouts and non-retryable errors.
+"""
+
+# Standard library imports
+import time
+
+import pytest
+import requests
+
+import binware_http
+from conftest import StubResponse
+
+#####################################
+# Helpers
+#####################################
+
+def make_client(**options) -> binware_http.FetchClient:
+    """A client with short timeouts and near-zero backoff so the tests run quickly."""
+    options.setdefault('connect_timeout', 1.0)
+    options.setdefault('read_timeout', 1.0)
+    options.setdefault('backoff_factor', 0.01)
+    return binware_http.FetchClient(**options)
+
+#####################################
+# Retry Tests
+#####################################
+
+def test_retries_503_until_success(stub_server):
+    stub_server.script('/flaky', StubResponse(503), StubResponse(503), StubResponse(200, b'ok'))
+    with make_client(max_retries=4) as client:
+        response = client.get(stub_server.url('/flaky'))
+        stats = client.metrics()[stub_server.base[len('http://'):]]
+    assert response.status_code == 200
+    assert response.content == b'ok'
+    assert stub_server.count('/flaky') == 3
+    assert stats['requests'] == 1
+    assert stats['attempts'] == 3
+    assert stats['retries'] == 2
+    assert stats['failures'] == 0
+
+def test_429_honors_retry_after(stub_server):
+    stub_server.script('/limited', StubResponse(429, headers={'Retry-After': '1'}), StubResponse(200, b'ok'))
+    with make_client(max_retries=2) as client:
+        start = time.monotonic()
+        response = client.get(stub_server.url('/limited'))
+        elapsed = time.monotonic() - start
+    assert response.status_code == 200
+    assert stub_server.count('/limited') == 2
+    # backoff_factor alone would retry after at most 0.01s
+    assert elapsed >= 0.9
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.script('/down', StubResponse(503))
+    with make_client(max_retries=2) as client:
+        response = client.get(stub_server.url('/down'))
+    assert response.status_code == 503
+    assert stub_server.count('/down') == 3
+
+def test_retry_budget_exhaustion(stub_server):
+    stub_server.script('/down', StubResponse(503))
+    budget = binware_http.RetryBudget(ratio=0.0, min_retries=1)
+    with make_client(max_retries=5, retry_budget=budget) as client:
+        first = client.get(stub_server.url('/down'))
+        second = client.get(stub_server.url('/down'))
+        stats = client.metrics()[stub_server.base[len('http://'):]]
+    assert first.status_code == second.status_code == 503
+    # One retry for the whole client, then every request gets a single attempt
+    assert stub_server.count('/down') == 3
+    assert budget.retries == 1
+    assert stats['failures'] == 2
+
+def test_no_retry_on_4xx(stub_server):
+    stub_server.script('/missing', StubResponse(404, b'nope'))
+    with make_client(max_retries=4) as client:
+        response = client.get(stub_server.url('/missing'))
+    assert response.status_code == 404
+    assert stub_server.count('/missing') == 1
+
+#####################################
+# Timeout and Connection Tests
+#####################################
+
+def test_stalled_response_raises_read_timeout(stub_server):
+    stub_server.script('/stall', StubResponse(200, b'late', delay=2.0))
+    with make_client(read_timeout=0.2, max_retries=1) as client:
+        start = time.monotonic()
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.get(stub_server.url('/stall'))
+        elapsed = time.monotonic() - start
+    # Both attempts time out instead of waiting for the stalled body
+    assert stub_server.count('/stall') == 2
+    assert elapsed < 1.5
+
+def test_dropped_connection_is_retried(stub_server):
+    stub_server.script('/drop', StubResponse(drop=True), StubResponse(200, b'ok'))
+    with make_client(max_retries=2) as client:
+        response = client.get(stub_server.url('/drop'))
+    assert response.status_code == 200
+    assert stub_server.count('/drop') == 2
+
+#####################################
+# Backoff and Rate Limit Tests
+#####################################
+
+def test_backoff_is_capped():
+    client = make_client(backoff_factor=1.0, max_backoff=2.0)
+    try:
+        assert all(0 <= client.backoff_seconds(10) <= 2.0 for _ in range(100))
+    finally:
+        client.close()
+
+def test_host_rate_limiter_spaces_requests():
+    limiter = binware_http.HostRateLimiter(per_second=20)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait('example.com')
+    # Five slots 50 ms apart: the last one starts at least 200 ms after the first
+    assert time.monotonic() - start >= 0.19
@@ -0,0 +1,98 @@
+"""
+Tests for binware_instrument: success and failure of recorded calls and
+the run report.
+"""
+
+# Standard library imports
+import json
+import os
+import pstats
+
+import pytest
+
+import binware_instrument
+
+#####################################
+# Helpers
+#####################################
+
+@binware_instrument.instrument('process')
+def process_test_file(folder_name: str, input_filename: str, output_filename: str, result=1):
+    binware_instrument.note(rows=2)
+    return result
+
+@binware_instrument.instrument('write')
+def write_test_file(folder_name: str, filename: str, ok: bool = True, error: str = None) -> bool:
+    if error:
+        binware_instrument.note(error=error)
+    return ok
+
+@binware_instrument.instrument('process')
+def process_raising_file(folder_name: str, input_filename: str, output_filename: str):
+    raise ValueError('bad input')
+
+def records() -> list:
+    return list(binware_instrument._run['records'])
+
+@pytest.fixture(autouse=True)
+def fresh_run():
+    binware_instrument.start_run()
+
+#####################################
+# Recording Tests
+#####################################
+
+def test_successful_call(tmp_path):
+    process_test_file(str(tmp_path), 'data.txt', None)
+    [record] = records()
+    assert record['ok']
+    assert record['rows'] == 2
+    assert 'error' not in record
+    assert 'max_rss_kb' not in record
+
+def test_process_returning_none_fails(tmp_path):
+    process_test_file(str(tmp_path), 'data.txt', None, result=None)
+    [record] = records()
+    assert not record['ok']
+    assert record['error'] == 'process_test_file returned None'
+
+def test_write_returning_false_fails(tmp_path):
+    write_test_file(str(tmp_path), 'data.txt', ok=False)
+    assert not records()[0]['ok']
+
+def test_noted_error_fails(tmp_path):
+    write_test_file(str(tmp_path), 'data.txt', error='disk full')
+    [record] = records()
+    assert not record['ok']
+    assert record['error'] == 'disk full'
+
+def test_exception_fails_and_propagates(tmp_path):
+    with pytest.raises(ValueError):
+        process_raising_file(str(tmp_path), 'data.txt', None)
+    [record] = records()
+    assert not record['ok']
+    assert 'bad input' in record['error']
+
+#####################################
+# Report Tests
+#####################################
+
+def test_run_report(tmp_path):
+    process_test_file(str(tmp_path), 'data.txt', None)
+    process_test_file(str(tmp_path), 'data.txt', None, result=None)
+    report = binware_instrument.write_run_report(str(tmp_path / 'report.json'))
+    saved = json.loads((tmp_path / 'report.json').read_text(encoding='utf-8'))
+    assert saved['run_id'] == report['run_id']
+    assert saved['totals']['process_test_file']['calls'] == 2
+    assert saved['totals']['process_test_file']['errors'] == 1
+    assert saved['totals']['process_test_file']['rows'] == 4
+    assert 'max_rss_kb' in saved
+
+def test_profile_written_atomically(tmp_path, monkeypatch):
+    monkeypatch.setitem(binware_instrument._settings, 'profile', 'cprofile')
+    process_test_file(str(tmp_path), 'data.txt', None)
+    report = binware_instrument.write_run_report(str(tmp_path / 'report.json'))
+    assert report['cprofile'] == str(tmp_path / 'report.prof')
+    assert sorted(os.listdir(tmp_path)) == ['report.json', 'report.prof']
+    stats = pstats.Stats(report['cprofile'])
+    assert any(name == 'process_test_file' for _, _, name in stats.stats)
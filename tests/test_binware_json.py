@@ -0,0 +1,43 @@
+"""
+Tests for binware_json: dotted-path extraction with and without ijson,
+and errors for malformed documents.
+"""
+
+import pytest
+
+import binware_json
+
+#####################################
+# Extraction Tests
+#####################################
+
+DOCUMENT = '{"people": [{"name": "Ann"}, {"name": "Bo"}, {"craft": "ISS"}], "number": 2}'
+
+def test_iter_json_path(tmp_path):
+    file_path = tmp_path / 'data.json'
+    file_path.write_text(DOCUMENT, encoding='utf-8')
+    assert list(binware_json.iter_json_path(file_path, 'people.item.name')) == ['Ann', 'Bo']
+    assert list(binware_json.iter_json_path(file_path, 'number')) == [2]
+    assert list(binware_json.iter_json_path(file_path, 'missing')) == []
+
+def test_same_results_without_ijson(tmp_path, monkeypatch):
+    file_path = tmp_path / 'data.json'
+    file_path.write_text(DOCUMENT, encoding='utf-8')
+    monkeypatch.setattr(binware_json, 'ijson', None)
+    assert list(binware_json.iter_json_path(file_path, 'people.item.name')) == ['Ann', 'Bo']
+
+def test_json_lines(tmp_path):
+    file_path = tmp_path / 'data.jsonl'
+    file_path.write_text('{"name": "Ann"}\n\n{"name": "Bo"}\n', encoding='utf-8')
+    assert list(binware_json.iter_json_path(file_path, 'name')) == ['Ann', 'Bo']
+
+@pytest.mark.parametrize('use_ijson', [True, False])
+def test_malformed_document_raises_json_error(tmp_path, monkeypatch, use_ijson):
+    if use_ijson and binware_json.ijson is None:
+        pytest.skip('ijson is not installed')
+    if not use_ijson:
+        monkeypatch.setattr(binware_json, 'ijson', None)
+    file_path = tmp_path / 'data.json'
+    file_path.write_text('{"people": [{"name": ', encoding='utf-8')
+    with pytest.raises(binware_json.JSON_ERRORS):
+        list(binware_json.iter_json_path(file_path, 'people.item.name'))
@@ -0,0 +1,66 @@
+"""
+Tests for binware_lazy: heavy optional packages stay unimported until used,
+and the startup benchmark notices when one is imported eagerly.
+"""
+
+# Standard library imports
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import binware_benchmarks
+import binware_lazy
+
+#####################################
+# Lazy Module Tests
+#####################################
+
+@pytest.fixture
+def fake_package(tmp_path, monkeypatch):
+    (tmp_path / 'binware_fake_heavy.py').write_text("ANSWER = 42\n", encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'binware_fake_heavy', raising=False)
+    yield 'binware_fake_heavy'
+    sys.modules.pop('binware_fake_heavy', None)
+
+def test_import_is_deferred_until_first_use(fake_package):
+    module = binware_lazy.lazy_import(fake_package)
+    assert fake_package not in sys.modules
+    assert not binware_lazy.is_loaded(module)
+    assert module.ANSWER == 42
+    assert fake_package in sys.modules
+    assert binware_lazy.is_loaded(module)
+
+def test_already_imported_module_is_returned_as_is(fake_package):
+    __import__(fake_package)
+    assert binware_lazy.lazy_import(fake_package) is sys.modules[fake_package]
+
+def test_missing_module_raises_at_lazy_import():
+    with pytest.raises(ImportError) as excinfo:
+        binware_lazy.lazy_import('binware_no_such_package')
+    assert excinfo.value.name == 'binware_no_such_package'
+
+#####################################
+# Startup Import Tests
+#####################################
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+HEAVY_PACKAGES = ['numpy', 'pandas', 'requests', 'aiohttp', 'xlrd', 'openpyxl', 'ijson']
+
+def test_entry_point_imports_no_heavy_package():
+    script = ("import sys, binware_analytics\n"
+              f"print(' '.join(name for name in {HEAVY_PACKAGES!r} if name in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
+
+def test_eager_packages_match_submodules():
+    report = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   numpy.version\n"
+              "import time:        80 |        200 |     numpyish\n"
+              "import time:       300 |        300 | binware_analytics\n")
+    entries = binware_benchmarks.parse_importtime(report)
+    assert entries[0] == ('numpy.version', 120, 120)
+    assert binware_benchmarks.eager_packages(entries, ['numpy', 'requests']) == ['numpy']
@@ -0,0 +1,119 @@
+"""
+Tests for binware_manifest.BuildManifest and process_if_changed: reuse
+of unchanged inputs, with and without a results file, and pruning.
+"""
+
+# Standard library imports
+import pathlib
+
+import binware_analytics
+import binware_manifest
+import binware_results
+
+#####################################
+# Helpers
+#####################################
+
+class Processor:
+    """Stand-in for a process_*_file function that counts its calls."""
+
+    __name__ = 'process_test_file'
+
+    def __init__(self, result='ok') -> None:
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, folder_name: str, input_filename: str, output_filename: str, **options):
+        self.calls += 1
+        if output_filename is not None:
+            (pathlib.Path(folder_name) / output_filename).write_text(str(self.result), encoding='utf-8')
+        return self.result
+
+def make_input(tmp_path: pathlib.Path, text: str = 'one two three') -> pathlib.Path:
+    input_path = tmp_path / 'data.txt'
+    input_path.write_text(text, encoding='utf-8')
+    return input_path
+
+#####################################
+# Manifest Tests
+#####################################
+
+def test_record_and_up_to_date(tmp_path):
+    input_path = make_input(tmp_path)
+    output_path = tmp_path / 'results.txt'
+    output_path.write_text('done', encoding='utf-8')
+    manifest = binware_manifest.BuildManifest(tmp_path / 'manifest.json')
+    manifest.record(input_path, output_path, 'process', 1)
+
+    assert manifest.is_up_to_date(input_path, output_path, 'process', 1)
+    assert not manifest.is_up_to_date(input_path, output_path, 'process', 2)
+    assert not manifest.is_up_to_date(input_path, output_path, 'other', 1)
+    input_path.write_text('one two four', encoding='utf-8')
+    assert not manifest.is_up_to_date(input_path, output_path, 'process', 1)
+
+def test_prune_keeps_store_keys(tmp_path):
+    input_path = make_input(tmp_path)
+    db_path = tmp_path / 'results.sqlite'
+    db_path.touch()
+    manifest = binware_manifest.BuildManifest(tmp_path / 'manifest.json')
+    manifest.record(input_path, tmp_path / 'gone.txt', 'process', 1)
+    manifest.record(input_path, binware_manifest.store_key(str(db_path), 'words'), 'process', 1)
+    manifest.record(input_path, binware_manifest.store_key(str(tmp_path / 'missing.sqlite'), 'words'),
+                    'process', 1)
+
+    assert manifest.prune() == 2
+    manifest.save()
+    assert list(binware_manifest.BuildManifest(tmp_path / 'manifest.json')._records) == \
+        [binware_manifest.store_key(str(db_path), 'words')]
+
+#####################################
+# Incremental Processing Tests
+#####################################
+
+def test_unchanged_input_reuses_results_file(tmp_path):
+    make_input(tmp_path)
+    manifest = binware_manifest.BuildManifest(tmp_path / 'manifest.json')
+    process = Processor()
+    assert binware_analytics.process_if_changed(process, str(tmp_path), 'data.txt', 'results.txt', manifest)
+    assert not binware_analytics.process_if_changed(process, str(tmp_path), 'data.txt', 'results.txt', manifest)
+    assert process.calls == 1
+    # Different options are a different build
+    assert binware_analytics.process_if_changed(process, str(tmp_path), 'data.txt', 'results.txt', manifest,
+                                                {'top_n': 5})
+    assert process.calls == 2
+
+def test_failed_processor_is_not_recorded(tmp_path):
+    make_input(tmp_path)
+    manifest = binware_manifest.BuildManifest(tmp_path / 'manifest.json')
+    process = Processor(result=None)
+    key = binware_manifest.store_key(str(tmp_path / 'results.sqlite'), 'words')
+    binware_analytics.process_if_changed(process, str(tmp_path), 'data.txt', None, manifest, result_key=key)
+    binware_analytics.process_if_changed(process, str(tmp_path), 'data.txt', None, manifest, result_key=key)
+    assert process.calls == 2
+
+def test_store_only_results_are_reused_with_copied_metrics(tmp_path):
+    make_input(tmp_path)
+    manifest = binware_manifest.BuildManifest(tmp_path / 'manifest.json')
+    process = Processor(result=3)
+    with binware_results.ResultStore(tmp_path / 'results.sqlite') as store:
+        key = binware_manifest.store_key(str(store.db_path), 'words')
+
+        def run(run_id: str) -> bool:
+            return binware_analytics.process_if_changed(
+                process, str(tmp_path), 'data.txt', None, manifest,
+                on_result=lambda result: store.add(run_id, 'words', {'total': result}),
+                result_key=key, on_reuse=lambda: store.copy_latest('words', run_id) > 0)
+
+        assert run('first')
+        assert not run('second')
+        assert process.calls == 1
+        assert store.run_metrics('second') == {'words': {'total': 3}}
+
+def test_reuse_without_stored_metrics_processes_again(tmp_path):
+    make_input(tmp_path)
+    manifest = binware_manifest.BuildManifest(tmp_path / 'manifest.json')
+    process = Processor()
+    binware_analytics.process_if_changed(process, str(tmp_path), 'data.txt', 'results.txt', manifest)
+    assert binware_analytics.process_if_changed(process, str(tmp_path), 'data.txt', 'results.txt', manifest,
+                                                on_reuse=lambda: False)
+    assert process.calls == 2
@@ -0,0 +1,101 @@
+"""
+Tests for binware_parsed.build_csv_cache: column types, ragged rows, and
+columns that only turn out to be text in a later chunk.
+"""
+
+# Standard library imports
+import csv
+import math
+import pathlib
+import shutil
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import binware_analytics
+import binware_parsed
+
+#####################################
+# Helpers
+#####################################
+
+def write_csv(file_path, rows: list):
+    with open(file_path, 'w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows(rows)
+    return file_path
+
+def cached_files(file_path) -> list:
+    return sorted(path.suffix for path in binware_parsed.cache_dir(file_path).iterdir())
+
+#####################################
+# CSV Cache Tests
+#####################################
+
+@pytest.mark.parametrize('chunk_rows', [1, 2, 100])
+def test_columns_match_across_chunk_sizes(tmp_path, chunk_rows):
+    file_path = write_csv(tmp_path / 'data.csv', [
+        ['name', 'score', 'late', 'name'],
+        ['Alpha', '1.5', '1', 'x'],
+        ['B', '', '2'],
+        ['Gamma', '-3', 'three', 'z'],
+    ])
+    table = binware_parsed.build_csv_cache(file_path, chunk_rows=chunk_rows)
+    assert table.header == ['name', 'score', 'late', 'name']
+    assert list(table.columns) == ['name', 'score', 'late']
+    assert table['name'].dtype == np.dtype('<U5')
+    assert table['name'].tolist() == ['Alpha', 'B', 'Gamma']
+    assert table['score'].dtype == np.float64
+    assert table['score'][0] == 1.5 and math.isnan(table['score'][1]) and table['score'][2] == -3
+    # Numeric in the first chunks, text in the last: stored as the original strings
+    assert table['late'].tolist() == ['1', '2', 'three']
+    assert cached_files(file_path) == ['.json', '.npy', '.npy', '.npy']
+
+def test_header_only_file(tmp_path):
+    file_path = write_csv(tmp_path / 'data.csv', [['x', 'y']])
+    table = binware_parsed.build_csv_cache(file_path)
+    assert table['x'].dtype == np.float64 and len(table['x']) == 0
+
+def test_rebuild_replaces_old_generation(tmp_path):
+    file_path = write_csv(tmp_path / 'data.csv', [['x'], ['1']])
+    binware_parsed.build_csv_cache(file_path)
+    write_csv(file_path, [['x'], ['1'], ['2']])
+    table = binware_parsed.ensure_csv_cache(file_path)
+    assert table['x'].tolist() == [1.0, 2.0]
+    assert cached_files(file_path) == ['.json', '.npy']
+
+#####################################
+# Cached Summary Tests
+#####################################
+
+NON_FINITE_CSV = ('group,a,b,c,d\n'
+                  'x,1.5,1,nan,inf\n'
+                  'y,,2,2,-inf\n'
+                  'x,2,inf,,1\n'
+                  'y,2,3,4,\n')
+
+DATA_CSV = pathlib.Path(__file__).resolve().parent.parent / 'data-csv' / 'data.csv'
+
+def same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+def assert_cached_matches_streaming(folder: pathlib.Path, columns: tuple) -> None:
+    streamed = binware_analytics.process_csv_file(str(folder), 'data.csv', None, columns=columns)
+    cached = binware_analytics.process_csv_file(str(folder), 'data.csv', None, columns=columns, parsed_cache=True)
+    assert cached is not None
+    for column in columns:
+        assert cached[column].count == streamed[column].count, column
+        assert same(cached[column].mean, streamed[column].mean), column
+        assert cached[column].minimum == streamed[column].minimum, column
+        assert cached[column].maximum == streamed[column].maximum, column
+
+def test_cached_summary_matches_streaming(tmp_path):
+    shutil.copy(DATA_CSV, tmp_path / 'data.csv')
+    assert_cached_matches_streaming(tmp_path, ('Ladder score', 'Generosity'))
+
+def test_cached_summary_non_finite_cells(tmp_path):
+    (tmp_path / 'data.csv').write_text(NON_FINITE_CSV, encoding='utf-8')
+    assert_cached_matches_streaming(tmp_path, ('a', 'b', 'c', 'd'))
+    summaries = binware_parsed.summarize_csv(tmp_path / 'data.csv', ['b', 'c'])
+    assert summaries['b'].mean == math.inf
+    assert summaries['c'].count == 3 and math.isnan(summaries['c'].mean)
@@ -0,0 +1,128 @@
+"""
+Tests for binware_analytics.run_pipeline_config against a stub server:
+stage results, reuse on the second run, and failures in the process stage.
+"""
+
+# Standard library imports
+import json
+
+import pytest
+
+import binware_analytics
+import binware_results
+from conftest import StubResponse
+
+#####################################
+# Helpers
+#####################################
+
+CSV_BODY = b'Country name,Ladder score\nA,7.5\nB,6.5\n'
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # The HTTP cache index and build manifest live in the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def write_config(stub_server, datasets: list, **settings) -> str:
+    config = {'results_db': 'results.sqlite', 'http': {'max_retries': 0}, **settings, 'datasets': [
+        {'name': name, 'kind': kind, 'url': stub_server.url(f'/{name}'), 'folder': f'data-{kind}',
+         'filename': filename, **extra}
+        for name, kind, filename, extra in datasets]}
+    with open('pipeline.json', 'w', encoding='utf-8') as file:
+        json.dump(config, file)
+    return 'pipeline.json'
+
+def stages(timings: list) -> dict:
+    return {(timing.dataset, timing.stage): timing for timing in timings}
+
+#####################################
+# Pipeline Tests
+#####################################
+
+def test_second_run_reuses_results(stub_server, workdir):
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY, headers={'ETag': '"v1"'}))
+    config = write_config(stub_server, [('happiness', 'csv', 'data.csv', {})])
+
+    first = stages(binware_analytics.run_pipeline_config(config, run_id='first'))
+    second = stages(binware_analytics.run_pipeline_config(config, run_id='second'))
+
+    assert all(timing.ok for timing in first.values())
+    assert second[('happiness', 'process')].detail == 'reused cached result'
+    with binware_results.ResultStore('results.sqlite') as store:
+        assert store.run_metrics('second') == store.run_metrics('first')
+        assert store.run_metrics('first')['happiness']['Ladder score.mean'] == pytest.approx(7.0)
+
+def test_failed_processor_fails_the_chain(stub_server, workdir):
+    stub_server.script('/cattle', StubResponse(200, b'not an excel file'))
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY))
+    config = write_config(stub_server, [('cattle', 'excel', 'data.xls', {}),
+                                        ('happiness', 'csv', 'data.csv', {'depends_on': ['cattle']})])
+
+    timings = stages(binware_analytics.run_pipeline_config(config, run_id='run'))
+
+    assert timings[('cattle', 'fetch')].ok
+    process = timings[('cattle', 'process')]
+    assert not process.ok
+    assert process.detail == 'processor failed'
+    assert not timings[('happiness', 'skipped')].ok
+    with binware_results.ResultStore('results.sqlite') as store:
+        assert store.run_metrics('run') == {}
+
+def test_run_command_exit_code(stub_server, workdir):
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY))
+    stub_server.script('/cattle', StubResponse(200, b'not an excel file'))
+    good = write_config(stub_server, [('happiness', 'csv', 'data.csv', {})])
+    assert binware_analytics.main(['run', '--config', good]) == 0
+    bad = write_config(stub_server, [('cattle', 'excel', 'data.xls', {})])
+    assert binware_analytics.main(['run', '--config', bad]) == 1
+
+#####################################
+# Command-Line Tests
+#####################################
+
+def test_default_command_runs_the_pipeline(stub_server, workdir):
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY))
+    write_config(stub_server, [('happiness', 'csv', 'data.csv', {})])
+    assert binware_analytics.main([]) == 0
+    assert (workdir / 'data-csv' / 'results_csv.txt').exists()
+
+def test_fetch_command_only_downloads(stub_server, workdir):
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY))
+    stub_server.script('/gone', StubResponse(404))
+    good = write_config(stub_server, [('happiness', 'csv', 'data.csv', {})])
+    assert binware_analytics.main(['fetch', '--config', good]) == 0
+    assert (workdir / 'data-csv' / 'data.csv').read_bytes() == CSV_BODY
+    assert not (workdir / 'data-csv' / 'results_csv.txt').exists()
+    bad = write_config(stub_server, [('gone', 'csv', 'data.csv', {})])
+    assert binware_analytics.main(['fetch', '--config', bad]) == 1
+
+def test_process_command(workdir):
+    (workdir / 'data.csv').write_bytes(CSV_BODY)
+    assert binware_analytics.main(['process', 'csv', 'data.csv', '--output', 'out.txt',
+                                   '--option', 'summary=true']) == 0
+    text = (workdir / 'out.txt').read_text(encoding='utf-8')
+    assert 'Average Ladder Score: 7.0' in text
+    assert 'Ladder Score Count: 2' in text
+    assert binware_analytics.main(['process', 'csv', 'data.csv', '--no-text-results',
+                                   '--option', 'columns=["Missing"]']) == 0
+    assert binware_analytics.main(['process', 'excel', 'data.csv', '--no-text-results']) == 1
+    with pytest.raises(SystemExit):
+        binware_analytics.main(['process', 'csv', 'data.csv', '--option', 'summary'])
+
+def test_schedule_command_snapshots_each_run(stub_server, workdir):
+    stub_server.script('/happiness', StubResponse(200, CSV_BODY))
+    config = write_config(stub_server, [('happiness', 'csv', 'data.csv', {})])
+    assert binware_analytics.main(['schedule', '--config', config, '--interval', '0.01', '--runs', '1',
+                                   '--partition-root', 'runs']) == 0
+    partitions = [path for path in (workdir / 'runs').glob('*/*/*/*') if path.is_dir()]
+    assert len(partitions) == 1
+    assert (partitions[0] / 'data-csv' / 'data.csv').read_bytes() == CSV_BODY
+    assert (partitions[0] / 'data-csv' / 'results_csv.txt').exists()
+
+def test_schedule_command_fails_on_failed_run(stub_server, workdir):
+    stub_server.script('/cattle', StubResponse(200, b'not an excel file'))
+    config = write_config(stub_server, [('cattle', 'excel', 'data.xls', {})])
+    assert binware_analytics.main(['schedule', '--config', config, '--interval', '0.01', '--runs', '1',
+                                   '--in-place']) == 1
+    assert not (workdir / 'runs').exists()
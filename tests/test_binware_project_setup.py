@@ -0,0 +1,119 @@
+"""
+Tests for binware_project_setup: bulk provisioning with dedup against
+existing folders, the summary counts, time-partition naming and the data
+folder being created on demand.
+"""
+
+# Standard library imports
+import datetime
+import os
+
+import pytest
+
+import binware_project_setup
+
+#####################################
+# Helpers
+#####################################
+
+REGIONS = ["North America", "Europe", "Asia"]
+YEARS = [2020, 2021]
+
+WHEN = datetime.datetime(2024, 5, 1, 12, 0, 5, tzinfo=datetime.timezone.utc)
+
+def folders_under(base_path) -> set:
+    return {os.path.relpath(root, base_path) for root, _, _ in os.walk(base_path)} - {os.curdir}
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    path = tmp_path / 'data'
+    monkeypatch.setattr(binware_project_setup, 'data_path', path)
+    monkeypatch.setattr(binware_project_setup, '_created_folders', set())
+    return path
+
+#####################################
+# Provisioning Tests
+#####################################
+
+def test_provision_partitions_creates_every_partition(data_path):
+    summary = binware_project_setup.provision_partitions(YEARS, REGIONS, to_lowercase=True, remove_spaces=True)
+
+    assert folders_under(data_path) == {
+        'north_america', 'europe', 'asia',
+        *(os.path.join(region, str(year)) for region in ('north_america', 'europe', 'asia') for year in YEARS),
+    }
+    assert (summary['requested'], summary['existing'], summary['created'], summary['failed']) == (6, 0, 9, [])
+
+def test_provision_partitions_skips_existing_folders(data_path):
+    (data_path / 'europe' / '2020').mkdir(parents=True)
+    (data_path / 'asia').mkdir()
+
+    summary = binware_project_setup.provision_partitions(YEARS, REGIONS, to_lowercase=True, remove_spaces=True)
+
+    # north_america and 5 of the 6 year folders were missing; europe/2020 was already there
+    assert (summary['requested'], summary['existing'], summary['created'], summary['failed']) == (6, 1, 6, [])
+    again = binware_project_setup.provision_partitions(YEARS, REGIONS, to_lowercase=True, remove_spaces=True)
+    assert (again['requested'], again['existing'], again['created']) == (6, 6, 0)
+
+def test_duplicate_names_are_requested_once(data_path):
+    summary = binware_project_setup.provision_partitions(
+        [2020, 2020, '2020'], ['Asia', 'asia', 'ASIA'], prefixes=('', 'tool-'), to_lowercase=True)
+    assert folders_under(data_path) == {'asia', 'tool-asia', os.path.join('asia', '2020'),
+                                        os.path.join('tool-asia', '2020')}
+    assert (summary['requested'], summary['created']) == (2, 4)
+
+def test_single_level_partitions(data_path):
+    years_only = binware_project_setup.provision_partitions(YEARS)
+    regions_only = binware_project_setup.provision_partitions(regions=REGIONS, prefixes=('r-',))
+    assert folders_under(data_path) == {'2020', '2021', 'r-North America', 'r-Europe', 'r-Asia'}
+    assert (years_only['requested'], years_only['created']) == (2, 2)
+    assert (regions_only['requested'], regions_only['created']) == (3, 3)
+
+def test_provision_folders_counts_intermediate_folders(data_path):
+    (data_path / 'a').mkdir(parents=True)
+    paths = ['a/b/c', 'a/b/c', str(data_path / 'a' / 'd'), 'a']
+    summary = binware_project_setup.provision_folders(paths)
+    assert folders_under(data_path) == {'a', os.path.join('a', 'b'), os.path.join('a', 'b', 'c'),
+                                        os.path.join('a', 'd')}
+    assert (summary['requested'], summary['existing'], summary['created'], summary['failed']) == (3, 1, 3, [])
+
+def test_provision_folders_reports_failures(data_path):
+    data_path.mkdir()
+    (data_path / 'taken').write_text('a file, not a folder', encoding='utf-8')
+    summary = binware_project_setup.provision_folders(['taken', 'taken/inner', 'fine'], workers=2)
+    assert sorted(os.path.basename(path) for path, _ in summary['failed']) == ['inner', 'taken']
+    assert (summary['requested'], summary['existing'], summary['created']) == (3, 0, 1)
+
+@pytest.mark.parametrize('path', ['..', '../elsewhere', '.', '/'])
+def test_provision_folders_rejects_paths_outside_base(data_path, path):
+    with pytest.raises(ValueError):
+        binware_project_setup.provision_folders([path])
+
+#####################################
+# Time Partition Tests
+#####################################
+
+def test_time_partition_path_naming(data_path, tmp_path):
+    assert binware_project_setup.time_partition_path(WHEN) == data_path / '2024' / '05' / '01' / '120005'
+    assert binware_project_setup.time_partition_path(WHEN, tmp_path, '%Y-%m/%d') == tmp_path / '2024-05' / '01'
+
+def test_create_time_partition_remembers_parents(data_path):
+    first = binware_project_setup.create_time_partition(WHEN)
+    second = binware_project_setup.create_time_partition(WHEN + datetime.timedelta(seconds=5))
+    assert first.is_dir() and second.is_dir()
+    assert second.name == '120010'
+    assert binware_project_setup._created_folders == {data_path / '2024' / '05' / '01'}
+
+#####################################
+# Data Folder Tests
+#####################################
+
+def test_ensure_data_path_creates_folder_on_demand(data_path):
+    assert not data_path.exists()
+    assert binware_project_setup.ensure_data_path() == data_path
+    assert binware_project_setup.ensure_data_path() == data_path
+    assert data_path.is_dir()
+
+def test_folder_functions_create_data_path(data_path):
+    binware_project_setup.create_folders_for_range(2022, 2023)
+    assert folders_under(data_path) == {'2022', '2023'}
@@ -0,0 +1,152 @@
+"""
+Tests for binware_schedule.Scheduler on a fake clock: drift-free deadlines,
+skipped overlapping runs, jitter bounds and missed ticks.
+"""
+
+# Standard library imports
+import concurrent.futures
+import random
+import threading
+
+import pytest
+
+import binware_schedule
+
+#####################################
+# Helpers
+#####################################
+
+class FakeClock:
+    """Monotonic clock that only moves when waited on (plus `oversleep` per wait) or advanced."""
+
+    def __init__(self, oversleep: float = 0.0) -> None:
+        self.now = 0.0
+        self.oversleep = oversleep
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def wait(self, seconds: float) -> bool:
+        self.now += seconds + self.oversleep
+        return False
+
+class InlineExecutor:
+    """Runs submitted calls at once, so a run always finishes before the next tick is checked."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def submit(self, function, *args):
+        future = concurrent.futures.Future()
+        future.set_result(function(*args))
+        return future
+
+@pytest.fixture
+def inline_runs(monkeypatch):
+    monkeypatch.setattr(binware_schedule.concurrent.futures, 'ThreadPoolExecutor', InlineExecutor)
+
+#####################################
+# Scheduler Tests
+#####################################
+
+def test_deadlines_do_not_drift(inline_runs):
+    clock = FakeClock(oversleep=0.3)
+    ticks = []
+
+    def task(tick):
+        ticks.append(tick)
+        clock.advance(4.0)  # The run takes 4 of the 10 seconds
+
+    report = binware_schedule.Scheduler(task, 10.0, clock=clock, wait=clock.wait).run(max_ticks=5)
+
+    assert [tick.due for tick in ticks] == pytest.approx([0.0, 10.0, 20.0, 30.0, 40.0])
+    assert [tick.lateness for tick in ticks] == pytest.approx([0.3] * 5)
+    assert (report.ticks, report.runs, report.skipped) == (5, 5, 0)
+    assert report.run_seconds.mean == pytest.approx(4.0)
+
+def test_overlapping_run_is_skipped():
+    clock = FakeClock()
+    release = threading.Event()
+    numbers = []
+    waits = []
+
+    def task(tick):
+        numbers.append(tick.number)
+        release.wait(5)
+
+    def wait(seconds):
+        waits.append(seconds)
+        clock.wait(seconds)
+        if len(waits) == 4:
+            # Tick 0 is still running through ticks 1 and 2: stop before tick 3
+            scheduler.stop()
+            release.set()
+            return True
+        return False
+
+    scheduler = binware_schedule.Scheduler(task, 10.0, clock=clock, wait=wait)
+    report = scheduler.run(max_ticks=10)
+
+    assert numbers == [0]
+    assert (report.ticks, report.runs, report.skipped) == (3, 1, 2)
+
+def test_jitter_stays_within_bounds(inline_runs, monkeypatch):
+    monkeypatch.setattr(binware_schedule, 'random', random.Random(3))
+    clock = FakeClock()
+    ticks = []
+    scheduler = binware_schedule.Scheduler(ticks.append, 10.0, jitter=2.5, clock=clock, wait=clock.wait)
+
+    scheduler.run(max_ticks=200)
+
+    lateness = [tick.lateness for tick in ticks]
+    assert len(ticks) == 200
+    assert all(0.0 <= value <= 2.5 for value in lateness)
+    assert max(lateness) > 2.0 and min(lateness) < 0.5
+    # Jitter is measured from each deadline, so it does not add up
+    assert ticks[-1].due == pytest.approx(1990.0)
+
+def test_missed_ticks_collapse_into_one_run(inline_runs):
+    clock = FakeClock()
+    ticks = []
+
+    def task(tick):
+        ticks.append(tick)
+        if tick.number == 0:
+            clock.advance(35.0)  # Stalled through the deadlines of ticks 1, 2 and 3
+
+    report = binware_schedule.Scheduler(task, 10.0, clock=clock, wait=clock.wait).run(max_ticks=6)
+
+    assert [tick.number for tick in ticks] == [0, 3, 4, 5]
+    assert ticks[1].started == pytest.approx(35.0)
+    assert (report.ticks, report.runs, report.skipped) == (6, 4, 2)
+
+def test_duration_limits_the_ticks(inline_runs):
+    clock = FakeClock()
+    ticks = []
+    report = binware_schedule.Scheduler(ticks.append, 10.0, clock=clock, wait=clock.wait).run(duration=35.0)
+    assert [tick.due for tick in ticks] == [0.0, 10.0, 20.0, 30.0]
+    assert report.ticks == 4
+
+def test_failed_run_is_counted(inline_runs):
+    clock = FakeClock()
+
+    def task(tick):
+        if tick.number == 1:
+            raise RuntimeError("boom")
+
+    report = binware_schedule.Scheduler(task, 1.0, clock=clock, wait=clock.wait).run(max_ticks=3)
+    assert (report.runs, report.failed) == (3, 1)
+
+@pytest.mark.parametrize('interval, jitter', [(0, 0), (-1, 0), (5, 5), (5, -1)])
+def test_invalid_settings_raise(interval, jitter):
+    with pytest.raises(ValueError):
+        binware_schedule.Scheduler(print, interval, jitter)
@@ -0,0 +1,97 @@
+"""
+Tests for binware_sketch.HyperLogLog: merging, serialization and the
+estimation error on seeded corpora.
+"""
+
+# Standard library imports
+import math
+import pathlib
+import random
+
+import pytest
+
+import binware_sketch
+import binware_text
+
+#####################################
+# Helpers
+#####################################
+
+DATA_TXT = pathlib.Path(__file__).resolve().parent.parent / 'data-txt' / 'data.txt'
+
+def corpus(seed: int, n: int) -> list:
+    rng = random.Random(seed)
+    return [f"word{rng.getrandbits(64):x}" for _ in range(n)]
+
+def sketch_of(items, precision: int = binware_sketch.DEFAULT_PRECISION) -> binware_sketch.HyperLogLog:
+    sketch = binware_sketch.HyperLogLog(precision)
+    sketch.update(items)
+    return sketch
+
+#####################################
+# Merge and Serialization Tests
+#####################################
+
+def test_merge_equals_union():
+    first, second = corpus(1, 3000), corpus(2, 5000)
+    merged = sketch_of(first)
+    merged.merge(sketch_of(second + first[:1000]))
+    union = sketch_of(first + second)
+    assert merged.registers == union.registers
+    assert merged.estimate() == union.estimate()
+
+def test_merge_rejects_precision_mismatch():
+    with pytest.raises(ValueError):
+        sketch_of(['a'], 12).merge(sketch_of(['a'], 10))
+
+@pytest.mark.parametrize('precision', [binware_sketch.MIN_PRECISION - 1, binware_sketch.MAX_PRECISION + 1])
+def test_invalid_precision(precision):
+    with pytest.raises(ValueError):
+        binware_sketch.HyperLogLog(precision)
+
+def test_round_trip(tmp_path):
+    sketch = sketch_of(corpus(3, 2000), precision=10)
+    restored = binware_sketch.HyperLogLog.from_bytes(sketch.to_bytes())
+    assert (restored.precision, restored.registers) == (10, sketch.registers)
+    sketch.save(tmp_path / 'words.hll')
+    assert binware_sketch.HyperLogLog.load(tmp_path / 'words.hll').estimate() == sketch.estimate()
+
+def test_from_bytes_rejects_bad_data():
+    data = sketch_of(['a']).to_bytes()
+    with pytest.raises(ValueError):
+        binware_sketch.HyperLogLog.from_bytes(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        binware_sketch.HyperLogLog.from_bytes(data[:-1])
+
+def test_merge_sketch_files(tmp_path):
+    paths = []
+    for seed in range(3):
+        paths.append(tmp_path / f"{seed}.hll")
+        sketch_of(corpus(seed, 1000)).save(paths[-1])
+    merged = binware_sketch.merge_sketch_files(paths)
+    assert merged.registers == sketch_of(corpus(0, 1000) + corpus(1, 1000) + corpus(2, 1000)).registers
+    with pytest.raises(ValueError):
+        binware_sketch.merge_sketch_files([])
+
+#####################################
+# Estimation Error Tests
+#####################################
+
+def test_small_counts():
+    assert binware_sketch.HyperLogLog().estimate() == 0
+    assert sketch_of(['a', 'b', 'a']).estimate() == 2
+    assert sketch_of(corpus(4, 100)).estimate() == 100
+
+@pytest.mark.parametrize('n', [1000, 8000, 10_000, 12_000, 50_000])
+def test_error_on_seeded_corpora(n):
+    # Around 2.5 * 2**12 items the linear-counting switch used to read about 2% high
+    errors = [sketch_of(corpus(seed, n)).estimate() / n - 1 for seed in range(20)]
+    standard_error = binware_sketch.HyperLogLog().relative_error
+    assert max(abs(error) for error in errors) < 4 * standard_error
+    assert abs(sum(errors) / len(errors)) < standard_error / 2
+    assert math.sqrt(sum(error * error for error in errors) / len(errors)) < 1.25 * standard_error
+
+def test_baseline_text_within_standard_error():
+    words, sketch = binware_text.sketch_words(DATA_TXT)
+    assert words == 31374
+    assert abs(sketch.estimate() / 10044 - 1) < sketch.relative_error
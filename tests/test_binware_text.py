@@ -0,0 +1,107 @@
+"""
+Tests for binware_text: chunked word counting against text.lower().split(),
+words cut at chunk boundaries, and whitespace-aligned byte ranges.
+"""
+
+# Standard library imports
+import collections
+import pathlib
+
+import pytest
+
+import binware_analytics
+import binware_text
+
+#####################################
+# Helpers
+#####################################
+
+DATA_TXT = pathlib.Path(__file__).resolve().parent.parent / 'data-txt' / 'data.txt'
+
+SAMPLE = "Alpha beta\tGAMMA  delta\n\népsilon zeta-eta  théta　iota kappa \n"
+
+def expected_counts(text: str) -> collections.Counter:
+    return collections.Counter(text.lower().split())
+
+#####################################
+# Chunked Counting Tests
+#####################################
+
+def test_word_split_across_chunks_is_counted_once():
+    blocks = ['Hello wor', 'ld and fare', 'well', ' again']
+    words = [word for batch in binware_text.split_blocks(blocks) for word in batch]
+    assert words == ['hello', 'world', 'and', 'farewell', 'again']
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64])
+def test_chunked_counts_match_split(tmp_path, chunk_size):
+    file_path = tmp_path / 'data.txt'
+    file_path.write_text(SAMPLE, encoding='utf-8')
+    assert binware_text.count_words(file_path, chunk_size) == expected_counts(SAMPLE)
+
+def test_empty_and_whitespace_only_files(tmp_path):
+    for text in ('', ' \n\t '):
+        file_path = tmp_path / 'data.txt'
+        file_path.write_text(text, encoding='utf-8')
+        assert binware_text.count_words(file_path, 2) == collections.Counter()
+
+def test_baseline_text_counts():
+    counts = binware_text.count_words(DATA_TXT, chunk_size=4096)
+    assert binware_text.summarize_counts(counts) == (31374, 10044)
+    assert counts == expected_counts(DATA_TXT.read_text(encoding='utf-8'))
+
+def test_process_txt_file_baseline():
+    result = binware_analytics.process_txt_file(str(DATA_TXT.parent), DATA_TXT.name, None)
+    assert (result['words'], result['unique_words']) == (31374, 10044)
+
+#####################################
+# Byte Range Tests
+#####################################
+
+@pytest.mark.parametrize('shard_bytes', [1, 5, 16, 1000])
+def test_split_ranges_end_on_whitespace(tmp_path, shard_bytes):
+    file_path = tmp_path / 'data.txt'
+    file_path.write_text(SAMPLE * 3, encoding='utf-8')
+    data = file_path.read_bytes()
+    ranges = binware_text.split_ranges(file_path, shard_bytes)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    for _, end in ranges[:-1]:
+        assert data[end] in binware_text.ASCII_WHITESPACE
+    counts = collections.Counter()
+    for start, end in ranges:
+        counts.update(binware_text.count_range(file_path, start, end, chunk_size=3))
+    assert counts == expected_counts(SAMPLE * 3)
+
+def test_split_ranges_long_word(tmp_path):
+    file_path = tmp_path / 'data.txt'
+    file_path.write_text('a ' + 'x' * 10000 + ' b', encoding='utf-8')
+    ranges = binware_text.split_ranges(file_path, 4)
+    assert ranges[0] == (0, 10002)
+    assert ranges[-1][1] == 10004
+
+#####################################
+# Parallel Counting Tests
+#####################################
+
+@pytest.mark.parametrize('workers, shard_bytes', [(2, 1), (2, 64), (3, 1000), (4, None)])
+@pytest.mark.parametrize('text', ['', 'a', 'Z', ' ', SAMPLE * 20])
+def test_parallel_counts_equal_serial(tmp_path, workers, shard_bytes, text):
+    file_path = tmp_path / 'data.txt'
+    file_path.write_text(text, encoding='utf-8')
+    parallel = binware_text.count_words_parallel(file_path, workers=workers, shard_bytes=shard_bytes)
+    assert parallel == binware_text.count_words(file_path)
+
+def test_parallel_counts_over_a_directory(tmp_path):
+    (tmp_path / 'one.txt').write_text(SAMPLE, encoding='utf-8')
+    (tmp_path / 'two.txt').write_text('x', encoding='utf-8')
+    (tmp_path / 'empty.txt').write_text('', encoding='utf-8')
+    (tmp_path / 'skipped.csv').write_text('not,counted', encoding='utf-8')
+    counts = binware_text.count_words_parallel(tmp_path, workers=2, shard_bytes=8)
+    assert counts == expected_counts(SAMPLE + ' x')
+
+def test_parallel_baseline_text():
+    for workers, shard_bytes in ((2, 4096), (3, 50_000)):
+        counts = binware_text.count_words_parallel(DATA_TXT, workers=workers, shard_bytes=shard_bytes)
+        assert binware_text.summarize_counts(counts) == (31374, 10044)
+    result = binware_analytics.process_txt_file(str(DATA_TXT.parent), DATA_TXT.name, None, workers=2)
+    assert (result['words'], result['unique_words']) == (31374, 10044)
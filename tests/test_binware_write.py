@@ -0,0 +1,136 @@
+"""
+Tests for binware_write: failed writes leave no temp file and no changed
+target, batches fsync once at the end, and link_or_copy falls back to a copy.
+"""
+
+# Standard library imports
+import errno
+import os
+
+import pytest
+
+import binware_write
+
+#####################################
+# Helpers
+#####################################
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    """Record the files and folders fsynced instead of syncing them."""
+    calls = {'files': [], 'folders': []}
+    monkeypatch.setitem(binware_write._settings, 'sync', 'batch')
+    monkeypatch.setattr(binware_write, '_fsync_file', calls['files'].append)
+    monkeypatch.setattr(binware_write, '_fsync_folder', calls['folders'].append)
+    monkeypatch.setattr(binware_write.os, 'fsync', lambda fd: calls['files'].append(fd))
+    return calls
+
+#####################################
+# Atomic Write Tests
+#####################################
+
+def test_exception_leaves_target_and_no_temp_file(tmp_path):
+    target = tmp_path / 'results.txt'
+    target.write_text('previous results', encoding='utf-8')
+
+    with pytest.raises(RuntimeError):
+        with binware_write.atomic_open(target) as file:
+            file.write('half of the new results')
+            raise RuntimeError('crashed mid-write')
+
+    assert os.listdir(tmp_path) == ['results.txt']
+    assert target.read_text(encoding='utf-8') == 'previous results'
+
+def test_failed_write_creates_no_target(tmp_path):
+    target = tmp_path / 'new' / 'sketch.bin'
+    with pytest.raises(TypeError):
+        binware_write.write_atomic(target, ['not', 'str', 'or', 'bytes'])
+    assert os.listdir(tmp_path / 'new') == []
+
+def test_successful_write_replaces_target(tmp_path):
+    target = tmp_path / 'results.txt'
+    target.write_text('previous results', encoding='utf-8')
+    binware_write.write_atomic(target, 'new results')
+    binware_write.write_atomic(tmp_path / 'data.bin', b'\x00\x01')
+    assert sorted(os.listdir(tmp_path)) == ['data.bin', 'results.txt']
+    assert target.read_text(encoding='utf-8') == 'new results'
+    assert (tmp_path / 'data.bin').read_bytes() == b'\x00\x01'
+
+def test_unsupported_mode_raises(tmp_path):
+    with pytest.raises(ValueError):
+        with binware_write.atomic_open(tmp_path / 'results.txt', 'a'):
+            pass
+
+#####################################
+# Sync Tests
+#####################################
+
+def test_sync_batch_fsyncs_once_at_the_end(tmp_path, fsyncs):
+    paths = [tmp_path / 'one' / 'a.txt', tmp_path / 'one' / 'b.txt', tmp_path / 'two' / 'c.txt']
+    with binware_write.sync_batch():
+        with binware_write.sync_batch():
+            for path in paths:
+                binware_write.write_atomic(path, 'data')
+                binware_write.write_atomic(path, 'rewritten')
+            assert paths[0].read_text(encoding='utf-8') == 'rewritten'
+        # The inner batch does not flush
+        assert fsyncs == {'files': [], 'folders': []}
+
+    assert sorted(fsyncs['files']) == sorted(str(path) for path in paths)
+    assert sorted(fsyncs['folders']) == [str(tmp_path / 'one'), str(tmp_path / 'two')]
+    assert binware_write.flush_batch() == 0
+
+def test_file_mode_fsyncs_every_write(tmp_path, fsyncs, monkeypatch):
+    monkeypatch.setitem(binware_write._settings, 'sync', 'file')
+    with binware_write.sync_batch():
+        binware_write.write_atomic(tmp_path / 'a.txt', 'data')
+        binware_write.write_atomic(tmp_path / 'b.txt', 'data')
+    assert (len(fsyncs['files']), len(fsyncs['folders'])) == (2, 2)
+
+def test_no_batch_fsyncs_each_file(tmp_path, fsyncs):
+    binware_write.write_atomic(tmp_path / 'a.txt', 'data')
+    assert (len(fsyncs['files']), fsyncs['folders']) == (1, [str(tmp_path)])
+
+def test_none_mode_never_fsyncs(tmp_path, fsyncs, monkeypatch):
+    monkeypatch.setitem(binware_write._settings, 'sync', 'none')
+    with binware_write.sync_batch():
+        binware_write.write_atomic(tmp_path / 'a.txt', 'data')
+    binware_write.write_atomic(tmp_path / 'b.txt', 'data')
+    assert fsyncs == {'files': [], 'folders': []}
+
+def test_unknown_sync_mode_raises():
+    with pytest.raises(ValueError):
+        binware_write.configure(sync='sometimes')
+
+#####################################
+# Link Tests
+#####################################
+
+def test_link_or_copy_links_when_possible(tmp_path):
+    source = tmp_path / 'data.txt'
+    source.write_text('snapshot', encoding='utf-8')
+    destination = tmp_path / 'snapshots' / 'data.txt'
+    destination.parent.mkdir()
+    destination.write_text('older snapshot', encoding='utf-8')
+
+    binware_write.link_or_copy(source, destination)
+
+    assert os.path.samefile(source, destination)
+    # Rewriting the source atomically leaves the linked snapshot as it was
+    binware_write.write_atomic(source, 'changed')
+    assert destination.read_text(encoding='utf-8') == 'snapshot'
+
+def test_link_or_copy_falls_back_to_copy(tmp_path, monkeypatch):
+    def no_link(source, destination):
+        raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    monkeypatch.setattr(binware_write.os, 'link', no_link)
+    source = tmp_path / 'data.txt'
+    source.write_text('snapshot', encoding='utf-8')
+    destination = tmp_path / 'snapshots' / 'data.txt'
+
+    binware_write.link_or_copy(source, destination)
+
+    assert not os.path.samefile(source, destination)
+    assert destination.read_text(encoding='utf-8') == 'snapshot'
+    assert os.listdir(destination.parent) == ['data.txt']
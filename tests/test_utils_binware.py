@@ -0,0 +1,91 @@
+"""
+Tests for the running statistics in utils_binware.
+"""
+
+# Standard library imports
+import math
+import random
+import statistics
+
+import pytest
+
+import utils_binware
+
+#####################################
+# RunningStats Tests
+#####################################
+
+VALUES = [random.Random(7).uniform(-1e6, 1e6) for _ in range(1000)]
+
+def test_matches_statistics_module():
+    stats = utils_binware.RunningStats(VALUES, exact=True)
+    assert stats.count == len(VALUES)
+    assert stats.mean == statistics.mean(VALUES)
+    assert stats.variance == pytest.approx(statistics.variance(VALUES), rel=1e-12)
+    assert stats.pvariance == pytest.approx(statistics.pvariance(VALUES), rel=1e-12)
+    assert stats.minimum == min(VALUES)
+    assert stats.maximum == max(VALUES)
+
+def test_update_and_update_many_agree():
+    one_by_one = utils_binware.RunningStats(exact=True)
+    for value in VALUES:
+        one_by_one.update(value)
+    assert one_by_one.as_dict() == utils_binware.RunningStats(VALUES, exact=True).as_dict()
+
+def test_merge_matches_single_pass():
+    merged = utils_binware.RunningStats(VALUES[:300], exact=True).merge(
+        utils_binware.RunningStats(VALUES[300:], exact=True))
+    single = utils_binware.RunningStats(VALUES, exact=True)
+    assert merged.mean == single.mean
+    assert merged.variance == pytest.approx(single.variance, rel=1e-12)
+
+def test_merge_inexact_into_exact_is_rejected():
+    with pytest.raises(ValueError):
+        utils_binware.RunningStats([1.0], exact=True).merge(utils_binware.RunningStats([2.0]))
+
+def test_empty():
+    stats = utils_binware.RunningStats(exact=True)
+    assert stats.mean == 0.0
+    assert stats.variance == 0.0
+    assert stats.as_dict()['min'] is None
+
+@pytest.mark.parametrize('values', [
+    [1.0, 2.0, math.inf],
+    [-math.inf, 2],
+    [1, math.nan, 3],
+    [math.inf, -math.inf, 1.0],
+])
+def test_non_finite_values(values):
+    expected = statistics.mean(values)
+    one_by_one = utils_binware.RunningStats(exact=True)
+    for value in values:
+        one_by_one.update(value)
+    merged = utils_binware.RunningStats(values[:1], exact=True).merge(
+        utils_binware.RunningStats(values[1:], exact=True))
+    for stats in (utils_binware.RunningStats(values, exact=True), one_by_one, merged):
+        if math.isnan(expected):
+            assert math.isnan(stats.mean)
+        else:
+            assert stats.mean == expected
+        assert math.isnan(stats.variance)
+        assert stats.count == len(values)
+
+#####################################
+# Windowed Statistics Tests
+#####################################
+
+def test_sliding_window_matches_last_values():
+    stats = utils_binware.SlidingWindowStats(50)
+    for value in VALUES:
+        stats.update(value)
+    window = VALUES[-50:]
+    assert stats.mean == pytest.approx(statistics.mean(window))
+    assert stats.variance == pytest.approx(statistics.variance(window))
+    assert stats.minimum == min(window)
+    assert stats.maximum == max(window)
+
+def test_ewma_needs_exactly_one_parameter():
+    with pytest.raises(ValueError):
+        utils_binware.EwmaStats()
+    with pytest.raises(ValueError):
+        utils_binware.EwmaStats(alpha=0.5, halflife=2)
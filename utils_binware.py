@@ -5,7 +5,10 @@ Module: Python With Bin - Reusable Module for My Data Analytics Projects
 This is my first program for datafun-01-utils
 '''
 
-import statistics
+import collections
+import fractions
+import functools
+import math
 
 #####################################
 # Declare a global variables
@@ -26,44 +29,333 @@ daily_temperatures: list = [72.5, 75.0, 69.8, 71.6, 74.2]
 # client satisfaction  ratings
 client_satisfaction_ratings: list = [4.9, 4.8, 5.0, 5.0, 4.7]
 
+# names of the statistics calculated by get_statistics()
+_STATISTIC_NAMES = ('min_temp', 'max_temp', 'mean_temp', 'stdev_temp',
+                    'min_rating', 'max_rating', 'mean_rating', 'stdev_rating')
+
 #####################################
-# calculate basic statistics for daily temperatures
+# Running statistics for streaming metric feeds.
+# Each reading is folded in as it arrives, so nothing needs
+# to keep the whole list in memory or recompute from scratch.
 #####################################
 
-# calculate the minimum temperature
-min_temp: float = min(daily_temperatures)
+class RunningStats:
+    '''
+    Running count, min, max, mean and variance of a stream of numbers.
 
-# calculate the maximum temperature
-max_temp: float = max(daily_temperatures)
+    update() is O(1) and keeps no values: the variance uses Welford's
+    method, and accumulators filled on different shards can be combined
+    with merge() (Chan et al.). With exact=True the exact sum is kept
+    too, so mean matches statistics.mean to the last bit. An empty
+    accumulator reports a mean and variance of 0.0.
 
-# calculate the mean (average) temperature
-mean_temp: float = statistics.mean(daily_temperatures)
+    NaN and infinities are accepted. They have no exact ratio, so an exact
+    accumulator adds them up separately and its mean is then nan, inf or
+    -inf, as statistics.mean returns. The variance follows IEEE arithmetic
+    and becomes nan, and min and max skip NaN.
+    '''
 
-# calculate the standard deviation of temperatures
-stdev_temp: float = statistics.stdev(daily_temperatures)
+    __slots__ = ('count', 'minimum', 'maximum', '_mean', '_m2', '_partials', '_nonfinite')
 
-#####################################
-# calculate basic statistics for client satisfaction
-#####################################
+    def __init__(self, values=(), exact: bool = False) -> None:
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        # Exact sum kept as {denominator: numerator}, the same way statistics.mean does it
+        self._partials = {} if exact else None
+        # Sum of the infinite and NaN values, which the exact sum cannot hold
+        self._nonfinite = 0.0
+        self.update_many(values)
+
+    def update(self, x: float) -> None:
+        '''Fold one reading into the statistics.'''
+        self.count += 1
+        if x < self.minimum:
+            self.minimum = x
+        if x > self.maximum:
+            self.maximum = x
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        if self._partials is not None:
+            try:
+                numerator, denominator = x.as_integer_ratio()
+            except (OverflowError, ValueError):
+                self._nonfinite += x
+            else:
+                self._partials[denominator] = self._partials.get(denominator, 0) + numerator
+
+    def update_many(self, values) -> None:
+        '''Fold an iterable of readings in; the same result as calling update() on each.'''
+        count, minimum, maximum, mean, m2 = self.count, self.minimum, self.maximum, self._mean, self._m2
+        partials, nonfinite = self._partials, self._nonfinite
+        for x in values:
+            count += 1
+            if x < minimum:
+                minimum = x
+            if x > maximum:
+                maximum = x
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+            if partials is not None:
+                # inf raises OverflowError and nan ValueError; both go to the non-finite sum
+                try:
+                    numerator, denominator = x.as_integer_ratio()
+                except (OverflowError, ValueError):
+                    nonfinite += x
+                else:
+                    partials[denominator] = partials.get(denominator, 0) + numerator
+        self.count, self.minimum, self.maximum, self._mean, self._m2 = count, minimum, maximum, mean, m2
+        self._nonfinite = nonfinite
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        '''
+        Fold another accumulator (e.g. from another shard or file) into this one.
+
+        Returns this accumulator, so shards can be combined with functools.reduce.
+        '''
+        if self._partials is not None and other._partials is None and other.count:
+            raise ValueError("Cannot merge inexact statistics into exact ones")
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        if self._partials is not None:
+            for denominator, numerator in other._partials.items():
+                self._partials[denominator] = self._partials.get(denominator, 0) + numerator
+            self._nonfinite += other._nonfinite
+        return self
+
+    @property
+    def mean(self) -> float:
+        '''The mean; exactly rounded when the accumulator is exact.'''
+        if not self.count:
+            return 0.0
+        if self._partials is None:
+            return self._mean
+        if self._nonfinite:
+            # inf, -inf, or nan (NaN seen, or inf and -inf both seen)
+            return self._nonfinite
+        total = sum(fractions.Fraction(n, d) for d, n in self._partials.items())
+        return float(total / self.count)
+
+    @property
+    def variance(self) -> float:
+        '''Sample variance, like statistics.variance; 0.0 with fewer than two values.'''
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def pvariance(self) -> float:
+        '''Population variance, like statistics.pvariance.'''
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None,
+            'variance': self.variance,
+            'stdev': self.stdev,
+        }
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(count={self.count}, mean={self.mean}, stdev={self.stdev})"
+
+class EwmaStats:
+    '''
+    Exponentially weighted mean and variance, for feeds where recent readings matter most.
+
+    Give either alpha (the weight of each new reading, 0 < alpha <= 1) or
+    halflife (the number of readings after which a reading counts half).
+    '''
+
+    __slots__ = ('alpha', 'count', 'mean', 'variance', 'last')
+
+    def __init__(self, alpha: float = None, halflife: float = None) -> None:
+        if (alpha is None) == (halflife is None):
+            raise ValueError("Give exactly one of alpha or halflife")
+        if halflife is not None:
+            alpha = 1 - 0.5 ** (1 / halflife)
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.last = None
+
+    def update(self, x: float) -> None:
+        '''Fold one reading in (an incremental exponentially weighted mean and variance).'''
+        self.count += 1
+        self.last = x
+        if self.count == 1:
+            self.mean = float(x)
+            return
+        diff = x - self.mean
+        increment = self.alpha * diff
+        self.mean += increment
+        self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+
+    def update_many(self, values) -> None:
+        '''Fold an iterable of readings in; the same result as calling update() on each.'''
+        alpha, count, mean, variance, last = self.alpha, self.count, self.mean, self.variance, self.last
+        for x in values:
+            count += 1
+            last = x
+            if count == 1:
+                mean = float(x)
+                continue
+            diff = x - mean
+            increment = alpha * diff
+            mean += increment
+            variance = (1 - alpha) * (variance + diff * increment)
+        self.count, self.mean, self.variance, self.last = count, mean, variance, last
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+class SlidingWindowStats:
+    '''
+    Count, min, max, mean and variance of the last `window` readings.
+
+    Each update adds the new reading and retires the oldest one in O(1)
+    (amortized for min and max, which use monotonic queues). The mean and
+    variance are recomputed from the window once per `window` updates, so
+    rounding errors cannot build up on a long-running feed.
+    '''
 
-# calculate the minimum temperature
-min_rating: float = min(client_satisfaction_ratings)
+    __slots__ = ('window', '_values', '_mean', '_m2', '_minima', '_maxima', '_index', '_since_resync')
 
-# calculate the maximum temperature
-max_rating: float = max(client_satisfaction_ratings)
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        self.window = window
+        self._values = collections.deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        # (index, value) pairs with increasing values (minima) or decreasing values (maxima)
+        self._minima = collections.deque()
+        self._maxima = collections.deque()
+        self._index = 0
+        self._since_resync = 0
 
-# calculate the mean (average) temperature
-mean_rating: float = statistics.mean(client_satisfaction_ratings)
+    def update(self, x: float) -> None:
+        '''Add a reading, dropping the oldest one once the window is full.'''
+        values = self._values
+        if len(values) == self.window:
+            old = values.popleft()
+            values.append(x)
+            old_mean = self._mean
+            new_mean = old_mean + (x - old) / self.window
+            self._mean = new_mean
+            self._m2 += (x - old) * (x - new_mean + old - old_mean)
+            self._since_resync += 1
+            if self._since_resync >= self.window:
+                self._resync()
+        else:
+            values.append(x)
+            delta = x - self._mean
+            self._mean += delta / len(values)
+            self._m2 += delta * (x - self._mean)
+        index = self._index
+        self._index = index + 1
+        expired = index - self.window
+        minima = self._minima
+        while minima and minima[-1][1] >= x:
+            minima.pop()
+        minima.append((index, x))
+        if minima[0][0] <= expired:
+            minima.popleft()
+        maxima = self._maxima
+        while maxima and maxima[-1][1] <= x:
+            maxima.pop()
+        maxima.append((index, x))
+        if maxima[0][0] <= expired:
+            maxima.popleft()
 
-# calculate the standard deviation of temperatures
-stdev_rating: float = statistics.stdev(client_satisfaction_ratings)
+    def update_many(self, values) -> None:
+        for x in values:
+            self.update(x)
+
+    def _resync(self) -> None:
+        self._mean = math.fsum(self._values) / len(self._values)
+        self._m2 = math.fsum((x - self._mean) ** 2 for x in self._values)
+        self._since_resync = 0
+
+    @property
+    def count(self) -> int:
+        return len(self._values)
+
+    @property
+    def minimum(self) -> float:
+        return self._minima[0][1] if self._minima else math.inf
+
+    @property
+    def maximum(self) -> float:
+        return self._maxima[0][1] if self._maxima else -math.inf
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self._values else 0.0
+
+    @property
+    def variance(self) -> float:
+        return max(self._m2, 0.0) / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+#####################################
+# calculate basic statistics the first time they are needed,
+# so importing this module stays cheap
+#####################################
+
+@functools.lru_cache(maxsize=None)
+def get_statistics() -> dict:
+    '''Calculate the temperature and satisfaction statistics once and return them by name.'''
+    # one pass over each list, with the exact mean statistics.mean would give
+    temperatures = RunningStats(daily_temperatures, exact=True)
+    ratings = RunningStats(client_satisfaction_ratings, exact=True)
+    return {
+        # the minimum, maximum, mean and standard deviation of temperatures
+        'min_temp': temperatures.minimum,
+        'max_temp': temperatures.maximum,
+        'mean_temp': temperatures.mean,
+        'stdev_temp': temperatures.stdev,
+        # the minimum, maximum, mean and standard deviation of satisfaction ratings
+        'min_rating': ratings.minimum,
+        'max_rating': ratings.maximum,
+        'mean_rating': ratings.mean,
+        'stdev_rating': ratings.stdev,
+    }
 
 #####################################
-# declare a global variable named byline.
-# make it a multiline f-string to show our info. 
+# Function to return the byline.
+# It is a multiline f-string built on first use to show our info.
 #####################################
 
-byline: str = f""" 
+# Function named get_byline.
+# Returns the byline, calculating it the first time.
+@functools.lru_cache(maxsize=None)
+def get_byline() -> str:
+    '''Return the byline string.'''
+    stats = get_statistics()
+    return f""" 
 -------------------------------------------------
  Python With Bin: A Coding Company
 -------------------------------------------------
@@ -71,27 +363,26 @@ Is Privately Held: {is_privately_held}
 Number of Team Members: {team_size}
 Tools Used: {tools_used}
 Recent Daily Temperatures of the Office: {daily_temperatures}
-Minimum Temperature: {min_temp:.2f}
-Maximum Temperature: {max_temp:.2f}
-Mean Temperature: {mean_temp:.2f}
-Standard Deviation of Temperatures: {stdev_temp:.2f}
+Minimum Temperature: {stats['min_temp']:.2f}
+Maximum Temperature: {stats['max_temp']:.2f}
+Mean Temperature: {stats['mean_temp']:.2f}
+Standard Deviation of Temperatures: {stats['stdev_temp']:.2f}
 
 Client Satisfaction Ratings: {client_satisfaction_ratings}
-Minimum Satisfaction Rating: {min_rating:.2f}
-Maximum Satisfaction Rating: {max_rating:.2f}
-Mean Satisfaction Rating: {mean_rating:.2f}
-Standard Deviation of Satisfaction Ratings: {stdev_rating:.2f}
+Minimum Satisfaction Rating: {stats['min_rating']:.2f}
+Maximum Satisfaction Rating: {stats['max_rating']:.2f}
+Mean Satisfaction Rating: {stats['mean_rating']:.2f}
+Standard Deviation of Satisfaction Ratings: {stats['stdev_rating']:.2f}
 """
 
-#####################################
-# Function to return the byline.
-#####################################
-
-# Function named get_byline.
-# Returns the value of the byline variable.
-def get_byline() -> str:
-    '''Return the byline string.'''
-    return byline
+# Keep the old module attributes (utils_binware.byline, utils_binware.mean_temp, ...)
+# working; they are looked up here only when first used.
+def __getattr__(name: str):
+    if name == 'byline':
+        return get_byline()
+    if name in _STATISTIC_NAMES:
+        return get_statistics()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 #####################################
 # Define a main() function for this module.
@@ -101,7 +392,7 @@ def get_byline() -> str:
 
 def main() -> None:
     '''Print the byline to the console when this function is called.'''
-    print(byline)
+    print(get_byline())
 
 #####################################
 # Conditional Execution - Only call main() when executing this module as a script.